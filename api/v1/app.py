@@ -0,0 +1,342 @@
+#!/usr/bin/python3
+"""Defines the HBnB REST API, a JSON API over storage.
+
+Every model is exposed under /api/v1/<resource> (see RESOURCES):
+
+    GET    /api/v1/<resource>        list, filtered by query parameters
+    POST   /api/v1/<resource>        create from a JSON object
+    GET    /api/v1/<resource>/<id>   show
+    PUT    /api/v1/<resource>/<id>   update from a JSON object
+    DELETE /api/v1/<resource>/<id>   delete
+
+Lists are sorted by id, or by the attribute of ?order_by= (prefixed
+with "-" for descending order), and paginated with ?limit= and ?offset=;
+the X-Total-Count header holds the number of matches and a Link header
+the next page. Other query parameters filter on attribute values.
+
+Responses to GET carry an ETag built from the updated_at of the objects
+they hold, and a matching If-None-Match is answered with 304 Not
+Modified. ETags rely on changes going through BaseModel.save(), which
+refreshes updated_at, as the API does.
+
+Bodies may only set the attributes of the class schema, or new plain
+attributes not clashing with a class attribute (see schema.check_names).
+Invalid requests are answered with 400 and unexpected errors with 500,
+both with a JSON error message.
+
+Connections are kept alive (HTTP/1.1). Run the API with:
+
+    HBNB_API_HOST=0.0.0.0 HBNB_API_PORT=5000 python3 -m api.v1.app
+"""
+
+import hashlib
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import models
+from models import schema
+from models.engine import ordering
+from models.amenity import Amenity
+from models.booking import Booking
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+PREFIX = "/api/v1"
+RESOURCES = {
+    "amenities": Amenity,
+    "bookings": Booking,
+    "cities": City,
+    "places": Place,
+    "reviews": Review,
+    "states": State,
+    "users": User
+}
+PROTECTED = schema.PROTECTED
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+class HTTPError(Exception):
+    """Represent an error answered with an HTTP status and a message."""
+
+    def __init__(self, status, message):
+        """Initialize an HTTPError of status with message."""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    """Represent the handler of the requests of one connection."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "HBnB/1.0"
+
+    def log_message(self, format, *args):
+        """Log a request, unless the server is quiet."""
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        """Answer a list or show request."""
+        self.__dispatch("GET")
+
+    def do_POST(self):
+        """Answer a create request."""
+        self.__dispatch("POST")
+
+    def do_PUT(self):
+        """Answer an update request."""
+        self.__dispatch("PUT")
+
+    def do_DELETE(self):
+        """Answer a delete request."""
+        self.__dispatch("DELETE")
+
+    def __dispatch(self, method):
+        """Route the request to the method of the API server."""
+        url = urlsplit(self.path)
+        parts = url.path.rstrip("/").split("/")
+        try:
+            body = self.__body()
+            if url.path.rstrip("/") == PREFIX + "/status" and method == "GET":
+                self.__send(200, b'{"status":"OK"}')
+                return
+            if ("/".join(parts[:3]) != PREFIX or len(parts) not in (4, 5) or
+                    parts[3] not in RESOURCES):
+                raise HTTPError(404, "Not found")
+            cls = RESOURCES[parts[3]]
+            if len(parts) == 4:
+                if method == "GET":
+                    self.__list(cls, parts[3], dict(parse_qsl(url.query)))
+                elif method == "POST":
+                    obj = self.server.create(cls, self.__json(body))
+                    self.__send(201, self.server.encode(obj),
+                                self.server.etag([obj]),
+                                {"Location": "{}/{}/{}".format(
+                                    PREFIX, parts[3], obj.id)})
+                else:
+                    raise HTTPError(405, "Method not allowed")
+                return
+            obj = models.storage.get(cls.__name__, parts[4])
+            if obj is None:
+                raise HTTPError(404, "Not found")
+            if method == "GET":
+                etag = self.server.etag([obj])
+                if self.__not_modified(etag):
+                    return
+                self.__send(200, self.server.encode(obj), etag)
+            elif method == "PUT":
+                self.server.update(obj, self.__json(body))
+                self.__send(200, self.server.encode(obj),
+                            self.server.etag([obj]))
+            elif method == "DELETE":
+                models.storage.delete(obj)
+                models.storage.save()
+                self.__send(200, b"{}")
+            else:
+                raise HTTPError(405, "Method not allowed")
+        except HTTPError as e:
+            self.__send(e.status, json.dumps({"error": e.message}).encode())
+        except Exception as e:
+            self.log_error("%s %s failed: %r", method, self.path, e)
+            self.__send(500, b'{"error":"Internal server error"}')
+
+    def __list(self, cls, resource, params):
+        """Answer the list of the instances of cls matching params."""
+        try:
+            limit = min(int(params.pop("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+            offset = int(params.pop("offset", 0))
+        except ValueError:
+            raise HTTPError(400, "Invalid pagination")
+        if limit < 0 or offset < 0:
+            raise HTTPError(400, "Invalid pagination")
+        order_by = params.pop("order_by", "id")
+        total, objl = self.server.find(cls, params, order_by, offset + limit)
+        page = objl[offset:]
+        etag = self.server.etag(page, total)
+        headers = {"X-Total-Count": str(total)}
+        if offset + limit < total:
+            query = dict(params, limit=limit, offset=offset + limit)
+            if order_by != "id":
+                query["order_by"] = order_by
+            headers["Link"] = '<{}/{}?{}>; rel="next"'.format(
+                PREFIX, resource, urlencode(query))
+        if self.__not_modified(etag, headers):
+            return
+        body = b"[" + b",".join(self.server.encode(o) for o in page) + b"]"
+        self.__send(200, body, etag, headers)
+
+    def __body(self):
+        """Return the body of the request, read in full.
+
+        The connection is closed after answering a request whose
+        Content-Length is invalid, as its body cannot be skipped.
+        """
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise HTTPError(400, "Invalid Content-Length")
+        return self.rfile.read(length) if length else b""
+
+    def __json(self, body):
+        """Return the JSON object of body."""
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "Not a JSON")
+        if type(data) is not dict:
+            raise HTTPError(400, "Not a JSON")
+        return data
+
+    def __not_modified(self, etag, headers=None):
+        """Answer 304 if the client has the version etag already."""
+        if self.headers.get("If-None-Match") != etag:
+            return False
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def __send(self, status, body, etag=None, headers=None):
+        """Answer with status and the JSON body."""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class APIServer(ThreadingHTTPServer):
+    """Represent the HBnB REST API server.
+
+    Each connection has its thread, so storage is switched to thread-safe
+    mode when it has one. Instances are encoded once per updated_at.
+
+    Attributes:
+        quiet (bool): Whether requests are not logged.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, quiet=False):
+        """Initialize an APIServer listening on address."""
+        if hasattr(models.storage, "set_thread_safe"):
+            models.storage.set_thread_safe(True)
+        self.quiet = quiet
+        self.__encoded = {}
+        super().__init__(address, APIHandler)
+
+    def encode(self, obj):
+        """Return the JSON encoding of obj's to_dict(), cached."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        cached = self.__encoded.get(key)
+        if cached is not None and cached[0] == obj.updated_at:
+            return cached[1]
+        data = json.dumps(obj.to_dict()).encode()
+        self.__encoded[key] = (obj.updated_at, data)
+        return data
+
+    def etag(self, objl, total=None):
+        """Return the ETag of a response holding the instances objl."""
+        if total is None and len(objl) == 1:
+            obj = objl[0]
+            return '"{}"'.format(obj.updated_at.isoformat())
+        digest = hashlib.sha1(str(total).encode())
+        for obj in objl:
+            digest.update("{}@{};".format(
+                obj.id, obj.updated_at.isoformat()).encode())
+        return '"{}"'.format(digest.hexdigest())
+
+    def find(self, cls, params, order_by="id", limit=None):
+        """Return the instances of cls whose attributes match params.
+
+        Values are converted to the type of the class attribute, if any.
+
+        Returns:
+            The number of matches, and the list of the limit first of
+            them in the ordering order_by (see models.engine.ordering).
+        """
+        try:
+            wanted = {name: schema.coerce(cls, name, value)
+                      for name, value in params.items()}
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        prefix = cls.__name__ + "."
+        objl = []
+        for key, obj in models.storage.all().items():
+            if key.startswith(prefix) and all(
+                    getattr(obj, name, None) == value
+                    for name, value in wanted.items()):
+                objl.append(obj)
+        try:
+            return len(objl), ordering.top_k(objl, order_by, limit)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+
+    def create(self, cls, attrs):
+        """Return a new instance of cls with attrs, saved."""
+        attrs = self.__writable(cls, attrs)
+        obj = cls()
+        try:
+            schema.apply(obj, attrs)
+        except (ValueError, TypeError, AttributeError) as e:
+            models.storage.delete(obj)
+            raise HTTPError(400, str(e))
+        obj.save()
+        return obj
+
+    def update(self, obj, attrs):
+        """Update obj with attrs and save it."""
+        try:
+            schema.apply(obj, self.__writable(obj.__class__, attrs))
+        except (ValueError, TypeError, AttributeError) as e:
+            raise HTTPError(400, str(e))
+        obj.save()
+
+    def __writable(self, cls, attrs):
+        """Return attrs without protected names, checked against cls.
+
+        Raises:
+            HTTPError: 400 if a name may not be set (see
+            schema.check_names), or a value cannot be converted.
+        """
+        attrs = {k: v for k, v in attrs.items() if k not in PROTECTED}
+        try:
+            schema.check_names(cls, attrs)
+            for name, value in attrs.items():
+                schema.coerce(cls, name, value)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        return attrs
+
+
+def main():
+    """Serve the API on HBNB_API_HOST:HBNB_API_PORT until interrupted."""
+    host = os.environ.get("HBNB_API_HOST", "0.0.0.0")
+    port = int(os.environ.get("HBNB_API_PORT", "5000"))
+    server = APIServer((host, port))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
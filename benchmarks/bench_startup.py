@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""Benchmarks cold start time with and without the snapshot cache.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_startup --sizes 10000,100000
+
+For each size a dataset is generated, then a fresh interpreter loading
+storage is timed once the snapshot cache is removed (full JSON parse)
+and once it is present. Without a cache, storage is ready once parsed
+while the cache is written in the background, and the interpreter waits
+for it at exit: both times are reported. Results are printed as JSON
+lines.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import generate_dataset
+from models.engine import snapshot
+
+LOAD = ("import sys\n"
+        "sys.path.insert(0, {root!r})\n"
+        "from models.engine.file_storage import FileStorage\n"
+        "FileStorage._FileStorage__file_path = {path!r}\n"
+        "import models\n"
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "models.storage.all()\n"
+        "print(time.perf_counter() - start)\n")
+
+
+def startup(path, repeat):
+    """Return the best load and wall times of repeat interpreters.
+
+    The load time is that of loading storage from path, the wall time
+    that of the whole interpreter, exit included.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = LOAD.format(root=root, path=path)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], check=True,
+                             stdout=subprocess.PIPE).stdout
+        times = (float(out), time.perf_counter() - start)
+        best = times if best is None else min(best, times)
+    return best
+
+
+def main(argv=None):
+    """Parse the command line and run the startup benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="hbnb-startup-")
+    try:
+        for size in args.sizes.split(","):
+            path = os.path.join(workdir, "file.json")
+            generate_dataset.main(["--size", size, "--seed", str(args.seed),
+                                   "-o", path])
+            cache = snapshot.path_for(path)
+            startup(path, 1)
+            warm = startup(path, args.repeat)
+            cold = []
+            for _ in range(args.repeat):
+                os.remove(cache)
+                cold.append(startup(path, 1))
+            print(json.dumps({
+                "size": int(size),
+                "file_bytes": os.path.getsize(path),
+                "snapshot_bytes": os.path.getsize(cache),
+                "seconds_parse": min(t[0] for t in cold),
+                "seconds_parse_exit": min(t[1] for t in cold),
+                "seconds_snapshot": warm[0],
+                "seconds_snapshot_exit": warm[1]
+            }), flush=True)
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+"""Benchmarks FileStorage and HBNBCommand at growing dataset sizes.
+
+Run from the repository root:
+
+    python3 -m benchmarks.bench_storage --sizes 10000,100000 --output r.json
+
+Each run creates <size> objects following a model mix, then times new,
+save, reload, all, count, show and update. Results are printed as one
+JSON object per run (or written to --output as a JSON list), including
+the size of the storage file and the peak resident memory.
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+
+import models
+from console import HBNBCommand
+from models.engine.file_storage import FileStorage
+from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.place import Place
+from models.review import Review
+
+MIXES = {
+    "uniform": {BaseModel: 1, User: 1, State: 1, City: 1,
+                Amenity: 1, Place: 1, Review: 1},
+    "listing": {User: 10, State: 1, City: 5, Amenity: 1,
+                Place: 30, Review: 53},
+    "places": {Place: 1}
+}
+
+
+def reset():
+    """Remove every object from storage."""
+    for obj in list(models.storage.all().values()):
+        models.storage.delete(obj)
+
+
+def timed(func, *args):
+    """Call func with args and return the elapsed wall time in seconds."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def console(line):
+    """Run line through HBNBCommand, discarding what it prints."""
+    with redirect_stdout(io.StringIO()):
+        HBNBCommand().onecmd(line)
+
+
+def run(size, mix, ops, updates, rng):
+    """Benchmark one dataset of size objects built from mix.
+
+    Returns:
+        A dict of results for the run.
+    """
+    reset()
+    classes = list(MIXES[mix])
+    weights = [MIXES[mix][cls] for cls in classes]
+    picks = rng.choices(classes, weights, k=size)
+
+    timings = {}
+    start = time.perf_counter()
+    objs = [cls() for cls in picks]
+    timings["new"] = time.perf_counter() - start
+    timings["save"] = timed(models.storage.save)
+    file_bytes = os.path.getsize(FileStorage._FileStorage__file_path)
+    reset()
+    timings["reload"] = timed(models.storage.reload)
+
+    names = sorted({cls.__name__ for cls in classes})
+    target = "Place" if "Place" in names else names[0]
+    timings["all"] = timed(console, "all {}".format(target))
+    timings["count"] = timed(console, "count {}".format(target))
+
+    sample = rng.sample(objs, min(ops, len(objs)))
+    start = time.perf_counter()
+    for obj in sample:
+        console("show {} {}".format(obj.__class__.__name__, obj.id))
+    show = (time.perf_counter() - start) / max(len(sample), 1)
+
+    sample = rng.sample(objs, min(updates, len(objs)))
+    start = time.perf_counter()
+    for obj in sample:
+        console('update {} {} name "bench"'.format(
+            obj.__class__.__name__, obj.id))
+    update = (time.perf_counter() - start) / max(len(sample), 1)
+
+    return {
+        "size": size,
+        "mix": mix,
+        "seconds": timings,
+        "seconds_per_op": {"show": show, "update": update},
+        "file_bytes": file_bytes,
+        "objects_per_class": {cls.__name__: n
+                              for cls, n in Counter(picks).items()},
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    }
+
+
+def main(argv=None):
+    """Parse the command line and run the requested benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="comma separated dataset sizes")
+    parser.add_argument("--mixes", default="uniform,listing",
+                        help="comma separated model mixes: {}".format(
+                            ", ".join(MIXES)))
+    parser.add_argument("--ops", type=int, default=1000,
+                        help="show commands timed per run")
+    parser.add_argument("--updates", type=int, default=5,
+                        help="update commands timed per run (each saves)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write a JSON list to this file")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="hbnb-bench-")
+    FileStorage._FileStorage__file_path = os.path.join(workdir, "file.json")
+    results = []
+    for mix in args.mixes.split(","):
+        for size in args.sizes.split(","):
+            result = run(int(size), mix, args.ops, args.updates, rng)
+            results.append(result)
+            if args.output is None:
+                print(json.dumps(result), flush=True)
+            else:
+                print("{} {}: {}".format(mix, size, result["seconds"]),
+                      file=sys.stderr)
+    reset()
+    shutil.rmtree(workdir)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
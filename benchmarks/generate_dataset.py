@@ -0,0 +1,197 @@
+#!/usr/bin/python3
+"""Generates realistic synthetic storage files for load testing.
+
+Run from the repository root:
+
+    python3 -m benchmarks.generate_dataset --size 1000000 -o big.json
+
+The file is written in the FileStorage format, one object at a time, so
+memory use stays flat whatever the size. The graph is shaped like
+production data: States own a skewed number of Cities, Cities a skewed
+number of Places, Places a Zipf-distributed number of Reviews and a list
+of amenities drawn by popularity. The same seed always produces the same
+file.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from models import schema
+from models.user import User
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.place import Place
+from models.review import Review
+
+#: Share of the dataset size given to each class when not set explicitly.
+PROPORTIONS = {
+    State: 0.001,
+    City: 0.01,
+    Amenity: 0.0005,
+    User: 0.1,
+    Place: 0.3
+}
+AMENITY_NAMES = ["Wifi", "Kitchen", "Pool", "Parking", "Smart TV",
+                 "Washer", "Air conditioning", "Heating", "Gym", "Hot tub"]
+
+
+class Generator:
+    """Represent a reproducible generator of related model records.
+
+    Attributes:
+        rng (random.Random): The source of randomness.
+        skew (float): The exponent of the power laws used for sizes.
+        counts (dict): Maps model classes to the number to generate.
+    """
+
+    epoch = datetime(2020, 1, 1)
+
+    def __init__(self, counts, skew=1.1, seed=0):
+        """Initialize a Generator producing counts objects per class."""
+        self.rng = random.Random(seed)
+        self.skew = skew
+        self.counts = counts
+        self.__salt = random.Random(seed).getrandbits(128)
+
+    def ident(self, cls, index):
+        """Return the deterministic uuid4 string of the index-th cls.
+
+        The class name is mixed into the salt, so instances of different
+        classes never share an id.
+        """
+        salt = self.__salt ^ int(hashlib.md5(
+            cls.__name__.encode()).hexdigest(), 16)
+        n = index * 0x9E3779B97F4A7C15F39CC0605CEDC835 + salt
+        return str(uuid.UUID(int=n & ((1 << 128) - 1), version=4))
+
+    def zipf(self, n):
+        """Return a rank in [0, n) drawn from a bounded power law."""
+        u = self.rng.random()
+        if abs(self.skew - 1.0) < 1e-9:
+            rank = n ** u
+        else:
+            e = 1.0 - self.skew
+            rank = ((n ** e - 1.0) * u + 1.0) ** (1.0 / e)
+        return min(int(rank) - 1, n - 1)
+
+    def record(self, cls, index, **attrs):
+        """Return the key and to_dict() form of the index-th cls."""
+        fields = schema.schema_for(cls)
+        created = self.epoch + timedelta(
+            seconds=self.rng.randrange(4 * 365 * 86400),
+            microseconds=self.rng.randrange(1, 1000000))  # keeps .%f
+        oid = self.ident(cls, index)
+        stamp = created.isoformat()
+        rec = {"id": oid, "created_at": stamp, "updated_at": stamp}
+        for k, v in attrs.items():
+            rec[k] = fields[k](v)
+        rec["__class__"] = cls.__name__
+        return "{}.{}".format(cls.__name__, oid), rec
+
+    def records(self):
+        """Yield (key, dict) pairs for the whole graph, parents first."""
+        rng = self.rng
+        counts = self.counts
+        for i in range(counts[State]):
+            yield self.record(State, i, name="State {}".format(i))
+        for i in range(counts[City]):
+            yield self.record(
+                City, i, name="City {}".format(i),
+                state_id=self.ident(State, self.zipf(counts[State])))
+        for i in range(counts[Amenity]):
+            name = AMENITY_NAMES[i % len(AMENITY_NAMES)]
+            if i >= len(AMENITY_NAMES):
+                name = "{} {}".format(name, i // len(AMENITY_NAMES))
+            yield self.record(Amenity, i, name=name)
+        for i in range(counts[User]):
+            yield self.record(
+                User, i, email="user{}@example.com".format(i),
+                password="pwd{}".format(i), first_name="First{}".format(i),
+                last_name="Last{}".format(i))
+        for i in range(counts[Place]):
+            amenities = {self.ident(Amenity, self.zipf(counts[Amenity]))
+                         for _ in range(rng.randint(0, 8))}
+            rooms = rng.randint(1, 6)
+            yield self.record(
+                Place, i, name="Place {}".format(i),
+                city_id=self.ident(City, self.zipf(counts[City])),
+                user_id=self.ident(User, self.zipf(counts[User])),
+                description="A lovely place with {} rooms".format(rooms),
+                number_rooms=rooms, number_bathrooms=rng.randint(1, rooms),
+                max_guest=rooms * 2,
+                price_by_night=int(rng.lognormvariate(4.5, 0.6)),
+                latitude=rng.uniform(-60.0, 70.0),
+                longitude=rng.uniform(-180.0, 180.0),
+                amenity_ids=sorted(amenities))
+        for i in range(counts[Review]):
+            yield self.record(
+                Review, i, text="Review {}".format(i),
+                place_id=self.ident(Place, self.zipf(counts[Place])),
+                user_id=self.ident(User, rng.randrange(counts[User])))
+
+
+def write(records, f):
+    """Stream records to f in the FileStorage JSON format.
+
+    Returns:
+        The number of records written.
+    """
+    count = 0
+    f.write("{")
+    for key, rec in records:
+        if count:
+            f.write(", ")
+        f.write(json.dumps(key))
+        f.write(": ")
+        f.write(json.dumps(rec))
+        count += 1
+    f.write("}")
+    return count
+
+
+def plan(size, overrides):
+    """Return the per-class counts for a dataset of about size objects."""
+    counts = {cls: max(1, int(size * share))
+              for cls, share in PROPORTIONS.items()}
+    for cls, n in overrides.items():
+        if n is not None and cls is not Review:
+            counts[cls] = n
+    reviews = overrides.get(Review)
+    if reviews is None:
+        reviews = max(0, size - sum(counts.values()))
+    counts[Review] = reviews
+    return counts
+
+
+def main(argv=None):
+    """Parse the command line and write the requested dataset."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000,
+                        help="approximate total number of objects")
+    for cls in (State, City, Amenity, User, Place, Review):
+        parser.add_argument("--{}s".format(cls.__name__.lower()), type=int,
+                            help="number of {} objects".format(cls.__name__))
+    parser.add_argument("--skew", type=float, default=1.1,
+                        help="power law exponent of child counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="file.json")
+    args = parser.parse_args(argv)
+
+    overrides = {cls: getattr(args, "{}s".format(cls.__name__.lower()))
+                 for cls in (State, City, Amenity, User, Place, Review)}
+    counts = plan(args.size, overrides)
+    gen = Generator(counts, args.skew, args.seed)
+    with open(args.output, "w", buffering=1 << 20) as f:
+        total = write(gen.records(), f)
+    print("{} objects written to {}".format(total, args.output),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
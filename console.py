@@ -2,9 +2,12 @@
 """Defines the HBNB console."""
 
 import cmd
+import json
 import re
 from shlex import split
 from models import storage
+from models import schema
+from models.engine.stats import stats, tracer
 from models.base_model import BaseModel
 from models.user import User
 from models.state import State
@@ -12,6 +15,7 @@ from models.city import City
 from models.place import Place
 from models.amenity import Amenity
 from models.review import Review
+from models.booking import Booking
 
 
 def parse(arg):
@@ -33,6 +37,14 @@ def parse(arg):
         return retl
 
 
+def command_name(line):
+    """Return the command of line, e.g. show for User.show(<id>)."""
+    match = re.match(r"\s*\w+\.(\w+)\(", line)
+    if match is not None:
+        return match.group(1)
+    return line.strip().partition(" ")[0]
+
+
 class HBNBCommand(cmd.Cmd):
     """Defines the HolbertonBnB command interpreter.
 
@@ -47,9 +59,20 @@ class HBNBCommand(cmd.Cmd):
         "City",
         "Place",
         "Amenity",
-        "Review"
+        "Review",
+        "Booking"
     }
 
+    def onecmd(self, line):
+        """Interpret line as a command, tracing it if tracing is enabled."""
+        if not tracer.enabled:
+            return super().onecmd(line)
+        tracer.start(command_name(line))
+        try:
+            return super().onecmd(line)
+        finally:
+            tracer.finish(line)
+
     def emptyline(self):
         """Do nothing upon receiving an empty line."""
         pass
@@ -94,42 +117,69 @@ class HBNBCommand(cmd.Cmd):
         elif argl[0] not in HBNBCommand.__classes:
             print("** class doesn't exist **")
         else:
-            print(eval(argl[0])().id)
-            storage.save()
+            tracer.mark("parse")
+            try:
+                obj = eval(argl[0])()
+                tracer.mark("mutation")
+                storage.save()
+            except RuntimeError as e:
+                print("** {} **".format(e))
+                return
+            tracer.mark("save")
+            print(obj.id)
+            tracer.mark("output")
 
     def do_show(self, arg):
         """Usage: show <class> <id> or <class>.show(<id>)
         Display the string representation of a class instance of a given id.
         """
         argl = parse(arg)
-        objdict = storage.all()
+        tracer.mark("parse")
         if len(argl) == 0:
             print("** class name missing **")
         elif argl[0] not in HBNBCommand.__classes:
             print("** class doesn't exist **")
         elif len(argl) == 1:
             print("** instance id missing **")
-        elif "{}.{}".format(argl[0], argl[1]) not in objdict:
-            print("** no instance found **")
         else:
-            print(objdict["{}.{}".format(argl[0], argl[1])])
+            obj = storage.get(argl[0], argl[1])
+            tracer.mark("lookup")
+            if obj is None:
+                print("** no instance found **")
+            else:
+                print(obj)
+                tracer.mark("output")
 
     def do_destroy(self, arg):
-        """Usage: destroy <class> <id> or <class>.destroy(<id>)
-        Delete a class instance of a given id."""
+        """Usage: destroy <class> <id> [cascade] or
+       <class>.destroy(<id>[, cascade])
+        Delete a class instance of a given id. With cascade, also delete
+        every instance referencing it and print the deleted keys."""
         argl = parse(arg)
-        objdict = storage.all()
+        tracer.mark("parse")
         if len(argl) == 0:
             print("** class name missing **")
         elif argl[0] not in HBNBCommand.__classes:
             print("** class doesn't exist **")
         elif len(argl) == 1:
             print("** instance id missing **")
-        elif "{}.{}".format(argl[0], argl[1]) not in objdict.keys():
+        elif storage.get(argl[0], argl[1]) is None:
             print("** no instance found **")
         else:
-            del objdict["{}.{}".format(argl[0], argl[1])]
-            storage.save()
+            cascade = len(argl) > 2 and argl[2] == "cascade"
+            obj = storage.get(argl[0], argl[1])
+            tracer.mark("lookup")
+            try:
+                removed = storage.delete(obj, cascade)
+                tracer.mark("mutation")
+                storage.save()
+            except RuntimeError as e:
+                print("** {} **".format(e))
+                return
+            tracer.mark("save")
+            if cascade:
+                print(removed)
+                tracer.mark("output")
 
     def do_all(self, arg):
         """Usage: all or all <class> or <class>.all()
@@ -139,23 +189,26 @@ class HBNBCommand(cmd.Cmd):
         if len(argl) > 0 and argl[0] not in HBNBCommand.__classes:
             print("** class doesn't exist **")
         else:
+            tracer.mark("parse")
             objl = []
             for obj in storage.all().values():
                 if len(argl) > 0 and argl[0] == obj.__class__.__name__:
                     objl.append(obj.__str__())
                 elif len(argl) == 0:
                     objl.append(obj.__str__())
+            tracer.mark("lookup")
             print(objl)
+            tracer.mark("output")
 
     def do_count(self, arg):
         """Usage: count <class> or <class>.count()
         Retrieve the number of instances of a given class."""
         argl = parse(arg)
-        count = 0
-        for obj in storage.all().values():
-            if argl[0] == obj.__class__.__name__:
-                count += 1
+        tracer.mark("parse")
+        count = storage.count(argl[0])
+        tracer.mark("lookup")
         print(count)
+        tracer.mark("output")
 
     def do_update(self, arg):
         """Usage: update <class> <id> <attribute_name> <attribute_value> or
@@ -164,7 +217,7 @@ class HBNBCommand(cmd.Cmd):
         Update a class instance of a given id by adding or updating
         a given attribute key/value pair or dictionary."""
         argl = parse(arg)
-        objdict = storage.all()
+        tracer.mark("parse")
 
         if len(argl) == 0:
             print("** class name missing **")
@@ -175,7 +228,9 @@ class HBNBCommand(cmd.Cmd):
         if len(argl) == 1:
             print("** instance id missing **")
             return False
-        if "{}.{}".format(argl[0], argl[1]) not in objdict.keys():
+        obj = storage.get(argl[0], argl[1])
+        tracer.mark("lookup")
+        if obj is None:
             print("** no instance found **")
             return False
         if len(argl) == 2:
@@ -183,28 +238,76 @@ class HBNBCommand(cmd.Cmd):
             return False
         if len(argl) == 3:
             try:
-                type(eval(argl[2])) != dict
-            except NameError:
+                attrs = schema.parse_literal(argl[2])
+            except ValueError:
+                attrs = None
+            if type(attrs) != dict:
                 print("** value missing **")
                 return False
+        else:
+            attrs = {argl[2]: argl[3]}
 
-        if len(argl) == 4:
-            obj = objdict["{}.{}".format(argl[0], argl[1])]
-            if argl[2] in obj.__class__.__dict__.keys():
-                valtype = type(obj.__class__.__dict__[argl[2]])
-                obj.__dict__[argl[2]] = valtype(argl[3])
-            else:
-                obj.__dict__[argl[2]] = argl[3]
-        elif type(eval(argl[2])) == dict:
-            obj = objdict["{}.{}".format(argl[0], argl[1])]
-            for k, v in eval(argl[2]).items():
-                if (k in obj.__class__.__dict__.keys() and
-                        type(obj.__class__.__dict__[k]) in {str, int, float}):
-                    valtype = type(obj.__class__.__dict__[k])
-                    obj.__dict__[k] = valtype(v)
-                else:
-                    obj.__dict__[k] = v
-        storage.save()
+        try:
+            schema.apply(obj, attrs)
+            tracer.mark("mutation")
+            obj.save()
+        except ValueError:
+            print("** value invalid **")
+            return False
+        except RuntimeError as e:
+            print("** {} **".format(e))
+            return False
+        tracer.mark("save")
+
+    def do_memory(self, arg):
+        """Usage: memory [<class>]
+        Display the estimated memory used per class, per attribute and by
+        storage itself as JSON."""
+        argl = parse(arg)
+        if len(argl) > 0 and argl[0] not in HBNBCommand.__classes:
+            print("** class doesn't exist **")
+        elif len(argl) > 0:
+            print(json.dumps(storage.memory_report(argl[0]), indent=2))
+        else:
+            print(json.dumps(storage.memory_report(), indent=2))
+
+    def do_stats(self, arg):
+        """Usage: stats [on|off|reset|dump <file>]
+        Display storage instrumentation as JSON, switch it on or off,
+        reset it or write it to a file."""
+        argl = parse(arg)
+        if len(argl) == 0:
+            print(json.dumps(storage.stats_report(), indent=2))
+        elif argl[0] == "on" or argl[0] == "off":
+            stats.enabled = argl[0] == "on"
+        elif argl[0] == "reset":
+            stats.reset()
+        elif argl[0] == "dump" and len(argl) == 2:
+            stats.dump(argl[1], storage.stats_report())
+        else:
+            print("*** Unknown syntax: stats {}".format(arg))
+
+    def do_trace(self, arg):
+        """Usage: trace [on|off|reset|slow <ms> [<file>]]
+        Display per-command and per-phase latencies as JSON, switch
+        tracing on or off, reset it or log commands slower than <ms>."""
+        argl = parse(arg)
+        if len(argl) == 0:
+            print(json.dumps(tracer.to_dict(), indent=2))
+        elif argl[0] == "on" or argl[0] == "off":
+            tracer.enabled = argl[0] == "on"
+        elif argl[0] == "reset":
+            tracer.reset()
+        elif argl[0] == "slow" and len(argl) in (2, 3):
+            try:
+                tracer.threshold = float(argl[1]) / 1000
+            except ValueError:
+                print("** value invalid **")
+                return False
+            if len(argl) == 3:
+                tracer.log_path = argl[2]
+        else:
+            print("*** Unknown syntax: trace {}".format(arg))
 
 
 if __name__ == "__main__":
@@ -1,8 +1,24 @@
 #!/usr/bin/python3
 """__init__ magic method for models directory"""
 
+import os
 from models.engine.file_storage import FileStorage
 
 
-storage = FileStorage()
-storage.reload()
+if os.environ.get("HBNB_STORAGE_SOCKET"):
+    from models.engine.client_storage import ClientStorage
+    storage = ClientStorage(os.environ["HBNB_STORAGE_SOCKET"])
+elif os.environ.get("HBNB_STORAGE_NODES"):
+    from models.engine.partitioned_storage import PartitionedStorage
+    storage = PartitionedStorage(os.environ["HBNB_STORAGE_NODES"].split(","))
+elif os.environ.get("HBNB_REPLICA_DIR"):
+    from models.engine.replication import Follower
+    storage = Follower(os.environ["HBNB_REPLICA_DIR"])
+elif os.environ.get("HBNB_MAX_OBJECTS") or os.environ.get("HBNB_MAX_BYTES"):
+    from models.engine.bounded_storage import BoundedStorage
+    storage = BoundedStorage(
+        "file.json",
+        int(os.environ.get("HBNB_MAX_OBJECTS") or 0) or None,
+        int(os.environ.get("HBNB_MAX_BYTES") or 0) or None)
+else:
+    storage = FileStorage()
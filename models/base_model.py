@@ -4,6 +4,8 @@
 import models
 from uuid import uuid4
 from datetime import datetime
+from time import perf_counter
+from models.engine.stats import stats
 
 
 class BaseModel:
@@ -29,11 +31,22 @@ class BaseModel:
             self.created_at = datetime.today()
             self.updated_at = datetime.today()
             models.storage.new(self)
+            if stats.enabled:
+                stats.incr("model.create.{}".format(self.__class__.__name__))
+
+    def __setattr__(self, name, value):
+        """Set an attribute through storage, which keeps its lookups."""
+        models.storage.set_attribute(self, name, value)
 
     def save(self):
         """Updates updated_at with the current datetime"""
+        if stats.enabled:
+            start = perf_counter()
         self.updated_at = datetime.today()
         models.storage.save()
+        if stats.enabled:
+            stats.observe("model.save", perf_counter() - start)
+            stats.incr("model.save.{}".format(self.__class__.__name__))
 
     def __str__(self):
         """Return the print/str representation of the BaseModel instance."""
@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+"""Define Booking Class"""
+
+from models.base_model import BaseModel
+from models.engine.booking_index import parse_stay
+
+
+class Booking(BaseModel):
+    """Initialize a new Booking instance.
+
+    A booking holds its Place from check_in to check_out, excluded, both
+    being ISO dates (YYYY-MM-DD).
+
+    Args:
+        place_id (str): Booking's place id.
+        user_id (str): Booking's user id.
+        check_in (str): Booking's first night.
+        check_out (str): Booking's departure day.
+    """
+    place_id = ""
+    user_id = ""
+    check_in = ""
+    check_out = ""
+    _date_fields = ("check_in", "check_out")
+
+    def _validate(self, values):
+        """Raise ValueError if setting values would reverse the stay.
+
+        A stay may be left incomplete, e.g. while it is being filled in.
+        """
+        check_in = values.get("check_in", self.check_in)
+        check_out = values.get("check_out", self.check_out)
+        if check_in and check_out:
+            parse_stay(check_in, check_out)
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """Define city Class"""
 
+import models
 from models.base_model import BaseModel
 
 
@@ -13,3 +14,8 @@ class City(BaseModel):
     """
     state_id = ""
     name = ""
+
+    @property
+    def places(self):
+        """list: The Place instances of this City."""
+        return models.storage.children(self, "Place", "city_id")
@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""Defines the AmenityIndex class"""
+
+
+CHUNK_BITS = 4096
+
+
+class AmenityIndex:
+    """Represent an inverted index of amenity ids to Place keys.
+
+    Every indexed Place is given a bit position; each amenity id maps to
+    a bitmap of the positions of the places offering it, so combining
+    amenities is a handful of bitwise operations. Bitmaps are split into
+    chunks of CHUNK_BITS bits, each an int, so setting or clearing a bit
+    only copies its chunk rather than the whole bitmap.
+
+    Attributes:
+        __positions (dict): Maps a Place key to its bit position.
+        __keys (list): Maps a bit position back to its Place key, or
+            None once released.
+        __free (list): Bit positions released by removed places.
+        __amenities (dict): Maps a Place key to its indexed amenity ids.
+        __bitmaps (dict): Maps an amenity id to its bitmap of places, a
+            dict of chunk number -> non-zero chunk.
+    """
+
+    def __init__(self):
+        """Initialize an empty AmenityIndex."""
+        self.__positions = {}
+        self.__keys = []
+        self.__free = []
+        self.__amenities = {}
+        self.__bitmaps = {}
+
+    def __len__(self):
+        """Return the number of indexed places."""
+        return len(self.__positions)
+
+    def add(self, key, amenity_ids):
+        """Index the Place key as offering amenity_ids.
+
+        Re-adding a key replaces its previous amenities.
+        """
+        amenities = frozenset(amenity_ids)
+        pos = self.__positions.get(key)
+        if pos is None:
+            if self.__free:
+                pos = self.__free.pop()
+                self.__keys[pos] = key
+            else:
+                pos = len(self.__keys)
+                self.__keys.append(key)
+            self.__positions[key] = pos
+            old = frozenset()
+        else:
+            old = self.__amenities[key]
+        chunk, bit = divmod(pos, CHUNK_BITS)
+        bit = 1 << bit
+        for aid in old - amenities:
+            self.__clear(aid, chunk, bit)
+        for aid in amenities - old:
+            chunks = self.__bitmaps.setdefault(aid, {})
+            chunks[chunk] = chunks.get(chunk, 0) | bit
+        self.__amenities[key] = amenities
+
+    def sync(self, key, amenity_ids):
+        """Re-index key only if its amenities differ from the indexed ones.
+
+        Returns:
+            True if the index changed, False otherwise.
+        """
+        amenities = frozenset(amenity_ids)
+        if self.__amenities.get(key) == amenities:
+            return False
+        self.add(key, amenities)
+        return True
+
+    def remove(self, key):
+        """Remove the Place key from the index, if present."""
+        pos = self.__positions.pop(key, None)
+        if pos is None:
+            return
+        chunk, bit = divmod(pos, CHUNK_BITS)
+        bit = 1 << bit
+        for aid in self.__amenities.pop(key):
+            self.__clear(aid, chunk, bit)
+        self.__keys[pos] = None
+        self.__free.append(pos)
+
+    def __clear(self, aid, chunk, bit):
+        """Clear bit in chunk of the bitmap of aid, dropping empty ones."""
+        chunks = self.__bitmaps[aid]
+        value = chunks[chunk] & ~bit
+        if value:
+            chunks[chunk] = value
+        else:
+            del chunks[chunk]
+            if not chunks:
+                del self.__bitmaps[aid]
+
+    def query(self, all_of=(), any_of=(), none_of=()):
+        """Return the keys of the places matching an amenity query.
+
+        Args:
+            all_of (iterable): Amenity ids a place must all offer.
+            any_of (iterable): Amenity ids a place must offer one of,
+                ignored when empty.
+            none_of (iterable): Amenity ids a place must not offer.
+        Returns:
+            The list of matching Place keys, in bit position order.
+        """
+        result = None
+        for aid in all_of:
+            chunks = self.__bitmaps.get(aid, {})
+            if result is None:
+                result = dict(chunks)
+            else:
+                result = {n: value & chunks[n]
+                          for n, value in result.items() if n in chunks}
+        if any_of:
+            either = {}
+            for aid in any_of:
+                for n, value in self.__bitmaps.get(aid, {}).items():
+                    either[n] = either.get(n, 0) | value
+            if result is None:
+                result = either
+            else:
+                result = {n: value & either[n]
+                          for n, value in result.items() if n in either}
+        if result is None:
+            full = (1 << CHUNK_BITS) - 1
+            count = -(-len(self.__keys) // CHUNK_BITS)
+            result = dict.fromkeys(range(count), full)
+        for aid in none_of:
+            for n, value in self.__bitmaps.get(aid, {}).items():
+                if n in result:
+                    result[n] &= ~value
+        keys = []
+        size = len(self.__keys)
+        for n in sorted(result):
+            base = n * CHUNK_BITS
+            bits = bin(result[n])[:1:-1]
+            pos = bits.find("1")
+            while pos != -1 and base + pos < size:
+                key = self.__keys[base + pos]
+                if key is not None:
+                    keys.append(key)
+                pos = bits.find("1", pos + 1)
+        return keys
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""Defines the AsyncStorage class, an asyncio facade of storage.
+
+Disk work (loading the storage file, taking snapshots and writing them)
+runs in an executor, so awaiting it never blocks the event loop. Lookups
+are answered from memory once storage is loaded. Objects must only be
+modified from the event loop thread, and storage must be in thread-safe
+mode if they are modified while a save is in progress.
+"""
+
+import asyncio
+
+
+class AsyncStorage:
+    """Represent an asyncio interface to a storage engine.
+
+    Attributes:
+        storage (FileStorage): The storage engine wrapped.
+        executor (Executor): Where disk work runs, None for the loop's
+            default executor.
+    """
+
+    def __init__(self, storage, executor=None):
+        """Initialize an AsyncStorage wrapping storage."""
+        self.storage = storage
+        self.executor = executor
+        self.__loading = None
+        self.__batch = None
+
+    async def __run(self, func, *args):
+        """Return the result of func(*args), run in the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def aload(self):
+        """Load storage in the executor, the first time only."""
+        if self.__loading is None:
+            self.__loading = asyncio.ensure_future(
+                self.__run(self.storage.all))
+        try:
+            await asyncio.shield(self.__loading)
+        except Exception:
+            self.__loading = None
+            raise
+
+    async def areload(self):
+        """Reload the storage file in the executor."""
+        await self.aload()
+        await self.__run(self.storage.reload)
+
+    async def aget(self, cls_name, oid):
+        """Return the instance of cls_name with id oid, or None."""
+        await self.aload()
+        return self.storage.get(cls_name, oid)
+
+    async def asave(self):
+        """Save storage without blocking the event loop.
+
+        Calls made during the same iteration of the loop are batched: a
+        single snapshot is taken (see FileStorage.freeze) in the executor
+        once they have all been made, and written from a background
+        thread. Snapshots taken while a write is in progress are
+        coalesced by the writer, so concurrent saves result in as few
+        writes as possible.
+        """
+        await self.aload()
+        if self.__batch is None:
+            loop = asyncio.get_running_loop()
+            self.__batch = loop.create_future()
+            loop.call_soon(self.__start_batch)
+        await asyncio.shield(self.__batch)
+
+    def __start_batch(self):
+        """Save storage for the pending batch, in one executor job."""
+        batch = self.__batch
+        self.__batch = None
+        task = asyncio.ensure_future(self.__run(self.__save))
+        task.add_done_callback(lambda t: self.__finish_batch(batch, t))
+
+    def __save(self):
+        """Snapshot storage and wait for it to be written."""
+        self.storage.save_async()
+        self.storage.flush()
+
+    def __finish_batch(self, batch, task):
+        """Resolve batch with the outcome of the write task."""
+        if batch.done():
+            return
+        if task.cancelled():
+            batch.cancel()
+        elif task.exception() is not None:
+            batch.set_exception(task.exception())
+        else:
+            batch.set_result(None)
+
+    async def query(self, cls_name=None, where=None, batch_size=100):
+        """Iterate asynchronously over stored instances.
+
+        The instances stored when iteration starts are yielded, giving
+        control back to the event loop after every batch_size of them.
+
+        Args:
+            cls_name (str): Only yield instances of this class.
+            where (callable): Only yield instances for which it is true.
+            batch_size (int): Instances yielded between two pauses.
+        """
+        await self.aload()
+        if cls_name is None:
+            objl = list(self.storage.all().values())
+        else:
+            prefix = cls_name + "."
+            objl = [obj for key, obj in self.storage.all().items()
+                    if key.startswith(prefix)]
+        for i, obj in enumerate(objl, 1):
+            if where is None or where(obj):
+                yield obj
+            if i % batch_size == 0:
+                await asyncio.sleep(0)
+
+    async def aplaces_with_amenities(self, all_of=(), any_of=(),
+                                     none_of=()):
+        """Return the stored Place instances matching an amenity query.
+
+        See FileStorage.places_with_amenities.
+        """
+        await self.aload()
+        return self.storage.places_with_amenities(all_of, any_of, none_of)
@@ -0,0 +1,254 @@
+#!/usr/bin/python3
+"""Defines the IntervalTree and BookingIndex classes"""
+
+import random
+from datetime import date
+
+
+def to_date(value):
+    """Return the date of value, a date or an ISO date string.
+
+    Raises:
+        ValueError: If value is not an ISO date (YYYY-MM-DD).
+    """
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        raise ValueError("invalid date: {!r}".format(value))
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError("invalid date: {!r}".format(value))
+
+
+def parse_stay(check_in, check_out):
+    """Return the dates of the stay from check_in to check_out.
+
+    Raises:
+        ValueError: If a bound is not an ISO date, or check_out does not
+        follow check_in.
+    """
+    start, end = to_date(check_in), to_date(check_out)
+    if not start < end:
+        raise ValueError("check_out must follow check_in")
+    return start, end
+
+
+class _Node:
+    """Represent a stay in an IntervalTree."""
+
+    __slots__ = ("start", "end", "key", "priority", "left", "right",
+                 "max_end")
+
+    def __init__(self, start, end, key):
+        """Initialize a leaf of the stay [start, end) of key."""
+        self.start = start
+        self.end = end
+        self.key = key
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.max_end = end
+
+    def update(self):
+        """Recompute the greatest end of the subtree."""
+        self.max_end = self.end
+        for child in (self.left, self.right):
+            if child is not None and child.max_end > self.max_end:
+                self.max_end = child.max_end
+
+
+class IntervalTree:
+    """Represent a set of half-open intervals [start, end) with keys.
+
+    Intervals are kept in a treap ordered by (start, end, key), each node
+    holding the greatest end of its subtree, so subtrees ending before a
+    query are skipped: finding whether any interval overlaps a query is
+    O(log n) expected, and listing the m overlapping O(m + log n).
+    Bounds may be any comparable values, like ISO dates.
+    """
+
+    def __init__(self):
+        """Initialize an empty IntervalTree."""
+        self.__root = None
+        self.__size = 0
+
+    def __len__(self):
+        """Return the number of intervals."""
+        return self.__size
+
+    def add(self, start, end, key):
+        """Add the interval [start, end) of key."""
+        self.__root = self.__insert(self.__root, _Node(start, end, key))
+        self.__size += 1
+
+    def __insert(self, node, new):
+        """Insert new in the subtree node, return the subtree."""
+        if node is None:
+            return new
+        if (new.start, new.end, new.key) < (node.start, node.end, node.key):
+            node.left = self.__insert(node.left, new)
+            if node.left.priority > node.priority:
+                node = self.__rotate_right(node)
+        else:
+            node.right = self.__insert(node.right, new)
+            if node.right.priority > node.priority:
+                node = self.__rotate_left(node)
+        node.update()
+        return node
+
+    def remove(self, start, end, key):
+        """Remove the interval [start, end) of key, if present.
+
+        Returns:
+            True if the interval was removed, False otherwise.
+        """
+        size = self.__size
+        self.__root = self.__delete(self.__root, (start, end, key))
+        return self.__size < size
+
+    def __delete(self, node, target):
+        """Delete target from the subtree node, return the subtree."""
+        if node is None:
+            return None
+        here = (node.start, node.end, node.key)
+        if target < here:
+            node.left = self.__delete(node.left, target)
+        elif here < target:
+            node.right = self.__delete(node.right, target)
+        else:
+            self.__size -= 1
+            return self.__join(node.left, node.right)
+        node.update()
+        return node
+
+    def __join(self, left, right):
+        """Return the merge of two subtrees, left before right."""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self.__join(left.right, right)
+            left.update()
+            return left
+        right.left = self.__join(left, right.left)
+        right.update()
+        return right
+
+    def __rotate_right(self, node):
+        """Rotate node with its left child, return the new subtree."""
+        top = node.left
+        node.left = top.right
+        top.right = node
+        node.update()
+        top.update()
+        return top
+
+    def __rotate_left(self, node):
+        """Rotate node with its right child, return the new subtree."""
+        top = node.right
+        node.right = top.left
+        top.left = node
+        node.update()
+        top.update()
+        return top
+
+    def overlapping(self, start, end):
+        """Return the keys of the intervals overlapping [start, end)."""
+        keys = []
+        stack = [self.__root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_end <= start:
+                continue
+            if node.start < end:
+                if node.end > start:
+                    keys.append(node.key)
+                stack.append(node.right)
+            stack.append(node.left)
+        return keys
+
+    def overlaps(self, start, end):
+        """Return True if an interval overlaps [start, end)."""
+        node = self.__root
+        while node is not None:
+            if node.max_end <= start:
+                return False
+            if node.left is not None and node.left.max_end > start:
+                node = node.left
+                continue
+            if node.start >= end:
+                return False
+            if node.end > start:
+                return True
+            node = node.right
+        return False
+
+
+class BookingIndex:
+    """Represent an index of the stays booked at each Place.
+
+    Each Place id maps to an IntervalTree of the [check_in, check_out)
+    stays of its bookings, as dates. Bookings whose stay is incomplete,
+    or reversed while it is being changed, are not indexed.
+
+    Attributes:
+        __trees (dict): Maps a Place id to its IntervalTree.
+        __stays (dict): Maps a Booking key to its indexed
+            (place_id, check_in, check_out).
+    """
+
+    def __init__(self):
+        """Initialize an empty BookingIndex."""
+        self.__trees = {}
+        self.__stays = {}
+
+    def __len__(self):
+        """Return the number of indexed bookings."""
+        return len(self.__stays)
+
+    def add(self, key, place_id, check_in, check_out):
+        """Index the Booking key of place_id from check_in to check_out.
+
+        Re-adding a key replaces its previous stay.
+
+        Raises:
+            ValueError: If check_in or check_out is not an ISO date, in
+            which case the index is unchanged.
+        """
+        if place_id and check_in and check_out:
+            check_in, check_out = to_date(check_in), to_date(check_out)
+        self.remove(key)
+        if not (place_id and check_in and check_out) or \
+                not check_in < check_out:
+            return
+        tree = self.__trees.get(place_id)
+        if tree is None:
+            tree = self.__trees[place_id] = IntervalTree()
+        tree.add(check_in, check_out, key)
+        self.__stays[key] = (place_id, check_in, check_out)
+
+    def remove(self, key):
+        """Remove the Booking key from the index, if present."""
+        stay = self.__stays.pop(key, None)
+        if stay is None:
+            return
+        place_id, check_in, check_out = stay
+        tree = self.__trees[place_id]
+        tree.remove(check_in, check_out, key)
+        if not len(tree):
+            del self.__trees[place_id]
+
+    def overlapping(self, place_id, check_in, check_out):
+        """Return the keys of the bookings of place_id overlapping a stay."""
+        tree = self.__trees.get(place_id)
+        if tree is None:
+            return []
+        return tree.overlapping(to_date(check_in), to_date(check_out))
+
+    def is_free(self, place_id, check_in, check_out):
+        """Return True if no booking of place_id overlaps a stay."""
+        tree = self.__trees.get(place_id)
+        return tree is None or not tree.overlaps(to_date(check_in),
+                                                 to_date(check_out))
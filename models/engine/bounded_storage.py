@@ -0,0 +1,412 @@
+#!/usr/bin/python3
+"""Defines the BoundedStorage class, a storage engine under a memory budget.
+
+BoundedStorage keeps only recently used instances in memory. Others stay
+in the storage file and are found through its memory-mapped index (see
+record_index), then parsed when asked for. Set HBNB_MAX_OBJECTS and/or
+HBNB_MAX_BYTES to make models.storage a BoundedStorage of file.json.
+"""
+
+import heapq
+import json
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime
+from models import schema
+from models.engine import ordering, record_index, wire
+from models.engine.cursor import Cursor
+from models.engine.file_storage import referrers
+from models.engine.memory import class_report
+from models.engine.stats import stats
+
+
+class _Objects(Mapping):
+    """Represent the stored instances of a BoundedStorage, by key.
+
+    Instances are loaded when looked up, so iterating over the values
+    only keeps the cached ones in memory.
+    """
+
+    def __init__(self, storage):
+        """Initialize the mapping of the instances of storage."""
+        self.__storage = storage
+
+    def __getitem__(self, key):
+        """Return the instance of key, loading it if needed."""
+        cls_name, _, oid = key.partition(".")
+        obj = self.__storage.get(cls_name, oid)
+        if obj is None:
+            raise KeyError(key)
+        return obj
+
+    def __iter__(self):
+        """Iterate over the stored keys, in order."""
+        return self.__storage.keys()
+
+    def __len__(self):
+        """Return the number of stored instances."""
+        return self.__storage.count()
+
+
+class BoundedStorage:
+    """Represent a storage engine keeping a bounded cache of instances.
+
+    Clean instances are kept in a least recently used cache of at most
+    max_objects instances and max_bytes bytes of records; the least
+    recently used are dropped beyond either. An instance dropped while
+    still referenced elsewhere is the one returned by later lookups, so
+    changes made to it are not lost. New and modified instances (tracked
+    through set_attribute, like FileStorage) stay in memory until save(),
+    which rewrites the file copying the records of other instances from
+    the old file without parsing them.
+
+    Attributes:
+        file_path (str): The storage file.
+        max_objects (int): The maximum number of cached instances, or
+            None.
+        max_bytes (int): The maximum size of the records of cached
+            instances, or None.
+    """
+
+    def __init__(self, file_path="file.json", max_objects=10000,
+                 max_bytes=None):
+        """Initialize a BoundedStorage of file_path."""
+        self.file_path = file_path
+        self.max_objects = max_objects
+        self.max_bytes = max_bytes
+        self.__lock = threading.RLock()
+        self.__index = None
+        self.__cache = OrderedDict()
+        self.__bytes = 0
+        self.__known = weakref.WeakValueDictionary()
+        self.__dirty = {}
+        self.__deleted = set()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __open(self):
+        """Return the index of the file, opening it if needed."""
+        if self.__index is None:
+            try:
+                self.__index = record_index.RecordIndex(self.file_path)
+            except FileNotFoundError:
+                return None
+        return self.__index
+
+    def __cache_put(self, key, obj, size):
+        """Cache obj as the most recently used, then evict."""
+        old = self.__cache.pop(key, None)
+        if old is not None:
+            self.__bytes -= old[1]
+        self.__cache[key] = (obj, size)
+        self.__bytes += size
+        while self.__cache and (
+                (self.max_objects is not None and
+                 len(self.__cache) > self.max_objects) or
+                (self.max_bytes is not None and
+                 self.__bytes > self.max_bytes)):
+            _, (_, size) = self.__cache.popitem(last=False)
+            self.__bytes -= size
+
+    def __cache_pop(self, key):
+        """Remove key from the cache."""
+        old = self.__cache.pop(key, None)
+        if old is not None:
+            self.__bytes -= old[1]
+
+    def get(self, cls_name, oid):
+        """Return the instance of cls_name with id oid, or None."""
+        key = "{}.{}".format(cls_name, oid)
+        with self.__lock:
+            if key in self.__deleted:
+                return None
+            obj = self.__dirty.get(key)
+            if obj is not None:
+                return obj
+            hit = self.__cache.get(key)
+            if hit is not None:
+                self.__hits += 1
+                self.__cache.move_to_end(key)
+                return hit[0]
+            self.__misses += 1
+            index = self.__open()
+            record = None if index is None else index.record(key)
+            if record is None:
+                return None
+            obj = self.__known.get(key)
+            if obj is None:
+                obj = self.__known[key] = wire.to_object(json.loads(record))
+            self.__cache_put(key, obj, len(record))
+            return obj
+
+    def all(self):
+        """Return a mapping of every stored instance, by key.
+
+        Instances are loaded as they are looked up, see _Objects.
+        """
+        return _Objects(self)
+
+    def keys(self, cls_name=None, after=None):
+        """Yield the stored keys, or those of cls_name, in order.
+
+        With after, only the keys following it are yielded.
+        """
+        prefix = "" if cls_name is None else cls_name + "."
+        with self.__lock:
+            index = self.__open()
+            added = sorted(key for key in self.__dirty
+                           if key.startswith(prefix) and
+                           (after is None or key > after) and
+                           (index is None or index.lookup(key) is None))
+            deleted = set(self.__deleted)
+        stored = () if index is None else index.keys(prefix, after)
+        for key in heapq.merge(stored, added):
+            if key not in deleted:
+                yield key
+
+    def iter(self, cls=None, batch_size=100, after=None):
+        """Return a Cursor over stored instances, or those of cls.
+
+        Each batch is read from the index following the last key
+        returned, so a walk only loads batch_size instances at a time,
+        see FileStorage.iter.
+        """
+        return Cursor(lambda last, n: self.__page(cls, last, n),
+                      batch_size, after)
+
+    def select(self, cls_name, order_by="id", limit=None, where=None):
+        """Return the first instances of cls_name in an ordering.
+
+        Instances are looked up one at a time and only the limit best
+        are kept, see FileStorage.select.
+        """
+        if order_by == "id" and where is None and limit:
+            return next(self.iter(cls_name, limit).batches(), [])
+        objl = (self.get(cls_name, key.partition(".")[2])
+                for key in self.keys(cls_name))
+        objl = (obj for obj in objl if obj is not None and
+                (where is None or where(obj)))
+        return ordering.top_k(objl, order_by, limit)
+
+    def __page(self, cls_name, after, n):
+        """Return the n first (key, instance) pairs of cls_name after."""
+        page = []
+        for key in self.keys(cls_name, after):
+            name, _, oid = key.partition(".")
+            obj = self.get(name, oid)
+            if obj is not None:
+                page.append((key, obj))
+                if len(page) == n:
+                    break
+        return page
+
+    def count(self, cls_name=None):
+        """Return the number of stored instances, or of cls_name."""
+        prefix = "" if cls_name is None else cls_name + "."
+        with self.__lock:
+            index = self.__open()
+            if index is None:
+                return len([k for k in self.__dirty if k.startswith(prefix)])
+            added = [key for key in self.__dirty if key.startswith(prefix)
+                     and index.lookup(key) is None]
+            gone = [key for key in self.__deleted if key.startswith(prefix)
+                    and index.lookup(key) is not None]
+            return index.count(prefix) + len(added) - len(gone)
+
+    def new(self, obj):
+        """Add obj to storage, kept in memory until the next save()."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            self.__cache_pop(key)
+            self.__deleted.discard(key)
+            self.__known[key] = obj
+            self.__dirty[key] = obj
+
+    def set_attribute(self, obj, name, value):
+        """Set attribute name of obj to value, marking obj as dirty."""
+        object.__setattr__(obj, name, value)
+        key = "{}.{}".format(obj.__class__.__name__, obj.__dict__.get("id"))
+        with self.__lock:
+            if self.__known.get(key) is obj and key not in self.__deleted:
+                self.__cache_pop(key)
+                self.__dirty[key] = obj
+
+    def delete(self, obj, cascade=False):
+        """Remove obj, and what references it if cascade, from storage.
+
+        Returns:
+            The list of keys removed, obj's key first.
+        """
+        removed = []
+        queue = [obj]
+        with self.__lock:
+            for parent in queue:
+                pname = parent.__class__.__name__
+                key = "{}.{}".format(pname, parent.id)
+                if self.get(pname, parent.id) is not parent:
+                    continue
+                self.__cache_pop(key)
+                self.__dirty.pop(key, None)
+                self.__known.pop(key, None)
+                self.__deleted.add(key)
+                removed.append(key)
+                if cascade:
+                    for cname, attr in referrers(pname):
+                        queue.extend(self.children(parent, cname, attr))
+        return removed
+
+    def children(self, parent, cls_name, attr):
+        """Return the stored cls_name instances whose attr is parent.id.
+
+        Instances of cls_name are looked up one at a time.
+        """
+        objl = []
+        for key in self.keys(cls_name):
+            obj = self.get(cls_name, key.partition(".")[2])
+            if obj is not None and getattr(obj, attr, None) == parent.id:
+                objl.append(obj)
+        return objl
+
+    def places_with_amenities(self, all_of=(), any_of=(), none_of=()):
+        """Return the stored Place instances matching an amenity query."""
+        all_of, any_of, none_of = set(all_of), set(any_of), set(none_of)
+        objl = []
+        for key in self.keys("Place"):
+            obj = self.get("Place", key.partition(".")[2])
+            if obj is None:
+                continue
+            ids = set(obj.amenity_ids)
+            if (all_of <= ids and not ids & none_of and
+                    (not any_of or ids & any_of)):
+                objl.append(obj)
+        return objl
+
+    def save(self):
+        """Write the stored instances to the file, and its index.
+
+        Unchanged records are copied from the old file as they are.
+        Dirty instances are then cached as clean ones.
+        """
+        with self.__lock:
+            index = self.__open()
+            dirty = dict(self.__dirty)
+            records = {key: json.dumps(obj.to_dict()).encode()
+                       for key, obj in dirty.items()}
+
+            def items():
+                if index is not None:
+                    for key, offset, length in index.entries():
+                        if key in records:
+                            yield key, records.pop(key)
+                        elif key not in self.__deleted:
+                            yield key, index.raw(offset, length)
+                for key, record in records.items():
+                    yield key, record
+
+            sizes = {key: len(record) for key, record in records.items()}
+            record_index.write(self.file_path, items())
+            if index is not None:
+                index.close()
+            self.__index = None
+            self.__dirty = {}
+            self.__deleted = set()
+            for key, obj in dirty.items():
+                self.__cache_put(key, obj, sizes[key])
+
+    def update_many(self, cls_name, updates):
+        """Apply several attribute updates to instances of cls_name at once.
+
+        See FileStorage.update_many.
+        """
+        missing = []
+        pending = []
+        with self.__lock:
+            for oid, attrs in updates.items():
+                obj = self.get(cls_name, oid)
+                if obj is None:
+                    missing.append(oid)
+                else:
+                    cls = obj.__class__
+                    values = {k: schema.coerce(cls, k, v)
+                              for k, v in attrs.items()}
+                    schema.validate(obj, values)
+                    pending.append((obj, values))
+            now = datetime.today()
+            for obj, values in pending:
+                for k, v in values.items():
+                    setattr(obj, k, v)
+                obj.updated_at = now
+            self.save()
+        return missing
+
+    def reload(self):
+        """Forget cached instances and changes, and reopen the file."""
+        with self.__lock:
+            if self.__index is not None:
+                self.__index.close()
+            self.__index = None
+            self.__cache = OrderedDict()
+            self.__bytes = 0
+            self.__known = weakref.WeakValueDictionary()
+            self.__dirty = {}
+            self.__deleted = set()
+
+    def cache_info(self):
+        """Return the size and hit counts of the cache.
+
+        Returns:
+            A dict with the number and record bytes of cached instances,
+            the number of dirty instances, and cache hits and misses.
+        """
+        with self.__lock:
+            return {"objects": len(self.__cache), "bytes": self.__bytes,
+                    "dirty": len(self.__dirty), "hits": self.__hits,
+                    "misses": self.__misses}
+
+    def memory_report(self, cls_name=None, sample=1000):
+        """Return an estimate of the memory used by the instances held.
+
+        Only cached and dirty instances are accounted for, the others
+        staying in the file. See FileStorage.memory_report.
+        """
+        with self.__lock:
+            held = {key: obj for key, (obj, _) in self.__cache.items()}
+            held.update(self.__dirty)
+            cache = (sys.getsizeof(self.__cache) +
+                     sum(sys.getsizeof(k) for k in self.__cache))
+        groups = {}
+        for key, obj in held.items():
+            cname = key.partition(".")[0]
+            if cls_name is None or cname == cls_name:
+                groups.setdefault(cname, []).append(obj)
+        report = {"classes": {cname: class_report(objl, sample)
+                              for cname, objl in sorted(groups.items())}}
+        total = sum(c["bytes"] for c in report["classes"].values())
+        if cls_name is None:
+            report["storage"] = {"cache": cache}
+            total += cache
+        report["total_bytes"] = total
+        return report
+
+    def stats_report(self):
+        """Return the instrumentation report of storage as a dict.
+
+        See FileStorage.stats_report; the number of objects per class is
+        read from the index, and the report also holds cache_info().
+        """
+        report = stats.to_dict()
+        per_class = {}
+        for key in self.keys():
+            cls_name = key.partition(".")[0]
+            per_class[cls_name] = per_class.get(cls_name, 0) + 1
+        report["objects"] = dict(sorted(per_class.items()))
+        try:
+            report["file_bytes"] = os.path.getsize(self.file_path)
+        except OSError:
+            report["file_bytes"] = None
+        report["cache"] = self.cache_info()
+        return report
@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+"""Defines the ChangeFeed class, the ordered feed of storage mutations.
+
+Storage emits an event for every mutation: "create" when an instance is
+added, "update" with the attributes changed since the last save, and
+"delete" when an instance is removed. An event is a dict:
+
+    {"seq": 42, "op": "update", "class": "State", "id": "...",
+     "fields": {"name": "Ohio", "updated_at": "..."},
+     "time": "2017-09-28T21:05:54.119427"}
+
+Sequence numbers increase by one per event. Events are passed to the
+subscribers of the feed and, when the feed has a log, appended to it as
+JSON lines, so consumers can resume from the last sequence number they
+processed. Set HBNB_CHANGE_LOG to the path of the log to keep one.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class ChangeFeed:
+    """Represent an ordered feed of change events.
+
+    Attributes:
+        log_path (str): The path of the JSON lines log, or None.
+        sync (bool): Whether the log is synced to disk after each event.
+    """
+
+    def __init__(self, log_path=None, sync=False):
+        """Initialize a ChangeFeed without subscribers."""
+        self.log_path = log_path
+        self.sync = sync
+        self.__lock = threading.RLock()
+        self.__subscribers = {}
+        self.__next_token = 0
+        self.__seq = None
+        self.__log = None
+
+    @property
+    def active(self):
+        """bool: Whether events are consumed, i.e. should be emitted."""
+        return bool(self.__subscribers) or self.log_path is not None
+
+    @property
+    def seq(self):
+        """int: The sequence number of the last event emitted."""
+        with self.__lock:
+            return self.__last_seq()
+
+    def __last_seq(self):
+        """Return the last sequence number, read from the log once."""
+        if self.__seq is None:
+            self.__seq = 0
+            if self.log_path is not None:
+                self.__seq = self.__tail()
+        return self.__seq
+
+    def __tail(self):
+        """Return the sequence number of the last valid logged event."""
+        try:
+            f = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return 0
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            data = b""
+            while pos > 0:
+                step = min(65536, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+                lines = data.split(b"\n")
+                for line in reversed(lines if pos == 0 else lines[1:]):
+                    try:
+                        return json.loads(line)["seq"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        return 0
+
+    def subscribe(self, callback, after=None):
+        """Call callback with every event from now on.
+
+        Args:
+            callback (callable): Called with each event, in order.
+            after (int): Replay the logged events with a greater sequence
+                number to callback first.
+        Returns:
+            A token to pass to unsubscribe().
+        """
+        with self.__lock:
+            if after is not None:
+                for event in self.read(after):
+                    callback(event)
+            self.__next_token += 1
+            self.__subscribers[self.__next_token] = callback
+            return self.__next_token
+
+    def unsubscribe(self, token):
+        """Stop calling the subscriber of token."""
+        with self.__lock:
+            self.__subscribers.pop(token, None)
+
+    def emit(self, op, cls_name, oid, fields=None):
+        """Number, log and publish a change event.
+
+        Returns:
+            The event.
+        """
+        with self.__lock:
+            self.__seq = self.__last_seq() + 1
+            event = {
+                "seq": self.__seq,
+                "op": op,
+                "class": cls_name,
+                "id": oid,
+                "fields": fields,
+                "time": datetime.today().isoformat()
+            }
+            if self.log_path is not None:
+                if self.__log is None:
+                    self.__log = self.__open()
+                self.__log.write(json.dumps(event).encode() + b"\n")
+                self.__log.flush()
+                if self.sync:
+                    os.fsync(self.__log.fileno())
+            for callback in list(self.__subscribers.values()):
+                callback(event)
+            return event
+
+    def __open(self):
+        """Open the log for appending, after any partial last line."""
+        log = open(self.log_path, "a+b")
+        if log.seek(0, os.SEEK_END) > 0:
+            log.seek(-1, os.SEEK_END)
+            if log.read(1) != b"\n":
+                log.write(b"\n")
+        return log
+
+    def read(self, after=0):
+        """Yield the logged events whose sequence number is above after.
+
+        A partial last line, left by a crash while writing, is ignored.
+        """
+        if self.log_path is None:
+            return
+        try:
+            f = open(self.log_path)
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event["seq"] > after:
+                    yield event
+
+    def close(self):
+        """Close the log, reopened by the next event."""
+        with self.__lock:
+            if self.__log is not None:
+                self.__log.close()
+                self.__log = None
+
+
+feed = ChangeFeed(os.environ.get("HBNB_CHANGE_LOG"))
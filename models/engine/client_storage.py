@@ -0,0 +1,259 @@
+#!/usr/bin/python3
+"""Defines the ClientStorage class, a storage engine backed by a server.
+
+models.storage is a ClientStorage when HBNB_STORAGE_SOCKET names the
+socket of a running storage server (see storage_server), so consoles
+share the objects of one server instead of each loading the file.
+"""
+
+import socket
+import threading
+import weakref
+from datetime import datetime
+from models import schema
+from models.engine import wire
+
+
+class ClientStorage:
+    """Represent a storage engine forwarding requests to a storage server.
+
+    Instances are fetched from the server when asked for. Changes made to
+    them (tracked through set_attribute, like FileStorage) and new
+    instances are kept locally as dirty, and sent in one batch before the
+    next request reading storage, or by save().
+
+    Connections are pooled, and batches of requests are pipelined on one
+    connection: they are all sent before any response is read.
+
+    Attributes:
+        path (str): The path of the server's socket.
+        pool_size (int): The maximum number of idle connections kept.
+    """
+
+    def __init__(self, path, pool_size=4):
+        """Initialize a ClientStorage of the server listening on path."""
+        self.path = path
+        self.pool_size = pool_size
+        self.__pool = []
+        self.__pool_lock = threading.Lock()
+        self.__known = weakref.WeakValueDictionary()
+        self.__dirty = {}
+
+    def __connect(self):
+        """Return an idle connection of the pool, or a new one."""
+        with self.__pool_lock:
+            if self.__pool:
+                return self.__pool.pop()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        return sock, sock.makefile("rb")
+
+    def __release(self, conn):
+        """Return conn to the pool, or close it if the pool is full."""
+        with self.__pool_lock:
+            if len(self.__pool) < self.pool_size:
+                self.__pool.append(conn)
+                return
+        self.__close(conn)
+
+    def __close(self, conn):
+        """Close the connection conn."""
+        conn[1].close()
+        conn[0].close()
+
+    def close(self):
+        """Close every pooled connection."""
+        with self.__pool_lock:
+            pool = self.__pool
+            self.__pool = []
+        for conn in pool:
+            self.__close(conn)
+
+    def pipeline(self, requests):
+        """Send requests at once and return the list of their results.
+
+        Raises:
+            RuntimeError: If the server failed a request, once every
+            response has been read.
+        """
+        conn = self.__connect()
+        try:
+            conn[0].sendall(b"".join(wire.encode(r) for r in requests))
+            responses = [wire.read(conn[1]) for r in requests]
+        except BaseException:
+            self.__close(conn)
+            raise
+        self.__release(conn)
+        for response in responses:
+            if "error" in response:
+                raise RuntimeError(response["error"])
+        return [response["result"] for response in responses]
+
+    def __request(self, op, **args):
+        """Send the request op with args, after the dirty instances."""
+        args["op"] = op
+        return self.__send([args])[-1]
+
+    def __send(self, requests):
+        """Pipeline the dirty instances then requests, return the results.
+
+        Instances stay dirty if the requests could not be sent.
+        """
+        dirty = self.__dirty
+        if dirty:
+            self.__dirty = {}
+            put = {"op": "put",
+                   "records": [obj.to_dict() for obj in dirty.values()]}
+            requests = [put] + requests
+        try:
+            results = self.pipeline(requests)
+        except BaseException:
+            dirty.update(self.__dirty)
+            self.__dirty = dirty
+            raise
+        return results[1:] if dirty else results
+
+    def __track(self, record):
+        """Return the instance of record.
+
+        An instance is only built once per key: while it is alive, later
+        records of the same key refresh it, unless it is dirty.
+        """
+        key = "{}.{}".format(record["__class__"], record["id"])
+        obj = self.__known.get(key)
+        if obj is None:
+            obj = self.__known[key] = wire.to_object(record)
+        elif key not in self.__dirty:
+            attrs = wire.to_object(record).__dict__
+            obj.__dict__.clear()
+            obj.__dict__.update(attrs)
+        return obj
+
+    def adopt(self, obj, dirty=False):
+        """Track obj, already stored on the server, like a fetched one.
+
+        With dirty, obj is also sent with the next request.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        self.__known[key] = obj
+        if dirty:
+            self.__dirty[key] = obj
+
+    def release(self, key):
+        """Stop tracking the instance of key.
+
+        Returns:
+            The instance, or None if it is not tracked, and whether it
+            had changes not sent yet.
+        """
+        dirty = self.__dirty.pop(key, None) is not None
+        return self.__known.pop(key, None), dirty
+
+    def all(self):
+        """Return a dictionary of every stored instance, by key."""
+        return {"{}.{}".format(record["__class__"], record["id"]):
+                self.__track(record) for record in self.__request("all")}
+
+    def get(self, cls_name, oid):
+        """Return the instance of cls_name with id oid, or None."""
+        key = "{}.{}".format(cls_name, oid)
+        if key in self.__dirty:
+            return self.__dirty[key]
+        record = self.__request("get", cls=cls_name, id=oid)
+        return None if record is None else self.__track(record)
+
+    def new(self, obj):
+        """Add obj to storage, sent to the server with the next request."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        self.__known[key] = obj
+        self.__dirty[key] = obj
+
+    def set_attribute(self, obj, name, value):
+        """Set attribute name of obj to value, marking obj as dirty."""
+        object.__setattr__(obj, name, value)
+        key = "{}.{}".format(obj.__class__.__name__, obj.__dict__.get("id"))
+        if self.__known.get(key) is obj:
+            self.__dirty[key] = obj
+
+    def delete(self, obj, cascade=False):
+        """Remove obj, and what references it if cascade, from storage.
+
+        Returns:
+            The list of keys removed, obj's key first.
+        """
+        removed = self.__request("delete", cls=obj.__class__.__name__,
+                                 id=obj.id, cascade=cascade)
+        for key in removed:
+            self.__known.pop(key, None)
+            self.__dirty.pop(key, None)
+        return removed
+
+    def children(self, parent, cls_name, attr):
+        """Return the stored cls_name instances whose attr is parent.id."""
+        records = self.__request("children", cls=cls_name, attr=attr,
+                                 id=parent.id)
+        return [self.__track(record) for record in records]
+
+    def places_with_amenities(self, all_of=(), any_of=(), none_of=()):
+        """Return the stored Place instances matching an amenity query."""
+        records = self.__request("amenities", all_of=list(all_of),
+                                 any_of=list(any_of), none_of=list(none_of))
+        return [self.__track(record) for record in records]
+
+    def count(self, cls_name=None):
+        """Return the number of stored instances, or of cls_name."""
+        return self.__request("count", cls=cls_name)
+
+    def keys(self, cls_name=None):
+        """Return the sorted keys of stored instances, or of cls_name."""
+        return self.__request("keys", cls=cls_name)
+
+    def save(self):
+        """Send the dirty instances and have the server write its file."""
+        self.__request("save")
+
+    def update_many(self, cls_name, updates):
+        """Apply several attribute updates to instances of cls_name at once.
+
+        The instances are fetched in one pipelined batch, see
+        FileStorage.update_many.
+        """
+        oids = list(updates)
+        records = self.__send([{"op": "get", "cls": cls_name, "id": oid}
+                               for oid in oids])
+        missing = []
+        pending = []
+        for oid, record in zip(oids, records):
+            if record is None:
+                missing.append(oid)
+                continue
+            obj = self.__track(record)
+            cls = obj.__class__
+            values = {k: schema.coerce(cls, k, v)
+                      for k, v in updates[oid].items()}
+            schema.validate(obj, values)
+            pending.append((obj, values))
+        now = datetime.today()
+        for obj, values in pending:
+            for k, v in values.items():
+                setattr(obj, k, v)
+            obj.updated_at = now
+        self.save()
+        return missing
+
+    def reload(self):
+        """Forget local changes and have the server reload its file."""
+        self.__dirty = {}
+        self.__request("reload")
+
+    def memory_report(self, cls_name=None, sample=1000):
+        """Return the server's estimate of the memory used by objects."""
+        return self.__request("memory", cls=cls_name, sample=sample)
+
+    def stats_report(self):
+        """Return the server's instrumentation report."""
+        return self.__request("stats")
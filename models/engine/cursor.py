@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Defines the Cursor class, a resumable walk over stored instances."""
+
+
+class Cursor:
+    """Represent a walk over stored instances in key order.
+
+    Instances are fetched batch_size at a time, each batch starting
+    after the key of the last instance returned, so the walk holds no
+    more than a batch and goes on when storage changes meanwhile:
+    deleted instances not reached yet are skipped, and instances added
+    after the position are returned. A walk can be resumed later, even
+    by another process, by starting a new cursor after its position.
+
+    Attributes:
+        batch_size (int): The number of instances fetched at a time.
+        position (str): The key of the last instance returned, or the
+            key the walk started after.
+    """
+
+    def __init__(self, page, batch_size=100, after=None):
+        """Initialize a Cursor.
+
+        Args:
+            page (callable): page(after, n) returns the list of at most
+                n (key, instance) pairs following the key after, or
+                following the start if after is None, in key order.
+            batch_size (int): The number of instances fetched at a time.
+            after (str): The key to start after, or None.
+        Raises:
+            ValueError: If batch_size is not positive.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.batch_size = batch_size
+        self.position = after
+        self.__page = page
+        self.__done = False
+
+    def __iter__(self):
+        """Yield the instances, in key order."""
+        for batch in self.__pages():
+            for key, obj in batch:
+                self.position = key
+                yield obj
+
+    def batches(self):
+        """Yield the lists of instances of each batch, in key order."""
+        for batch in self.__pages():
+            self.position = batch[-1][0]
+            yield [obj for key, obj in batch]
+
+    def __pages(self):
+        """Yield the non-empty pages following position."""
+        after = self.position
+        while not self.__done:
+            batch = self.__page(after, self.batch_size)
+            if len(batch) < self.batch_size:
+                self.__done = True
+            if batch:
+                after = batch[-1][0]
+                yield batch
@@ -1,7 +1,24 @@
 #!/usr/bin/python3
 """Defines the FileStorage class"""
 
+import atexit
+import bisect
+import copy
 import json
+import os
+import sys
+import threading
+from datetime import datetime
+from time import perf_counter
+from models import schema
+from models.engine.stats import stats
+from models.engine.changes import feed
+from models.engine.cursor import Cursor
+from models.engine.memory import class_report, deep_sizeof
+from models.engine import ordering, record_index, snapshot
+from models.engine.amenity_index import AmenityIndex
+from models.engine.booking_index import BookingIndex, parse_stay, to_date
+from models.engine.locks import NullLock, RWLock
 from models.base_model import BaseModel
 from models.user import User
 from models.state import State
@@ -9,6 +26,21 @@ from models.city import City
 from models.amenity import Amenity
 from models.place import Place
 from models.review import Review
+from models.booking import Booking
+
+REFERENCES = {
+    "City": {"state_id": "State"},
+    "Place": {"city_id": "City", "user_id": "User"},
+    "Review": {"place_id": "Place", "user_id": "User"},
+    "Booking": {"place_id": "Place", "user_id": "User"}
+}
+
+
+def referrers(cls_name):
+    """Return the (class name, attribute) pairs referencing cls_name."""
+    return [(cname, attr)
+            for cname, refs in REFERENCES.items()
+            for attr, target in refs.items() if target == cls_name]
 
 
 class FileStorage:
@@ -16,35 +48,898 @@ class FileStorage:
     Attributes:
         __file_path (str): The name of the file to save objects to.
         __objects (dict): A dictionary of instantiated objects.
+        __references (dict): Maps a class name to its reference attributes
+            and the class name each of them points to (REFERENCES).
+        __children (dict): Reverse lookups of references, mapping
+            (class name, attribute, parent id) to the keys of the
+            instances holding that reference.
+        __amenities (AmenityIndex): The amenity id -> Place keys index.
+        __bookings (BookingIndex): The stays of Bookings, by Place id.
+        __loaded (bool): Whether __file_path has been read. It is read on
+            first use rather than at import time, see __load.
+        __index (RecordIndex): The index of __file_path, used by get()
+            and count() until it is loaded, or None.
+        __lock (RWLock): Guards __objects and the indexes in thread-safe
+            mode, a NullLock otherwise (see set_thread_safe).
+        __file_lock (Lock): Serializes writes to __file_path.
+        __saves (int): The number of snapshots taken by save().
+        __written (int): The number of the snapshot last written.
+        __records (dict): Maps keys to the (attributes, to_dict(), JSON
+            bytes) their object had when frozen, dropped whenever it
+            changes through setattr (see freeze).
+        __writer (Thread): The background thread of save_async, once
+            started.
+        __pending (tuple): The (number, encoded records) snapshot
+            waiting for the writer, or None.
+        __waiters (list): Events to set once __pending is written.
+        __writing (bool): Whether the writer is writing a snapshot.
+        __error (Exception): The last error of the writer, raised by
+            flush().
+        __cond (Condition): Guards the writer's state and __cachers.
+        __cachers (list): The threads writing the snapshot cache of a
+            reload(), see flush().
+        __at_exit (bool): Whether flush() is registered to run at exit.
+        __changed (dict): Maps keys to the names of the attributes set
+            since the last snapshot, while the change feed is active.
+        __sorted (list): The sorted keys of __objects, built by the first
+            iter(), or None. Keys added since are in __added.
+        __added (set): The keys added to __objects since __sorted was
+            last sorted, merged into it by the next page of a cursor.
+        __sorted_of (dict): The __objects dict __sorted was built from.
     """
 
     __file_path = "file.json"
     __objects = {}
+    __references = REFERENCES
+    __children = {}
+    __amenities = AmenityIndex()
+    __bookings = BookingIndex()
+    __loaded = False
+    __index = None
+    if os.environ.get("HBNB_THREAD_SAFE") == "1":
+        __lock = RWLock()
+    else:
+        __lock = NullLock()
+    __file_lock = threading.Lock()
+    __saves = 0
+    __written = 0
+    __records = {}
+    __writer = None
+    __pending = None
+    __waiters = []
+    __writing = False
+    __error = None
+    __cond = threading.Condition()
+    __cachers = []
+    __at_exit = False
+    __changed = {}
+    __sorted = None
+    __added = set()
+    __sorted_of = None
+
+    def set_thread_safe(self, enabled=True):
+        """Switch reader/writer locking of storage on or off.
+
+        In thread-safe mode every method locks storage, and all() returns
+        a copy of __objects that callers can iterate while other threads
+        add or delete objects. Switch modes before starting threads.
+        """
+        FileStorage.__lock = RWLock() if enabled else NullLock()
+
+    def is_thread_safe(self):
+        """Return True if storage is in thread-safe mode."""
+        return isinstance(FileStorage.__lock, RWLock)
 
     def all(self):
-        """Return the dictionary __objects."""
-        return FileStorage.__objects
+        """Return the dictionary __objects.
+
+        In thread-safe mode, a copy of it is returned.
+        """
+        self.__load()
+        if FileStorage.__lock.__class__ is NullLock:
+            return FileStorage.__objects
+        with FileStorage.__lock.read():
+            return dict(FileStorage.__objects)
+
+    def get(self, cls_name, oid):
+        """Return the instance of cls_name with id oid, or None.
+
+        Until __file_path is loaded, only the record of the instance is
+        read, through the index of the file (see record_index). The
+        instance is kept, and replaces its copy once the file is loaded.
+        """
+        key = "{}.{}".format(cls_name, oid)
+        if not FileStorage.__loaded:
+            with FileStorage.__lock.write():
+                index = self.__open_index()
+                if index is not None:
+                    obj = FileStorage.__objects.get(key)
+                    record = index.record(key) if obj is None else None
+                    if record is not None:
+                        o = json.loads(record)
+                        cls_name = o["__class__"]
+                        del o["__class__"]
+                        obj = eval(cls_name)(**o)
+                        self.__store(obj)
+                    return obj
+        self.__load()
+        with FileStorage.__lock.read():
+            return FileStorage.__objects.get(key)
+
+    def count(self, cls_name=None):
+        """Return the number of stored instances, or of cls_name.
+
+        Until __file_path is loaded, keys are counted in its index.
+        """
+        prefix = "" if cls_name is None else cls_name + "."
+        if not FileStorage.__loaded:
+            with FileStorage.__lock.write():
+                index = self.__open_index()
+                if index is not None:
+                    return index.count(prefix)
+        self.__load()
+        with FileStorage.__lock.read():
+            return len([key for key in FileStorage.__objects
+                        if key.startswith(prefix)])
+
+    def iter(self, cls=None, batch_size=100, after=None):
+        """Return a Cursor over stored instances, or those of cls.
+
+        Instances are returned in key order, batch_size at a time; each
+        batch is found by bisecting the sorted keys of __objects, sorted
+        by a first cursor. Keys added later are merged in by the next
+        page read, in one pass.
+
+        Args:
+            cls (str): Only return instances of the class named cls.
+            batch_size (int): The number of instances fetched at a time.
+            after (str): Start after this key, e.g. the position of an
+                earlier cursor.
+        """
+        prefix = "" if cls is None else cls + "."
+        self.__load()
+        return Cursor(lambda last, n: self.__page(prefix, last, n),
+                      batch_size, after)
+
+    def select(self, cls_name, order_by="id", limit=None, where=None):
+        """Return the first instances of cls_name in an ordering.
+
+        Args:
+            cls_name (str): The class name of the instances.
+            order_by (str): The attribute ordering them, prefixed with
+                "-" for descending order; ties are ordered by id.
+            limit (int): The number of instances returned, or None for
+                all of them.
+            where (callable): Only return instances for which it is true.
+        Returns:
+            The list of instances, found in O(n log limit), see ordering.
+            Ordered by id, the limit first are read from the sorted keys
+            of iter() instead.
+        Raises:
+            ValueError: If the values of order_by cannot be compared.
+        """
+        if order_by == "id" and where is None and limit:
+            return next(self.iter(cls_name, limit).batches(), [])
+        self.__load()
+        prefix = cls_name + "."
+        with FileStorage.__lock.read():
+            objl = [obj for key, obj in FileStorage.__objects.items()
+                    if key.startswith(prefix)]
+        if where is not None:
+            objl = filter(where, objl)
+        return ordering.top_k(objl, order_by, limit)
+
+    def __page(self, prefix, after, n):
+        """Return the n first (key, instance) pairs with prefix after.
+
+        Pages are read under the read lock. The write lock is only taken
+        when the sorted keys must first be built, or merged with the keys
+        added since. They are built again when they name a key no longer
+        stored, which happens once __objects is changed directly.
+        """
+        with FileStorage.__lock.read():
+            keys = FileStorage.__sorted
+            if keys is not None and not FileStorage.__added and \
+                    FileStorage.__sorted_of is FileStorage.__objects and \
+                    len(keys) == len(FileStorage.__objects):
+                page = self.__slice(keys, prefix, after, n)
+                if page is not None:
+                    return page
+        with FileStorage.__lock.write():
+            page = self.__slice(self.__sort_keys(), prefix, after, n)
+            if page is None:
+                FileStorage.__sorted = None
+                page = self.__slice(self.__sort_keys(), prefix, after, n)
+            return page
+
+    def __sort_keys(self):
+        """Return the sorted keys of __objects, merging the keys added."""
+        keys = FileStorage.__sorted
+        added = FileStorage.__added
+        if keys is None or \
+                FileStorage.__sorted_of is not FileStorage.__objects or \
+                len(keys) + len(added) != len(FileStorage.__objects):
+            keys = FileStorage.__sorted = sorted(FileStorage.__objects)
+            FileStorage.__sorted_of = FileStorage.__objects
+        elif added:
+            keys.extend(added)
+            keys.sort()
+        FileStorage.__added = set()
+        return keys
+
+    def __slice(self, keys, prefix, after, n):
+        """Return the n first (key, instance) pairs of keys with prefix.
+
+        Returns:
+            The pairs, or None if keys name a key no longer stored.
+        """
+        i = bisect.bisect_left(keys, prefix)
+        if after is not None:
+            i = max(i, bisect.bisect_right(keys, after))
+        page = []
+        for key in keys[i:i + n]:
+            if not key.startswith(prefix):
+                break
+            obj = FileStorage.__objects.get(key)
+            if obj is None:
+                return None
+            page.append((key, obj))
+        return page
+
+    def __open_index(self):
+        """Return the index of __file_path while it is not loaded, or None.
+
+        The index is built if the file has none, or a stale one.
+        """
+        if FileStorage.__loaded:
+            return None
+        if FileStorage.__index is None:
+            try:
+                FileStorage.__index = record_index.RecordIndex(
+                    FileStorage.__file_path)
+            except (OSError, ValueError):
+                return None
+        return FileStorage.__index
 
     def new(self, obj):
-        """Set in __objects obj with key <obj_class_name>.id"""
-        ocname = obj.__class__.__name__
-        FileStorage.__objects["{}.{}".format(ocname, obj.id)] = obj
+        """Set in __objects obj with key <obj_class_name>.id
+
+        Emits a create event, or an update event with the attributes
+        that differ when obj replaces another instance.
+        """
+        self.__load()
+        with FileStorage.__lock.write():
+            old = self.__store(obj)
+            if feed.active and old is not obj:
+                self.__emit_new(old, obj)
+        if stats.enabled:
+            stats.incr("storage.new")
+
+    def __store(self, obj):
+        """Set obj in __objects and return the instance it replaced."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        old = FileStorage.__objects.get(key)
+        if old is not None:
+            self.__unlink(key, old)
+        FileStorage.__objects[key] = obj
+        FileStorage.__records.pop(key, None)
+        self.__link(key, obj)
+        if old is None and FileStorage.__sorted is not None:
+            FileStorage.__added.add(key)
+        return old
+
+    def __emit_new(self, old, obj):
+        """Emit the change event of obj replacing old, None if added."""
+        fields = obj.to_dict()
+        cname = fields.pop("__class__")
+        if old is None:
+            feed.emit("create", cname, obj.id, fields)
+            return
+        before = old.to_dict()
+        fields = {k: v for k, v in fields.items() if before.get(k) != v}
+        fields.update({k: None for k in before
+                       if k not in fields and k not in obj.__dict__ and
+                       k != "__class__"})
+        if fields:
+            feed.emit("update", cname, obj.id, fields)
+
+    def delete(self, obj, cascade=False):
+        """Remove obj from __objects.
+
+        Args:
+            obj (BaseModel): The instance to remove.
+            cascade (bool): Also remove, recursively, every instance
+                referencing obj (State -> City -> Place -> Review/Booking
+                and User -> Place/Review/Booking).
+        Returns:
+            The list of keys removed, obj's key first.
+        """
+        self.__load()
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with FileStorage.__lock.write():
+            if FileStorage.__objects.get(key) is not obj:
+                return []
+            removed = []
+            queue = [obj]
+            seen = {key}
+            for parent in queue:
+                pname = parent.__class__.__name__
+                pkey = "{}.{}".format(pname, parent.id)
+                self.__unlink(pkey, parent)
+                del FileStorage.__objects[pkey]
+                if pkey in FileStorage.__added:
+                    FileStorage.__added.discard(pkey)
+                elif FileStorage.__sorted is not None:
+                    keys = FileStorage.__sorted
+                    i = bisect.bisect_left(keys, pkey)
+                    if i < len(keys) and keys[i] == pkey:
+                        del keys[i]
+                FileStorage.__records.pop(pkey, None)
+                FileStorage.__changed.pop(pkey, None)
+                if feed.active:
+                    feed.emit("delete", pname, parent.id)
+                removed.append(pkey)
+                if not cascade:
+                    break
+                for cname, attr in self.referrers(pname):
+                    for child in self.children(parent, cname, attr):
+                        ckey = "{}.{}".format(cname, child.id)
+                        if ckey not in seen:
+                            seen.add(ckey)
+                            queue.append(child)
+        if stats.enabled:
+            stats.incr("storage.delete", len(removed))
+        return removed
+
+    def referrers(self, cls_name):
+        """Return the (class name, attribute) pairs referencing cls_name."""
+        return referrers(cls_name)
+
+    def set_attribute(self, obj, name, value):
+        """Set attribute name of obj to value, keeping storage current.
+
+        Called by BaseModel.__setattr__. The frozen record of obj is
+        dropped, and stored instances stay reachable from their new
+        parent, e.g. a City moved to another State by setting its
+        state_id. In thread-safe mode the attribute is set under the
+        write lock, so a snapshot never records a half-applied change.
+
+        Raises:
+            ValueError: If value is the check_in or check_out of a Booking
+            and not an ISO date, in which case obj is unchanged.
+        """
+        cname = obj.__class__.__name__
+        key = "{}.{}".format(cname, obj.__dict__.get("id"))
+        if cname == "Booking" and name in ("check_in", "check_out") and \
+                value:
+            to_date(value)
+        with FileStorage.__lock.write():
+            FileStorage.__records.pop(key, None)
+            stored = FileStorage.__objects.get(key) is obj
+            if stored:
+                if feed.active:
+                    FileStorage.__changed.setdefault(key, set()).add(name)
+                if name == "amenity_ids" and cname == "Place":
+                    FileStorage.__amenities.add(key, value)
+                elif name in FileStorage.__references.get(cname, ()):
+                    self.__remove_child(key, cname, name,
+                                        getattr(obj, name))
+                    self.__add_child(key, cname, name, value)
+            object.__setattr__(obj, name, value)
+            if stored and cname == "Booking" and \
+                    name in ("place_id", "check_in", "check_out"):
+                self.__index_booking(key, obj)
+
+    def children(self, parent, cls_name, attr):
+        """Return the stored cls_name instances whose attr is parent.id.
+
+        Args:
+            parent (BaseModel): The referenced instance.
+            cls_name (str): The class name of the referencing instances.
+            attr (str): The reference attribute, e.g. "state_id".
+        """
+        self.__load()
+        objl = []
+        with FileStorage.__lock.read():
+            kids = FileStorage.__children.get((cls_name, attr, parent.id), ())
+            for key in kids:
+                obj = FileStorage.__objects.get(key)
+                if obj is not None and getattr(obj, attr) == parent.id:
+                    objl.append(obj)
+        return objl
+
+    def __link(self, key, obj):
+        """Record the references and amenities of obj in the indexes."""
+        cname = obj.__class__.__name__
+        if cname == "Place":
+            FileStorage.__amenities.add(key, obj.amenity_ids)
+        elif cname == "Booking":
+            self.__index_booking(key, obj)
+        for attr in FileStorage.__references.get(cname, ()):
+            self.__add_child(key, cname, attr, getattr(obj, attr))
+
+    def __unlink(self, key, obj):
+        """Remove the references and amenities of obj from the indexes."""
+        cname = obj.__class__.__name__
+        if cname == "Place":
+            FileStorage.__amenities.remove(key)
+        elif cname == "Booking":
+            FileStorage.__bookings.remove(key)
+        for attr in FileStorage.__references.get(cname, ()):
+            self.__remove_child(key, cname, attr, getattr(obj, attr))
+
+    def __index_booking(self, key, booking):
+        """Record the stay of the Booking booking in the booking index.
+
+        Stays that are not ISO dates, only found in files written by
+        hand, are not indexed.
+        """
+        try:
+            FileStorage.__bookings.add(key, booking.place_id,
+                                       booking.check_in, booking.check_out)
+        except ValueError:
+            FileStorage.__bookings.remove(key)
+
+    def __add_child(self, key, cname, attr, value):
+        """Add key to the reverse lookup of (cname, attr, value)."""
+        kids = FileStorage.__children.setdefault((cname, attr, value), {})
+        kids[key] = None
+
+    def __remove_child(self, key, cname, attr, value):
+        """Remove key from the reverse lookup of (cname, attr, value)."""
+        kids = FileStorage.__children.get((cname, attr, value))
+        if kids is not None:
+            kids.pop(key, None)
+            if len(kids) == 0:
+                del FileStorage.__children[(cname, attr, value)]
+
+    def places_with_amenities(self, all_of=(), any_of=(), none_of=()):
+        """Return the stored Place instances matching an amenity query.
+
+        Args:
+            all_of (iterable): Amenity ids a place must all offer.
+            any_of (iterable): Amenity ids a place must offer one of,
+                ignored when empty.
+            none_of (iterable): Amenity ids a place must not offer.
+        """
+        self.__load()
+        objl = []
+        with FileStorage.__lock.read():
+            keys = FileStorage.__amenities.query(all_of, any_of, none_of)
+            for key in keys:
+                obj = FileStorage.__objects.get(key)
+                if obj is not None:
+                    objl.append(obj)
+        return objl
+
+    def bookings_overlapping(self, place_id, check_in, check_out):
+        """Return the stored Bookings of place_id overlapping a stay.
+
+        Args:
+            place_id (str): The id of the Place.
+            check_in (str): The first night of the stay, an ISO date.
+            check_out (str): The departure day of the stay, an ISO date.
+        Raises:
+            ValueError: If check_in or check_out is not an ISO date, or
+            check_out does not follow check_in.
+        """
+        check_in, check_out = parse_stay(check_in, check_out)
+        self.__load()
+        with FileStorage.__lock.read():
+            keys = FileStorage.__bookings.overlapping(place_id, check_in,
+                                                      check_out)
+            return [FileStorage.__objects[key] for key in sorted(keys)]
+
+    def is_available(self, place_id, check_in, check_out):
+        """Return True if no stored Booking of place_id overlaps a stay.
+
+        See bookings_overlapping. Answered in O(log n) of the bookings
+        of the place.
+        """
+        check_in, check_out = parse_stay(check_in, check_out)
+        self.__load()
+        with FileStorage.__lock.read():
+            return FileStorage.__bookings.is_free(place_id, check_in,
+                                                  check_out)
+
+    def available_places(self, city_id, check_in, check_out):
+        """Return the stored Places of city_id free for a whole stay.
+
+        See bookings_overlapping. Each place of the city is checked
+        against the interval tree of its bookings.
+        """
+        check_in, check_out = parse_stay(check_in, check_out)
+        self.__load()
+        objl = []
+        with FileStorage.__lock.read():
+            kids = FileStorage.__children.get(("Place", "city_id", city_id),
+                                              ())
+            for key in kids:
+                obj = FileStorage.__objects.get(key)
+                if obj is not None and FileStorage.__bookings.is_free(
+                        obj.id, check_in, check_out):
+                    objl.append(obj)
+        objl.sort(key=lambda obj: obj.id)
+        return objl
+
+    def freeze(self):
+        """Return a point-in-time snapshot of storage.
+
+        The snapshot maps every key to the to_dict() of its object. These
+        records are copied on write at object granularity: a record is
+        built once and shared by every later snapshot until its object
+        changes, so taking a snapshot only serializes the objects changed
+        since the last one. Records must not be modified.
+
+        Update events are emitted to the change feed for the attributes
+        set since the previous snapshot, with their recorded values.
+
+        A record is only reused while the attributes of its object equal
+        those it was built from, so attributes set through __dict__ or
+        modified in place are picked up too. Places are also re-indexed,
+        so that amenity_ids lists modified in place stay searchable.
+        """
+        self.__load()
+        return self.__freeze()[1]
+
+    def __freeze(self):
+        """Return the number of a new snapshot, its records and their JSON.
+
+        The JSON encoding of each record, as bytes, is frozen along with
+        it, so objects left unchanged are not serialized again.
+        """
+        records = FileStorage.__records
+        with FileStorage.__lock.write():
+            FileStorage.__saves += 1
+            seq = FileStorage.__saves
+            snap = {}
+            encoded = {}
+            for key, obj in FileStorage.__objects.items():
+                if (obj.__class__ is Place and
+                        FileStorage.__amenities.sync(key, obj.amenity_ids)):
+                    records.pop(key, None)
+                    if feed.active:
+                        FileStorage.__changed.setdefault(
+                            key, set()).add("amenity_ids")
+                frozen = records.get(key)
+                if frozen is None or frozen[0] != obj.__dict__:
+                    frozen = records[key] = self.__record(obj)
+                snap[key] = frozen[1]
+                encoded[key] = frozen[2]
+            if FileStorage.__changed:
+                self.__emit_changes(snap)
+        return seq, snap, encoded
+
+    def __emit_changes(self, records):
+        """Emit the update events of the attributes set since the last."""
+        changed = FileStorage.__changed
+        FileStorage.__changed = {}
+        if not feed.active:
+            return
+        for key, names in changed.items():
+            record = records.get(key)
+            if record is not None:
+                cname, _, oid = key.partition(".")
+                feed.emit("update", cname, oid,
+                          {name: record.get(name) for name in sorted(names)})
+
+    def __record(self, obj):
+        """Return the attributes, to_dict() and its JSON of obj, as frozen.
+
+        Neither shares anything mutable with obj, so the attributes
+        compare unequal to obj's once it is modified in place.
+        """
+        attrs = dict(obj.__dict__)
+        record = obj.to_dict()
+        for k, v in record.items():
+            if isinstance(v, (list, dict, set)):
+                record[k] = attrs[k] = copy.deepcopy(v)
+        return attrs, record, json.dumps(record).encode()
+
+    def __write(self, seq, encoded):
+        """Write the snapshot number seq to __file_path.
+
+        encoded maps the keys of the snapshot to the JSON of their
+        records, as bytes.
+
+        Snapshots older than the last one written are dropped. The
+        snapshot cache, now stale, is removed; the next reload() parsing
+        the file writes it again.
+
+        Returns:
+            The number of bytes written.
+        """
+        data, entries = record_index.dumps(encoded.items())
+        with FileStorage.__file_lock:
+            if seq < FileStorage.__written:
+                return 0
+            tmp = FileStorage.__file_path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, FileStorage.__file_path)
+            record_index.write_index(FileStorage.__file_path, entries)
+            FileStorage.__written = seq
+            try:
+                os.remove(snapshot.path_for(FileStorage.__file_path))
+            except OSError:
+                pass
+        return len(data)
 
     def save(self):
-        """Serialize __objects to the JSON file __file_path."""
-        odict = FileStorage.__objects
-        objdict = {obj: odict[obj].to_dict() for obj in odict.keys()}
-        with open(FileStorage.__file_path, "w") as f:
-            json.dump(objdict, f)
+        """Serialize __objects to the JSON file __file_path.
+
+        A snapshot is taken (see freeze) and written, the file being
+        replaced in one step. Storage is only locked while the snapshot
+        is taken. When saves overlap, an older snapshot never overwrites
+        a newer.
+        """
+        self.__load()
+        if stats.enabled:
+            start = perf_counter()
+        seq, _, encoded = self.__freeze()
+        written = self.__write(seq, encoded)
+        if stats.enabled:
+            stats.observe("storage.save", perf_counter() - start)
+            stats.incr("storage.bytes_written", written)
+
+    def save_async(self):
+        """Take a snapshot of storage and write it in the background.
+
+        Only taking the snapshot happens in the calling thread, so
+        mutations can go on while it is serialized. Snapshots are handed
+        to a single writer thread; one still waiting when a newer is
+        taken is replaced by it.
+
+        Returns:
+            A threading.Event set once the snapshot, or a newer one, has
+            been written. See flush() to wait for every write.
+        """
+        self.__load()
+        if stats.enabled:
+            start = perf_counter()
+        seq, _, encoded = self.__freeze()
+        done = threading.Event()
+        with FileStorage.__cond:
+            FileStorage.__pending = (seq, encoded)
+            FileStorage.__waiters.append(done)
+            if FileStorage.__writer is None:
+                FileStorage.__writer = threading.Thread(
+                    target=self.__write_pending, name="storage-writer",
+                    daemon=True)
+                FileStorage.__writer.start()
+                self.__flush_at_exit()
+            FileStorage.__cond.notify_all()
+        if stats.enabled:
+            stats.observe("storage.save_async", perf_counter() - start)
+        return done
+
+    def __write_pending(self):
+        """Write pending snapshots, forever. Run by the writer thread."""
+        cond = FileStorage.__cond
+        while True:
+            with cond:
+                while FileStorage.__pending is None:
+                    cond.wait()
+                seq, encoded = FileStorage.__pending
+                waiters = FileStorage.__waiters
+                FileStorage.__pending = None
+                FileStorage.__waiters = []
+                FileStorage.__writing = True
+            try:
+                written = self.__write(seq, encoded)
+                if stats.enabled:
+                    stats.incr("storage.bytes_written", written)
+            except Exception as e:
+                FileStorage.__error = e
+            with cond:
+                FileStorage.__writing = False
+                cond.notify_all()
+            for done in waiters:
+                done.set()
+
+    def __flush_at_exit(self):
+        """Have flush() run when the interpreter exits, once."""
+        if not FileStorage.__at_exit:
+            FileStorage.__at_exit = True
+            atexit.register(self.flush)
+
+    def flush(self):
+        """Wait until the snapshots of save_async() are written.
+
+        The snapshot caches reload() writes in the background are waited
+        for too.
+
+        Raises:
+            The last error met by the writer since the previous flush(),
+            if any, e.g. an OSError.
+        """
+        with FileStorage.__cond:
+            cachers = list(FileStorage.__cachers)
+        for thread in cachers:
+            thread.join()
+        with FileStorage.__cond:
+            while FileStorage.__pending is not None or FileStorage.__writing:
+                FileStorage.__cond.wait()
+            error = FileStorage.__error
+            FileStorage.__error = None
+        if error is not None:
+            raise error
+
+    def update_many(self, cls_name, updates):
+        """Apply several attribute updates to instances of cls_name at once.
+
+        Values are coerced through the class schema, the updated_at of
+        each updated instance is refreshed, and storage is saved a single
+        time once every update has been applied.
+
+        Args:
+            cls_name (str): The class name of the instances to update.
+            updates (dict): Maps instance ids to dicts of name/value pairs.
+        Returns:
+            The list of ids that were not found.
+        Raises:
+            ValueError: If a value cannot be converted, or an instance
+            refuses its values (see schema.validate), in which case no
+            instance is modified.
+        """
+        self.__load()
+        missing = []
+        pending = []
+        with FileStorage.__lock.write():
+            for oid, attrs in updates.items():
+                obj = FileStorage.__objects.get(
+                    "{}.{}".format(cls_name, oid))
+                if obj is None:
+                    missing.append(oid)
+                else:
+                    cls = obj.__class__
+                    values = {k: schema.coerce(cls, k, v)
+                              for k, v in attrs.items()}
+                    schema.validate(obj, values)
+                    pending.append((obj, values))
+            now = datetime.today()
+            for obj, values in pending:
+                for k, v in values.items():
+                    setattr(obj, k, v)
+                obj.updated_at = now
+        self.save()
+        return missing
+
+    def __load(self):
+        """Reload __file_path unless it has already been loaded.
+
+        Instances already read through the index by get() are kept.
+        """
+        if not FileStorage.__loaded:
+            with FileStorage.__lock.write():
+                if not FileStorage.__loaded:
+                    kept = list(FileStorage.__objects.values())
+                    self.reload()
+                    for obj in kept:
+                        self.__store(obj)
 
     def reload(self):
-        """Deserialize the JSON file __file_path to __objects, if it exists"""
+        """Deserialize the JSON file __file_path to __objects, if it exists
+
+        When the snapshot cache matches the file, objects are restored
+        from it in bulk instead of being parsed and re-initialized.
+        Otherwise the cache is written for the next reload() by a
+        background thread, so it does not delay loading (see __cache).
+        """
+        if stats.enabled:
+            start = perf_counter()
+        with FileStorage.__lock.write():
+            FileStorage.__loaded = True
+            if FileStorage.__index is not None:
+                FileStorage.__index.close()
+                FileStorage.__index = None
+            try:
+                with open(FileStorage.__file_path, "rb") as f:
+                    st = os.fstat(f.fileno())
+                    data = f.read()
+            except FileNotFoundError:
+                return
+            objl = snapshot.read(FileStorage.__file_path, st, data)
+            if objl is None:
+                objl = self.__parse(data)
+                with FileStorage.__cond:
+                    thread = threading.Thread(
+                        target=self.__cache, args=(st, data),
+                        name="storage-cache", daemon=True)
+                    thread.start()
+                    FileStorage.__cachers.append(thread)
+                self.__flush_at_exit()
+                if stats.enabled:
+                    stats.incr("storage.snapshot_miss")
+            elif stats.enabled:
+                stats.incr("storage.snapshot_hit")
+            for obj in objl:
+                self.__store(obj)
+        if stats.enabled:
+            stats.observe("storage.reload", perf_counter() - start)
+            stats.incr("storage.bytes_read", len(data))
+
+    def __parse(self, data):
+        """Return the instances of the storage file content data."""
+        objl = []
+        for o in json.loads(data).values():
+            cls_name = o["__class__"]
+            del o["__class__"]
+            objl.append(eval(cls_name)(**o))
+        return objl
+
+    def __cache(self, st, data):
+        """Write the snapshot cache of data, read with status st.
+
+        Run by a thread started by reload(). The instances are parsed
+        again, as those stored may be modified meanwhile, and written
+        under the file lock, only while __file_path is unchanged, so the
+        cache only ever holds what the file holds.
+        """
         try:
-            with open(FileStorage.__file_path) as f:
-                objdict = json.load(f)
-                for o in objdict.values():
-                    cls_name = o["__class__"]
-                    del o["__class__"]
-                    self.new(eval(cls_name)(**o))
-        except FileNotFoundError:
-            return
+            objl = self.__parse(data)
+            with FileStorage.__file_lock:
+                now = os.stat(FileStorage.__file_path)
+                if (now.st_size, now.st_mtime_ns) == \
+                        (st.st_size, st.st_mtime_ns):
+                    snapshot.write(FileStorage.__file_path, data, objl)
+        except (OSError, ValueError):
+            pass
+        finally:
+            with FileStorage.__cond:
+                FileStorage.__cachers.remove(threading.current_thread())
+
+    def memory_report(self, cls_name=None, sample=1000):
+        """Return an estimate of the memory used by stored objects.
+
+        Args:
+            cls_name (str): Only report instances of this class.
+            sample (int): The maximum number of instances measured per
+                class; larger classes are extrapolated from a sample.
+        Returns:
+            A dict with a report per class (see memory.class_report),
+            the bytes used by storage's own structures when cls_name is
+            None, and the total bytes.
+        """
+        self.__load()
+        groups = {}
+        for key, obj in self.all().items():
+            cname = key.partition(".")[0]
+            if cls_name is None or cname == cls_name:
+                groups.setdefault(cname, []).append(obj)
+        report = {"classes": {cname: class_report(objl, sample)
+                              for cname, objl in sorted(groups.items())}}
+        total = sum(c["bytes"] for c in report["classes"].values())
+        if cls_name is None:
+            with FileStorage.__lock.read():
+                odict = FileStorage.__objects
+                report["storage"] = {
+                    "objects": (sys.getsizeof(odict) +
+                                sum(sys.getsizeof(k) for k in odict)),
+                    "references": deep_sizeof(FileStorage.__children),
+                    "amenities": deep_sizeof(FileStorage.__amenities),
+                    "bookings": deep_sizeof(FileStorage.__bookings)
+                }
+            total += sum(report["storage"].values())
+        report["total_bytes"] = total
+        return report
+
+    def stats_report(self):
+        """Return the instrumentation report of storage as a dict.
+
+        Besides the counters and latencies recorded while stats were
+        enabled, the report holds the current number of objects per
+        class and the size of the storage file.
+        """
+        self.__load()
+        report = stats.to_dict()
+        per_class = {}
+        for key in self.all():
+            cls_name = key.partition(".")[0]
+            per_class[cls_name] = per_class.get(cls_name, 0) + 1
+        report["objects"] = dict(sorted(per_class.items()))
+        try:
+            report["file_bytes"] = os.path.getsize(FileStorage.__file_path)
+        except OSError:
+            report["file_bytes"] = None
+        return report
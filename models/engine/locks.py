@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""Defines the RWLock and NullLock classes guarding storage."""
+
+import threading
+
+
+class RWLock:
+    """Represent a reader/writer lock preferring writers.
+
+    Many threads may hold the lock for reading at once; a writer holds it
+    alone. The write side is reentrant, and the writing thread may also
+    take the read side. Read sides are reentrant as well, but a reader
+    must not ask for the write side.
+    """
+
+    def __init__(self):
+        """Initialize an unlocked RWLock."""
+        self.__cond = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writer = None
+        self.__writes = 0
+        self.__waiting = 0
+        self.__local = threading.local()
+
+    def acquire_read(self):
+        """Block until the lock is held for reading."""
+        me = threading.get_ident()
+        depth = getattr(self.__local, "depth", 0)
+        with self.__cond:
+            if depth == 0 and self.__writer != me:
+                while self.__writer is not None or self.__waiting:
+                    self.__cond.wait()
+            self.__readers += 1
+        self.__local.depth = depth + 1
+
+    def release_read(self):
+        """Release one hold of the read side."""
+        self.__local.depth -= 1
+        with self.__cond:
+            self.__readers -= 1
+            if self.__readers == 0:
+                self.__cond.notify_all()
+
+    def acquire_write(self):
+        """Block until the lock is held for writing."""
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__writer == me:
+                self.__writes += 1
+                return
+            if getattr(self.__local, "depth", 0):
+                raise RuntimeError("cannot upgrade a read lock to write")
+            self.__waiting += 1
+            while self.__writer is not None or self.__readers:
+                self.__cond.wait()
+            self.__waiting -= 1
+            self.__writer = me
+            self.__writes = 1
+
+    def release_write(self):
+        """Release one hold of the write side."""
+        with self.__cond:
+            self.__writes -= 1
+            if self.__writes == 0:
+                self.__writer = None
+                self.__cond.notify_all()
+
+    def read(self):
+        """Return a context manager holding the read side."""
+        return _Held(self.acquire_read, self.release_read)
+
+    def write(self):
+        """Return a context manager holding the write side."""
+        return _Held(self.acquire_write, self.release_write)
+
+
+class _Held:
+    """Represent a context manager calling acquire then release."""
+
+    __slots__ = ("acquire", "release")
+
+    def __init__(self, acquire, release):
+        """Initialize a context manager for the acquire/release pair."""
+        self.acquire = acquire
+        self.release = release
+
+    def __enter__(self):
+        """Acquire the lock."""
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        """Release the lock."""
+        self.release()
+        return False
+
+
+class NullLock:
+    """Represent a lock that does nothing, used when threads are not."""
+
+    def __enter__(self):
+        """Do nothing."""
+        return self
+
+    def __exit__(self, *exc):
+        """Do nothing."""
+        return False
+
+    def read(self):
+        """Return the lock itself, as a no-op context manager."""
+        return self
+
+    def write(self):
+        """Return the lock itself, as a no-op context manager."""
+        return self
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""Defines the memory accounting helpers used by storage.
+
+Sizes are estimated with sys.getsizeof, following containers and
+instance dicts and counting every object once. When a class holds more
+instances than the sample size, a random sample is measured and the
+totals are extrapolated, so a report on a huge store stays cheap.
+"""
+
+import random
+import sys
+
+
+def deep_sizeof(obj, seen=None):
+    """Return the estimated size in bytes of obj and what it refers to.
+
+    Args:
+        obj (any): The object to measure.
+        seen (set): Ids of the objects already counted, updated in place.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, "__dict__") and not isinstance(o, type):
+            stack.append(o.__dict__)
+        elif hasattr(type(o), "__slots__"):
+            stack.extend(getattr(o, name, None)
+                         for name in type(o).__slots__)
+    return size
+
+
+def class_report(objects, sample=1000, rng=None):
+    """Return the memory report of a list of instances of one class.
+
+    Args:
+        objects (list): The instances to account for.
+        sample (int): The maximum number of instances measured.
+        rng (random.Random): The source of randomness used to sample.
+    Returns:
+        A dict with the instance count, the number measured, the
+        estimated total and per-instance bytes, and the estimated total
+        bytes of each attribute name (key and value).
+    """
+    count = len(objects)
+    if count > sample:
+        measured = (rng or random).sample(objects, sample)
+    else:
+        measured = objects
+    total = 0
+    attributes = {}
+    for obj in measured:
+        # Interned strings and small ints are shared between instances;
+        # each instance is measured on its own to charge it for them.
+        total += deep_sizeof(obj)
+        for name, value in obj.__dict__.items():
+            size = sys.getsizeof(name) + deep_sizeof(value)
+            attributes[name] = attributes.get(name, 0) + size
+    scale = count / len(measured) if measured else 0
+    return {
+        "count": count,
+        "sampled": len(measured),
+        "bytes": int(total * scale),
+        "bytes_per_object": int(total / len(measured)) if measured else 0,
+        "attributes": {name: int(size * scale)
+                       for name, size in sorted(attributes.items())}
+    }
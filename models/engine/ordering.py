@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""Defines top-k selection of instances ordered by an attribute.
+
+An ordering names an attribute, prefixed with "-" for descending order,
+e.g. "price_by_night" or "-updated_at". Instances are ordered by that
+attribute, then by id, and instances without it come last. With a limit
+k, the k first instances are found with a heap of k instances, in
+O(n log k), instead of sorting them all.
+"""
+
+import heapq
+
+
+class _Reversed:
+    """Represent a value compared in reverse order."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        """Initialize the reversed value."""
+        self.value = value
+
+    def __eq__(self, other):
+        """Return True if both values are equal."""
+        return self.value == other.value
+
+    def __lt__(self, other):
+        """Return True if the value is greater than other's."""
+        return other.value < self.value
+
+
+def parse(order_by):
+    """Return the (attribute name, descending) pair of order_by."""
+    if order_by.startswith("-"):
+        return order_by[1:], True
+    return order_by, False
+
+
+def sort_key(order_by):
+    """Return the key function of the ordering order_by."""
+    name, descending = parse(order_by)
+
+    def key(obj):
+        value = getattr(obj, name, None)
+        if value is None:
+            return (1, 0, obj.id)
+        return (0, _Reversed(value) if descending else value, obj.id)
+    return key
+
+
+def top_k(objects, order_by="id", limit=None):
+    """Return the limit first of objects in the ordering order_by.
+
+    Args:
+        objects (iterable): The instances, consumed once.
+        order_by (str): The ordering, see the module documentation.
+        limit (int): The number of instances returned, or None for all.
+    Raises:
+        ValueError: If the values of the attribute cannot be compared.
+    """
+    key = sort_key(order_by)
+    try:
+        if limit is None:
+            return sorted(objects, key=key)
+        return heapq.nsmallest(limit, objects, key=key)
+    except TypeError:
+        raise ValueError("cannot order by {}".format(parse(order_by)[0]))
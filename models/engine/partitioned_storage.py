@@ -0,0 +1,271 @@
+#!/usr/bin/python3
+"""Defines the HashRing and PartitionedStorage classes.
+
+PartitionedStorage spreads instances over several storage servers (see
+storage_server), each holding the keys that a consistent hash ring
+assigns to it. Requests about one key go to its node; all, count and
+queries go to every node and their results are merged. Set
+HBNB_STORAGE_NODES to a comma separated list of server sockets to make
+models.storage a PartitionedStorage.
+"""
+
+import bisect
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from models import schema
+from models.engine import wire
+from models.engine.client_storage import ClientStorage
+from models.engine.file_storage import referrers
+
+
+class HashRing:
+    """Represent a consistent hash ring of node names.
+
+    Each node is placed at replicas points of the ring; a key belongs to
+    the node of the first point following its hash. Adding a node only
+    moves the keys falling just before its points.
+
+    Attributes:
+        replicas (int): The number of points per node.
+    """
+
+    def __init__(self, nodes=(), replicas=64):
+        """Initialize a HashRing of nodes."""
+        self.replicas = replicas
+        self.__points = []
+        self.__owners = []
+        for node in nodes:
+            self.add(node)
+
+    def __hash(self, text):
+        """Return the position of text on the ring."""
+        return int(hashlib.md5(text.encode()).hexdigest()[:16], 16)
+
+    def add(self, node):
+        """Place node on the ring."""
+        for i in range(self.replicas):
+            point = self.__hash("{}#{}".format(node, i))
+            pos = bisect.bisect(self.__points, point)
+            self.__points.insert(pos, point)
+            self.__owners.insert(pos, node)
+
+    def nodes(self):
+        """Return the set of the nodes on the ring."""
+        return set(self.__owners)
+
+    def node_for(self, key):
+        """Return the node owning key."""
+        if not self.__points:
+            raise ValueError("the ring has no node")
+        pos = bisect.bisect(self.__points, self.__hash(key))
+        return self.__owners[pos % len(self.__owners)]
+
+
+class PartitionedStorage:
+    """Represent a storage engine partitioned over storage servers.
+
+    Each node is reached through a ClientStorage, so instances are
+    tracked and sent to their node as with a single server.
+
+    Attributes:
+        ring (HashRing): Maps keys to the socket paths of the nodes.
+    """
+
+    def __init__(self, paths, replicas=64):
+        """Initialize a PartitionedStorage of the servers at paths."""
+        self.ring = HashRing(paths, replicas)
+        self.__nodes = {path: ClientStorage(path) for path in paths}
+        self.__previous = None
+
+    def __node(self, key):
+        """Return the client of the node owning key."""
+        return self.__nodes[self.ring.node_for(key)]
+
+    def __fan_out(self, func):
+        """Return the list of func(client), called for every node at once."""
+        clients = list(self.__nodes.values())
+        with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+            return list(pool.map(func, clients))
+
+    def close(self):
+        """Close the connections to every node."""
+        for client in self.__nodes.values():
+            client.close()
+
+    def all(self):
+        """Return a dictionary of the instances of every node, by key."""
+        objects = {}
+        for part in self.__fan_out(lambda client: client.all()):
+            objects.update(part)
+        return objects
+
+    def count(self, cls_name=None):
+        """Return the number of instances, or of cls_name, on all nodes."""
+        return sum(self.__fan_out(lambda client: client.count(cls_name)))
+
+    def get(self, cls_name, oid):
+        """Return the instance of cls_name with id oid, or None.
+
+        While a node is being added, a key not found on its new node is
+        looked for on the node it is moving from.
+        """
+        key = "{}.{}".format(cls_name, oid)
+        obj = self.__node(key).get(cls_name, oid)
+        previous = self.__previous
+        if obj is None and previous is not None:
+            old = self.__nodes[previous.node_for(key)]
+            if old is not self.__node(key):
+                obj = old.get(cls_name, oid)
+        return obj
+
+    def new(self, obj):
+        """Add obj to the storage of its node."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        self.__node(key).new(obj)
+
+    def set_attribute(self, obj, name, value):
+        """Set attribute name of obj to value, through its node."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.__dict__.get("id"))
+        self.__node(key).set_attribute(obj, name, value)
+
+    def delete(self, obj, cascade=False):
+        """Remove obj, and what references it if cascade, from its node.
+
+        Referencing instances may live on any node, so the cascade is
+        followed here rather than by each node.
+
+        Returns:
+            The list of keys removed, obj's key first.
+        """
+        removed = []
+        queue = [obj]
+        seen = {"{}.{}".format(obj.__class__.__name__, obj.id)}
+        for parent in queue:
+            pname = parent.__class__.__name__
+            pkey = "{}.{}".format(pname, parent.id)
+            removed.extend(self.__node(pkey).delete(parent))
+            if not cascade or not removed:
+                break
+            for cname, attr in referrers(pname):
+                for child in self.children(parent, cname, attr):
+                    ckey = "{}.{}".format(cname, child.id)
+                    if ckey not in seen:
+                        seen.add(ckey)
+                        queue.append(child)
+        return removed
+
+    def children(self, parent, cls_name, attr):
+        """Return the cls_name instances whose attr is parent.id."""
+        return [obj for part in self.__fan_out(
+            lambda client: client.children(parent, cls_name, attr))
+            for obj in part]
+
+    def places_with_amenities(self, all_of=(), any_of=(), none_of=()):
+        """Return the Place instances matching an amenity query."""
+        return [obj for part in self.__fan_out(
+            lambda client: client.places_with_amenities(
+                all_of, any_of, none_of))
+            for obj in part]
+
+    def save(self):
+        """Send the dirty instances and have every node write its file."""
+        self.__fan_out(lambda client: client.save())
+
+    def update_many(self, cls_name, updates):
+        """Apply several attribute updates to instances of cls_name at once.
+
+        Values are checked before any node is updated, then updates are
+        grouped by node, see FileStorage.update_many.
+
+        Returns:
+            The list of ids that were not found.
+        Raises:
+            ValueError: If a value cannot be converted, in which case
+            no instance is modified.
+        """
+        cls = wire.CLASSES.get(cls_name)
+        groups = {}
+        for oid, attrs in updates.items():
+            if cls is not None:
+                for name, value in attrs.items():
+                    schema.coerce(cls, name, value)
+            node = self.ring.node_for("{}.{}".format(cls_name, oid))
+            groups.setdefault(node, {})[oid] = attrs
+        missing = []
+        for node, group in groups.items():
+            missing.extend(self.__nodes[node].update_many(cls_name, group))
+        return missing
+
+    def reload(self):
+        """Forget local changes and have every node reload its file."""
+        self.__fan_out(lambda client: client.reload())
+
+    def memory_report(self, cls_name=None, sample=1000):
+        """Return the memory report of every node, by socket path."""
+        paths = list(self.__nodes)
+        reports = self.__fan_out(
+            lambda client: client.memory_report(cls_name, sample))
+        return {"nodes": dict(zip(paths, reports)),
+                "total_bytes": sum(r["total_bytes"] for r in reports)}
+
+    def stats_report(self):
+        """Return the instrumentation report of every node, by socket path.
+
+        The numbers of objects per class and the file sizes of the nodes
+        are also summed up.
+        """
+        paths = list(self.__nodes)
+        reports = self.__fan_out(lambda client: client.stats_report())
+        per_class = {}
+        for part in reports:
+            for cls_name, n in part["objects"].items():
+                per_class[cls_name] = per_class.get(cls_name, 0) + n
+        return {"nodes": dict(zip(paths, reports)),
+                "objects": dict(sorted(per_class.items())),
+                "file_bytes": sum(part["file_bytes"] or 0
+                                  for part in reports)}
+
+    def add_node(self, path, batch_size=500):
+        """Add the server at path and move the keys it now owns to it.
+
+        Only the keys whose owner changed are moved, batch_size at a
+        time: fetched from their old node, stored on the new one, then
+        deleted from the old one. Their tracked instances are handed
+        over to the client of the new node, so later changes reach it.
+        Meanwhile get() falls back to the old node of a key.
+
+        Returns:
+            The number of keys moved.
+        """
+        self.save()
+        previous = HashRing(self.ring.nodes(), self.ring.replicas)
+        sources = list(self.__nodes.items())
+        self.__nodes[path] = ClientStorage(path)
+        self.__previous = previous
+        self.ring.add(path)
+        target = self.__nodes[path]
+        moved = 0
+        try:
+            for name, source in sources:
+                keys = [key for key in source.keys()
+                        if self.ring.node_for(key) == path]
+                for i in range(0, len(keys), batch_size):
+                    batch = [key.partition(".") for key in
+                             keys[i:i + batch_size]]
+                    records = source.pipeline([
+                        {"op": "get", "cls": cname, "id": oid}
+                        for cname, _, oid in batch])
+                    target.pipeline([{"op": "put", "records": [
+                        record for record in records if record is not None]}])
+                    for key in keys[i:i + batch_size]:
+                        obj, dirty = source.release(key)
+                        if obj is not None:
+                            target.adopt(obj, dirty)
+                    source.pipeline([
+                        {"op": "delete", "cls": cname, "id": oid}
+                        for cname, _, oid in batch])
+                    moved += len(batch)
+            self.save()
+        finally:
+            self.__previous = None
+        return moved
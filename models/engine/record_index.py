@@ -0,0 +1,267 @@
+#!/usr/bin/python3
+"""Defines the sidecar index of storage files and the RecordIndex class.
+
+A storage file is a JSON object mapping keys to records. Its index,
+stored next to it, lists every key with the byte offset and length of
+its record in the file, sorted by key:
+
+    header   magic, size and mtime_ns of the storage file, key count
+    entries  count fixed size entries (key position and length in the
+             key area, record offset and length), sorted by key
+    keys     the UTF-8 keys
+
+The index is memory-mapped, so finding a record is a binary search that
+only touches a few pages, and counting the keys of a class is two. An
+index only describes the storage file while its size and modification
+time are unchanged.
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+
+MAGIC = b"HBIX1\n"
+HEADER = struct.Struct("!QqQ")
+ENTRY = struct.Struct("!QIQI")
+_SPACE = re.compile(r"\s*")
+
+
+def path_for(file_path):
+    """Return the index path of the storage file file_path."""
+    return file_path + ".idx"
+
+
+def dumps(items):
+    """Return the JSON bytes of a storage file, and their entries.
+
+    Args:
+        items (iterable): (key, record) pairs, records being the JSON
+            encoding of their dict, as bytes; see write.
+    Returns:
+        The bytes of the file and the (key, offset, length) of each
+        record in them, see write_index.
+    """
+    parts = []
+    entries = []
+    pos = 1
+    for key, data in items:
+        head = json.dumps(key).encode() + b": "
+        if parts:
+            head = b", " + head
+        parts.extend((head, data))
+        pos += len(head)
+        entries.append((key, pos, len(data)))
+        pos += len(data)
+    return b"{" + b"".join(parts) + b"}", entries
+
+
+def write(file_path, items):
+    """Write the storage file file_path and its index.
+
+    Args:
+        file_path (str): The storage file to replace.
+        items (iterable): (key, record) pairs, records being the JSON
+            encoding of their dict, as bytes. The file is the same as
+            json.dumps() of the dict of the decoded records.
+    Returns:
+        The number of bytes of the storage file.
+    """
+    entries = []
+    tmp = file_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"{")
+        pos = 1
+        for key, record in items:
+            head = json.dumps(key).encode() + b": "
+            if entries:
+                head = b", " + head
+            f.write(head)
+            f.write(record)
+            pos += len(head)
+            entries.append((key, pos, len(record)))
+            pos += len(record)
+        f.write(b"}")
+    os.replace(tmp, file_path)
+    write_index(file_path, entries)
+    return pos + 1
+
+
+def write_index(file_path, entries):
+    """Write the index of file_path from (key, offset, length) entries."""
+    entries = sorted(entries)
+    keys = [key.encode() for key, offset, length in entries]
+    st = os.stat(file_path)
+    table = []
+    pos = 0
+    for key, (_, offset, length) in zip(keys, entries):
+        table.append(ENTRY.pack(pos, len(key), offset, length))
+        pos += len(key)
+    tmp = path_for(file_path) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(HEADER.pack(st.st_size, st.st_mtime_ns, len(entries)))
+        f.write(b"".join(table))
+        f.write(b"".join(keys))
+    os.replace(tmp, path_for(file_path))
+
+
+def scan(data):
+    """Return the (key, offset, length) entries of a storage file.
+
+    Records are parsed one at a time to find where they end, which reads
+    the whole of data: it is only needed for files without an index.
+
+    Raises:
+        ValueError: If data is not a JSON object.
+    """
+    text = data.decode("latin-1")
+    decoder = json.JSONDecoder()
+    pos = _SPACE.match(text, 0).end()
+    if text[pos:pos + 1] != "{":
+        raise ValueError("storage file is not a JSON object")
+    pos = _SPACE.match(text, pos + 1).end()
+    entries = []
+    while text[pos:pos + 1] != "}":
+        if entries:
+            if text[pos:pos + 1] != ",":
+                raise ValueError("expected , at {}".format(pos))
+            pos = _SPACE.match(text, pos + 1).end()
+        key, pos = decoder.raw_decode(text, pos)
+        pos = _SPACE.match(text, pos).end()
+        if text[pos:pos + 1] != ":":
+            raise ValueError("expected : at {}".format(pos))
+        start = _SPACE.match(text, pos + 1).end()
+        _, pos = decoder.raw_decode(text, start)
+        entries.append((key, start, pos - start))
+        pos = _SPACE.match(text, pos).end()
+    return entries
+
+
+class RecordIndex:
+    """Represent the memory-mapped index of a storage file.
+
+    Attributes:
+        file_path (str): The storage file indexed.
+    """
+
+    def __init__(self, file_path):
+        """Open the index of file_path, building it if needed.
+
+        Raises:
+            OSError: If file_path cannot be read.
+            ValueError: If file_path is not a storage file.
+        """
+        self.file_path = file_path
+        self.__map = None
+        self.__data = None
+        self.__count = 0
+        st = os.stat(file_path)
+        if not self.__open(st):
+            with open(file_path, "rb") as f:
+                write_index(file_path, scan(f.read()))
+            if not self.__open(os.stat(file_path)):
+                raise ValueError("cannot index {}".format(file_path))
+        if st.st_size:
+            with open(file_path, "rb") as f:
+                self.__data = mmap.mmap(f.fileno(), 0,
+                                        access=mmap.ACCESS_READ)
+
+    def __open(self, st):
+        """Map the index if it matches the status st of the file."""
+        try:
+            f = open(path_for(self.file_path), "rb")
+        except FileNotFoundError:
+            return False
+        with f:
+            head = f.read(len(MAGIC) + HEADER.size)
+            if len(head) < len(MAGIC) + HEADER.size or \
+                    not head.startswith(MAGIC):
+                return False
+            size, mtime_ns, count = HEADER.unpack(head[len(MAGIC):])
+            if size != st.st_size or mtime_ns != st.st_mtime_ns:
+                return False
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__count = count
+        self.__keys_at = len(head) + count * ENTRY.size
+        return True
+
+    def close(self):
+        """Unmap the index and the storage file."""
+        for m in (self.__map, self.__data):
+            if m is not None:
+                m.close()
+        self.__map = self.__data = None
+
+    def __len__(self):
+        """Return the number of keys indexed."""
+        return self.__count
+
+    def __entry(self, i):
+        """Return the (key, offset, length) entry i, key as bytes."""
+        at = len(MAGIC) + HEADER.size + i * ENTRY.size
+        kpos, klen, offset, length = ENTRY.unpack_from(self.__map, at)
+        kpos += self.__keys_at
+        return self.__map[kpos:kpos + klen], offset, length
+
+    def __bisect(self, key):
+        """Return the position of the first key not below key (bytes)."""
+        lo, hi = 0, self.__count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__entry(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup(self, key):
+        """Return the (offset, length) of the record of key, or None."""
+        i = self.__bisect(key.encode())
+        if i < self.__count:
+            found, offset, length = self.__entry(i)
+            if found == key.encode():
+                return offset, length
+        return None
+
+    def record(self, key):
+        """Return the JSON bytes of the record of key, or None."""
+        found = self.lookup(key)
+        if found is None:
+            return None
+        offset, length = found
+        return self.__data[offset:offset + length]
+
+    def count(self, prefix=""):
+        """Return the number of keys starting with prefix."""
+        if not prefix:
+            return self.__count
+        start = prefix.encode()
+        return self.__bisect(start + b"\xff") - self.__bisect(start)
+
+    def keys(self, prefix="", after=None):
+        """Yield the keys starting with prefix, in order.
+
+        With after, only the keys following it are yielded.
+        """
+        for key, offset, length in self.entries(prefix, after):
+            yield key
+
+    def entries(self, prefix="", after=None):
+        """Yield the (key, offset, length) entries of keys with prefix.
+
+        With after, only the entries of keys following it are yielded.
+        """
+        start = prefix.encode()
+        i = self.__bisect(start) if prefix else 0
+        if after is not None:
+            i = max(i, self.__bisect(after.encode() + b"\x00"))
+        end = self.__bisect(start + b"\xff") if prefix else self.__count
+        for j in range(i, end):
+            key, offset, length = self.__entry(j)
+            yield key.decode(), offset, length
+
+    def raw(self, offset, length):
+        """Return length bytes of the storage file, from offset."""
+        return self.__data[offset:offset + length]
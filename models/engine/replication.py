@@ -0,0 +1,393 @@
+#!/usr/bin/python3
+"""Defines the Primary and Follower classes, replicating storage.
+
+A Primary ships the change feed of its storage (see changes) to a shared
+directory holding:
+
+    snapshot.json   {"seq": n, "objects": {key: record}}, the state of
+                    storage once events up to n were emitted
+    changes.jsonl   the events emitted since, one JSON line each
+
+A Follower, usually in another process, restores the snapshot and then
+tails the log, applying events to its own in-memory objects, which it
+serves read-only. Set HBNB_REPLICA_DIR to such a directory to make
+models.storage a Follower of it.
+
+Events may be applied on top of a snapshot already holding their
+changes: applying them again leaves the same state.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from models.engine import wire
+from models.engine.changes import ChangeFeed, feed
+from models.engine.memory import class_report
+from models.engine.stats import stats
+
+SNAPSHOT = "snapshot.json"
+LOG = "changes.jsonl"
+_TFORM = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def _write(path, data):
+    """Replace the file path by data, in one step."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class Primary:
+    """Represent the shipping of storage changes to a directory.
+
+    Attributes:
+        directory (str): The directory shared with followers.
+        storage (FileStorage): The storage replicated.
+    """
+
+    def __init__(self, directory, storage=None):
+        """Initialize a Primary of storage, by default models.storage."""
+        if storage is None:
+            import models
+            storage = models.storage
+        self.directory = directory
+        self.storage = storage
+        self.__lock = threading.RLock()
+        self.__log = None
+        self.__token = None
+
+    def start(self):
+        """Write a first snapshot and start shipping events."""
+        os.makedirs(self.directory, exist_ok=True)
+        with self.__lock:
+            self.__token = feed.subscribe(self.__ship)
+            self.checkpoint()
+
+    def stop(self):
+        """Stop shipping events."""
+        with self.__lock:
+            if self.__token is not None:
+                feed.unsubscribe(self.__token)
+                self.__token = None
+            if self.__log is not None:
+                self.__log.close()
+                self.__log = None
+
+    def checkpoint(self):
+        """Write a snapshot and drop the events it holds from the log.
+
+        Returns:
+            The sequence number of the snapshot.
+        """
+        with self.__lock:
+            seq = feed.seq
+            records = self.storage.freeze()
+            _write(os.path.join(self.directory, SNAPSHOT),
+                   json.dumps({"seq": seq, "objects": records}))
+            path = os.path.join(self.directory, LOG)
+            if self.__log is not None:
+                self.__log.close()
+            kept = [line for line in self.__lines(path)
+                    if json.loads(line)["seq"] > seq]
+            _write(path, "".join(kept))
+            self.__log = open(path, "a")
+            return seq
+
+    def __lines(self, path):
+        """Yield the complete lines of the log path."""
+        try:
+            f = open(path)
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                if line.endswith("\n"):
+                    yield line
+
+    def __ship(self, event):
+        """Append event to the log."""
+        with self.__lock:
+            if self.__log is not None:
+                self.__log.write(json.dumps(event) + "\n")
+                self.__log.flush()
+
+
+class Follower:
+    """Represent a read-only replica of the storage of a Primary.
+
+    It offers the read methods of FileStorage: all, get, count, children,
+    places_with_amenities, memory_report and stats_report. Methods
+    modifying storage raise RuntimeError.
+    Unless polling runs in a thread (see start), reads poll first when
+    the last poll is older than interval.
+
+    Attributes:
+        directory (str): The directory shared with the primary.
+        interval (float): Seconds between two polls.
+    """
+
+    def __init__(self, directory, interval=0.5):
+        """Initialize a Follower of directory, that applied nothing yet."""
+        self.directory = directory
+        self.interval = interval
+        self.__lock = threading.RLock()
+        self.__objects = None
+        self.__seq = 0
+        self.__log = None
+        self.__inode = None
+        self.__pending = []
+        self.__last_poll = None
+        self.__thread = None
+        self.__stop = threading.Event()
+
+    def poll(self):
+        """Apply the events logged since the last poll.
+
+        The snapshot is restored first if nothing was applied yet, or if
+        the log no longer holds the events following the last applied.
+        Events are left for a later poll while the snapshot they follow
+        is not there yet.
+
+        Returns:
+            The number of events applied.
+        """
+        with self.__lock:
+            if self.__objects is None:
+                self.__restore()
+            events = self.__read()
+            if events and events[0]["seq"] > self.__seq + 1:
+                self.__restore()
+                events = [e for e in self.__read() if e["seq"] > self.__seq]
+                if events and events[0]["seq"] > self.__seq + 1:
+                    self.__close()
+                    events = []
+            applied = 0
+            for event in events:
+                if event["seq"] > self.__seq:
+                    self.__apply(event)
+                    self.__seq = event["seq"]
+                    applied += 1
+            self.__last_poll = time.time()
+            return applied
+
+    def __restore(self):
+        """Replace the objects by those of the snapshot.
+
+        Until the primary writes one, the replica is empty at seq 0, and
+        the snapshot is looked for again by the next poll finding events
+        missing.
+        """
+        try:
+            with open(os.path.join(self.directory, SNAPSHOT)) as f:
+                snap = json.load(f)
+        except FileNotFoundError:
+            snap = {"seq": 0, "objects": {}}
+        self.__objects = {key: wire.to_object(record)
+                          for key, record in snap["objects"].items()}
+        self.__seq = snap["seq"]
+        self.__close()
+
+    def __close(self):
+        """Close the log, to be read again from its start."""
+        if self.__log is not None:
+            self.__log.close()
+        self.__log = None
+        self.__inode = None
+        self.__pending = []
+
+    def __read(self):
+        """Return the events appended to the log since the last read.
+
+        The log is read again from its start when the primary replaced
+        it. A partial last line is kept for the next read.
+        """
+        path = os.path.join(self.directory, LOG)
+        try:
+            inode = os.stat(path).st_ino
+        except FileNotFoundError:
+            return []
+        if inode != self.__inode:
+            self.__close()
+            self.__log = open(path)
+            self.__inode = inode
+        events = []
+        for line in self.__log:
+            if not line.endswith("\n"):
+                self.__pending.append(line)
+                break
+            if self.__pending:
+                line = "".join(self.__pending) + line
+                self.__pending = []
+            events.append(json.loads(line))
+        return events
+
+    def __apply(self, event):
+        """Apply the change event to the objects."""
+        key = "{}.{}".format(event["class"], event["id"])
+        if event["op"] == "delete":
+            self.__objects.pop(key, None)
+            return
+        fields = event["fields"] or {}
+        obj = self.__objects.get(key)
+        if obj is None:
+            record = dict(fields, id=event["id"])
+            record["__class__"] = event["class"]
+            record.setdefault("created_at", event["time"])
+            record.setdefault("updated_at", event["time"])
+            self.__objects[key] = wire.to_object(record)
+            return
+        for name, value in fields.items():
+            if value is None:
+                obj.__dict__.pop(name, None)
+            elif name in ("created_at", "updated_at"):
+                obj.__dict__[name] = datetime.strptime(value, _TFORM)
+            else:
+                obj.__dict__[name] = value
+
+    def start(self):
+        """Poll the directory every interval seconds, in a thread."""
+        self.poll()
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, name="follower",
+                                         daemon=True)
+        self.__thread.start()
+
+    def __run(self):
+        """Poll until stopped."""
+        while not self.__stop.wait(self.interval):
+            try:
+                self.poll()
+            except (OSError, ValueError):
+                pass
+
+    def stop(self):
+        """Stop polling, and close the log."""
+        if self.__thread is not None:
+            self.__stop.set()
+            self.__thread.join()
+            self.__thread = None
+        with self.__lock:
+            self.__close()
+
+    def lag(self):
+        """Return how far the follower is behind the primary.
+
+        Returns:
+            A dict with the last applied and last logged sequence
+            numbers, the number of events behind, the seconds since the
+            oldest of them was emitted, and the time of the last poll.
+        """
+        with self.__lock:
+            applied = self.__seq
+            last_poll = self.__last_poll
+        primary = applied
+        oldest = None
+        path = os.path.join(self.directory, LOG)
+        for event in ChangeFeed(path).read(applied):
+            primary = event["seq"]
+            if oldest is None:
+                oldest = event["time"]
+        seconds = 0.0
+        if oldest is not None:
+            seconds = max(0.0, (datetime.today() - datetime.strptime(
+                oldest, _TFORM)).total_seconds())
+        return {
+            "applied_seq": applied,
+            "primary_seq": primary,
+            "behind": primary - applied,
+            "seconds_behind": seconds,
+            "last_poll": (None if last_poll is None else
+                          datetime.fromtimestamp(last_poll).isoformat())
+        }
+
+    def __ready(self):
+        """Poll, unless a thread does or the last poll is recent."""
+        if self.__objects is None or (
+                self.__thread is None and
+                time.time() - self.__last_poll >= self.interval):
+            self.poll()
+
+    def all(self):
+        """Return a copy of the dictionary of replicated objects."""
+        with self.__lock:
+            self.__ready()
+            return dict(self.__objects)
+
+    def get(self, cls_name, oid):
+        """Return the instance of cls_name with id oid, or None."""
+        with self.__lock:
+            self.__ready()
+            return self.__objects.get("{}.{}".format(cls_name, oid))
+
+    def count(self, cls_name=None):
+        """Return the number of replicated objects, or of cls_name."""
+        prefix = "" if cls_name is None else cls_name + "."
+        return len([key for key in self.all() if key.startswith(prefix)])
+
+    def children(self, parent, cls_name, attr):
+        """Return the cls_name instances whose attr is parent.id."""
+        prefix = cls_name + "."
+        return [obj for key, obj in self.all().items()
+                if key.startswith(prefix) and
+                getattr(obj, attr, None) == parent.id]
+
+    def places_with_amenities(self, all_of=(), any_of=(), none_of=()):
+        """Return the Place instances matching an amenity query."""
+        all_of, any_of, none_of = set(all_of), set(any_of), set(none_of)
+        objl = []
+        for key, obj in self.all().items():
+            if key.startswith("Place."):
+                ids = set(obj.amenity_ids)
+                if (all_of <= ids and not ids & none_of and
+                        (not any_of or ids & any_of)):
+                    objl.append(obj)
+        return objl
+
+    def memory_report(self, cls_name=None, sample=1000):
+        """Return an estimate of the memory used by replicated objects.
+
+        See FileStorage.memory_report.
+        """
+        groups = {}
+        for key, obj in self.all().items():
+            cname = key.partition(".")[0]
+            if cls_name is None or cname == cls_name:
+                groups.setdefault(cname, []).append(obj)
+        report = {"classes": {cname: class_report(objl, sample)
+                              for cname, objl in sorted(groups.items())}}
+        report["total_bytes"] = sum(c["bytes"]
+                                    for c in report["classes"].values())
+        return report
+
+    def stats_report(self):
+        """Return the instrumentation report of the replica as a dict.
+
+        See FileStorage.stats_report; the report holds the lag() of the
+        replica instead of the size of a file.
+        """
+        report = stats.to_dict()
+        per_class = {}
+        for key in self.all():
+            cls_name = key.partition(".")[0]
+            per_class[cls_name] = per_class.get(cls_name, 0) + 1
+        report["objects"] = dict(sorted(per_class.items()))
+        report["lag"] = self.lag()
+        return report
+
+    def __read_only(self, *args, **kwargs):
+        """Refuse to modify a replica."""
+        raise RuntimeError("storage is a read-only follower")
+
+    def set_attribute(self, obj, name, value):
+        """Set attribute name of obj, unless obj is replicated."""
+        key = "{}.{}".format(obj.__class__.__name__, obj.__dict__.get("id"))
+        with self.__lock:
+            if self.__objects is not None and \
+                    self.__objects.get(key) is obj:
+                self.__read_only()
+        object.__setattr__(obj, name, value)
+
+    new = delete = save = update_many = reload = __read_only
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""Defines the binary snapshot cache of the storage file.
+
+A snapshot is a pickle of the objects loaded from a storage file, stored
+next to it. It starts with a header describing the JSON file it was
+built from (size, modification time and SHA-256 of its content), so a
+snapshot is only used while the JSON file is byte for byte unchanged.
+Restoring one skips JSON parsing and BaseModel.__init__ for every object.
+
+Snapshots are pickles: they must only be read from trusted locations,
+like the directory of the storage file itself.
+"""
+
+import hashlib
+import os
+import pickle
+
+VERSION = 1
+
+
+def path_for(file_path):
+    """Return the snapshot path of the storage file file_path."""
+    return file_path + ".cache"
+
+
+def header(st, data):
+    """Return the header identifying data, whose os.stat result is st."""
+    return {
+        "version": VERSION,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": hashlib.sha256(data).hexdigest()
+    }
+
+
+def write(file_path, data, objects):
+    """Write the snapshot of file_path, holding the given objects.
+
+    Args:
+        file_path (str): The storage file the objects were read from or
+            written to.
+        data (bytes): The current content of file_path.
+        objects (list): The objects to snapshot.
+    Returns:
+        True if the snapshot was written, False otherwise.
+    """
+    cache = path_for(file_path)
+    tmp = cache + ".tmp"
+    try:
+        head = header(os.stat(file_path), data)
+        with open(tmp, "wb") as f:
+            pickle.dump(head, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(objects, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError,
+            RuntimeError):
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def read(file_path, st, data):
+    """Return the objects of the snapshot of file_path, if it is valid.
+
+    Args:
+        file_path (str): The storage file.
+        st (os.stat_result): The status of file_path when data was read.
+        data (bytes): The content of file_path.
+    Returns:
+        The list of snapshotted objects, or None if there is no snapshot
+        or it does not match data.
+    """
+    try:
+        with open(path_for(file_path), "rb") as f:
+            head = pickle.load(f)
+            if (not isinstance(head, dict) or
+                    head.get("version") != VERSION or
+                    head.get("size") != st.st_size or
+                    head.get("mtime_ns") != st.st_mtime_ns or
+                    head != header(st, data)):
+                return None
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+            ImportError, IndexError, TypeError, ValueError):
+        return None
@@ -0,0 +1,227 @@
+#!/usr/bin/python3
+"""Defines the Histogram, Stats and Tracer classes used for instrumentation.
+
+Instrumented code checks ``stats.enabled`` before measuring anything, so
+the cost of disabled instrumentation is one attribute lookup per call.
+Set HBNB_STATS=1 in the environment to enable it from the start, and
+HBNB_TRACE=1 to trace console commands (see Tracer).
+"""
+
+import json
+import os
+from datetime import datetime
+from time import perf_counter
+
+
+class Histogram:
+    """Represent a histogram of latencies with power of two buckets.
+
+    Bucket i counts the samples that took less than 2 ** i microseconds
+    and at least half of that.
+    """
+
+    def __init__(self):
+        """Initialize an empty Histogram."""
+        self.buckets = []
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds):
+        """Add a sample of seconds to the histogram."""
+        i = int(seconds * 1000000).bit_length()
+        if i >= len(self.buckets):
+            self.buckets.extend([0] * (i + 1 - len(self.buckets)))
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """Return an upper bound, in seconds, of the p-th percentile."""
+        if self.count == 0:
+            return None
+        rank = self.count * p / 100.0
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min((1 << i) / 1000000.0, self.max)
+        return self.max
+
+    def to_dict(self):
+        """Return a JSON serializable summary of the histogram."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99)
+        }
+
+
+class Stats:
+    """Represent a registry of counters and latency histograms.
+
+    Attributes:
+        enabled (bool): Whether instrumented code should record anything.
+        counters (dict): Maps counter names to ints.
+        latencies (dict): Maps operation names to Histogram instances.
+    """
+
+    def __init__(self, enabled=False):
+        """Initialize an empty Stats registry."""
+        self.enabled = enabled
+        self.counters = {}
+        self.latencies = {}
+
+    def incr(self, name, n=1):
+        """Add n to the counter name."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, seconds):
+        """Record that operation name took seconds."""
+        hist = self.latencies.get(name)
+        if hist is None:
+            hist = self.latencies[name] = Histogram()
+        hist.record(seconds)
+
+    def reset(self):
+        """Forget every counter and histogram."""
+        self.counters = {}
+        self.latencies = {}
+
+    def to_dict(self):
+        """Return a JSON serializable report of the registry."""
+        return {
+            "enabled": self.enabled,
+            "counters": dict(sorted(self.counters.items())),
+            "latencies": {name: hist.to_dict()
+                          for name, hist in sorted(self.latencies.items())}
+        }
+
+    def dump(self, path, report=None):
+        """Write report, or the report of the registry, to path as JSON."""
+        if report is None:
+            report = self.to_dict()
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+class Tracer:
+    """Represent a per-command, per-phase latency tracer for the console.
+
+    A traced command is opened by start(), split into phases by mark()
+    (parse, lookup, mutation, save, output...) and closed by finish().
+    Commands slower than threshold are appended as JSON lines to the
+    slow command log.
+
+    Attributes:
+        enabled (bool): Whether commands should be traced.
+        threshold (float): Seconds above which a command is logged as
+            slow, or None to disable the slow command log.
+        log_path (str): The path of the slow command log.
+        commands (dict): Maps command names to Histogram instances.
+        phases (dict): Maps "command.phase" names to Histogram instances.
+    """
+
+    def __init__(self, enabled=False, threshold=None,
+                 log_path="slow_commands.log"):
+        """Initialize a Tracer with no traced command."""
+        self.enabled = enabled
+        self.threshold = threshold
+        self.log_path = log_path
+        self.commands = {}
+        self.phases = {}
+        self.__command = None
+        self.__start = 0.0
+        self.__last = 0.0
+        self.__marks = []
+
+    def start(self, command):
+        """Start tracing command, if tracing is enabled."""
+        if not self.enabled:
+            return
+        self.__command = command
+        self.__marks = []
+        self.__start = self.__last = perf_counter()
+
+    def mark(self, phase):
+        """Close phase of the traced command, started at the last mark."""
+        if self.__command is None:
+            return
+        now = perf_counter()
+        self.__marks.append((phase, now - self.__last))
+        self.__last = now
+
+    def finish(self, line):
+        """Stop tracing the current command, given as line.
+
+        Returns:
+            The total seconds taken by the command, or None if no
+            command was traced.
+        """
+        if self.__command is None:
+            return None
+        now = perf_counter()
+        command = self.__command
+        self.__command = None
+        total = now - self.__start
+        if now > self.__last:
+            self.__marks.append(("other", now - self.__last))
+        self.__record(self.commands, command, total)
+        for phase, seconds in self.__marks:
+            self.__record(self.phases, command + "." + phase, seconds)
+        if self.threshold is not None and total >= self.threshold:
+            entry = {
+                "time": datetime.today().isoformat(),
+                "command": command,
+                "line": line,
+                "total": total,
+                "phases": dict(self.__marks)
+            }
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        return total
+
+    def __record(self, histograms, name, seconds):
+        """Record seconds in the histogram name of histograms."""
+        hist = histograms.get(name)
+        if hist is None:
+            hist = histograms[name] = Histogram()
+        hist.record(seconds)
+
+    def reset(self):
+        """Forget every recorded command."""
+        self.commands = {}
+        self.phases = {}
+
+    def to_dict(self):
+        """Return a JSON serializable report of the traced commands."""
+        return {
+            "enabled": self.enabled,
+            "slow_threshold": self.threshold,
+            "slow_log": self.log_path,
+            "commands": {name: hist.to_dict()
+                         for name, hist in sorted(self.commands.items())},
+            "phases": {name: hist.to_dict()
+                       for name, hist in sorted(self.phases.items())}
+        }
+
+
+def _threshold(ms):
+    """Convert the milliseconds string ms to seconds, None if empty."""
+    return float(ms) / 1000 if ms else None
+
+
+stats = Stats(os.environ.get("HBNB_STATS") == "1")
+tracer = Tracer(os.environ.get("HBNB_TRACE") == "1",
+                _threshold(os.environ.get("HBNB_SLOW_MS")),
+                os.environ.get("HBNB_SLOW_LOG", "slow_commands.log"))
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+"""Defines the storage server, sharing one FileStorage between processes.
+
+The server owns the objects of the storage file of its working directory
+and serves them over a Unix domain socket (see wire for the protocol),
+so that consoles using ClientStorage neither reload the file nor
+overwrite each other's changes. Run it with:
+
+    python3 -m models.engine.storage_server --socket hbnb.sock
+
+and start consoles with HBNB_STORAGE_SOCKET=hbnb.sock in the environment.
+"""
+
+import argparse
+import os
+import signal
+import socketserver
+import sys
+from types import SimpleNamespace
+import models
+from models.engine import wire
+from models.engine.file_storage import FileStorage
+
+
+class StorageHandler(socketserver.StreamRequestHandler):
+    """Represent a client connection, answering its requests in order."""
+
+    def handle(self):
+        """Answer requests until the client disconnects."""
+        while True:
+            try:
+                request = wire.read(self.rfile)
+            except (EOFError, ConnectionError):
+                return
+            try:
+                op = getattr(self.server, "op_" + str(request.get("op")),
+                             None)
+                if op is None:
+                    raise ValueError("unknown op {}".format(
+                        request.get("op")))
+                args = {k: v for k, v in request.items() if k != "op"}
+                response = {"result": op(**args)}
+            except (ValueError, TypeError, KeyError, OSError) as e:
+                response = {"error": "{}: {}".format(type(e).__name__, e)}
+            self.wfile.write(wire.encode(response))
+
+
+class StorageServer(socketserver.ThreadingUnixStreamServer):
+    """Represent a storage server listening on a Unix domain socket.
+
+    Every op_<name> method answers the requests of op <name>. Storage is
+    switched to thread-safe mode, as each connection has its thread.
+
+    Attributes:
+        storage (FileStorage): The storage served.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, storage=None):
+        """Initialize a StorageServer listening on the socket path."""
+        if storage is None:
+            storage = FileStorage()
+        storage.set_thread_safe(True)
+        self.storage = storage
+        if os.path.exists(path):
+            os.remove(path)
+        super().__init__(path, StorageHandler)
+
+    def __records(self, objl):
+        """Return the to_dict() records of the instances objl."""
+        return [obj.to_dict() for obj in objl]
+
+    def op_get(self, cls, id):
+        """Return the record of the instance id of cls, or None."""
+        obj = self.storage.get(cls, id)
+        return None if obj is None else obj.to_dict()
+
+    def op_all(self, cls=None):
+        """Return the records of every instance, or of those of cls."""
+        records = self.storage.freeze()
+        if cls is None:
+            return list(records.values())
+        prefix = cls + "."
+        return [record for key, record in records.items()
+                if key.startswith(prefix)]
+
+    def op_count(self, cls=None):
+        """Return the number of instances, or of those of cls."""
+        objects = self.storage.all()
+        if cls is None:
+            return len(objects)
+        prefix = cls + "."
+        return sum(1 for key in objects if key.startswith(prefix))
+
+    def op_keys(self, cls=None):
+        """Return the sorted keys of every instance, or of those of cls."""
+        keys = self.storage.all()
+        if cls is None:
+            return sorted(keys)
+        prefix = cls + "."
+        return sorted(key for key in keys if key.startswith(prefix))
+
+    def op_put(self, records):
+        """Store the instances of records, replacing existing ones."""
+        objl = [wire.to_object(record) for record in records]
+        for obj in objl:
+            self.storage.new(obj)
+        return len(objl)
+
+    def op_delete(self, cls, id, cascade=False):
+        """Delete the instance id of cls and return the keys removed."""
+        obj = self.storage.get(cls, id)
+        if obj is None:
+            return []
+        return self.storage.delete(obj, cascade)
+
+    def op_children(self, cls, attr, id):
+        """Return the records of the cls instances whose attr is id."""
+        parent = SimpleNamespace(id=id)
+        return self.__records(self.storage.children(parent, cls, attr))
+
+    def op_amenities(self, all_of=(), any_of=(), none_of=()):
+        """Return the records of the places matching an amenity query."""
+        return self.__records(
+            self.storage.places_with_amenities(all_of, any_of, none_of))
+
+    def op_save(self):
+        """Write storage to its file."""
+        self.storage.save()
+
+    def op_reload(self):
+        """Reload storage from its file."""
+        self.storage.reload()
+
+    def op_memory(self, cls=None, sample=1000):
+        """Return the memory report of storage."""
+        return self.storage.memory_report(cls, sample)
+
+    def op_stats(self):
+        """Return the instrumentation report of storage."""
+        return self.storage.stats_report()
+
+
+def main(argv=None):
+    """Parse the command line and serve storage until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", default="hbnb.sock")
+    args = parser.parse_args(argv)
+    models.storage = FileStorage()
+    server = StorageServer(args.socket, models.storage)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
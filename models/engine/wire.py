@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""Defines the protocol spoken between the storage server and its clients.
+
+Every message is a frame: a 4-byte big-endian length followed by that
+many bytes of compact JSON. A request is a dict holding an "op" and its
+arguments; its response is {"result": ...} or {"error": "..."}. A
+connection answers its requests in order, so a client may send several
+before reading their responses (pipelining).
+
+Instances travel as their to_dict() records.
+"""
+
+import json
+import struct
+from models.base_model import BaseModel
+from models.user import User
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.place import Place
+from models.review import Review
+from models.booking import Booking
+
+HEADER = struct.Struct("!I")
+CLASSES = {cls.__name__: cls
+           for cls in (BaseModel, User, State, City, Amenity, Place, Review,
+                       Booking)}
+
+
+def encode(message):
+    """Return the frame of message."""
+    data = json.dumps(message, separators=(",", ":")).encode()
+    return HEADER.pack(len(data)) + data
+
+
+def read(rfile):
+    """Return the next message read from the binary file rfile.
+
+    Raises:
+        EOFError: If the connection is closed.
+    """
+    head = rfile.read(HEADER.size)
+    if len(head) < HEADER.size:
+        raise EOFError("connection closed")
+    size = HEADER.unpack(head)[0]
+    data = rfile.read(size)
+    if len(data) < size:
+        raise EOFError("connection closed")
+    return json.loads(data)
+
+
+def to_object(record):
+    """Return the instance described by the to_dict() record.
+
+    Raises:
+        ValueError: If the class of the record is unknown.
+    """
+    attrs = dict(record)
+    cls = CLASSES.get(attrs.pop("__class__", None))
+    if cls is None:
+        raise ValueError("unknown class in {}".format(record))
+    return cls(**attrs)
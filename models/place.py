@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """Define city Class"""
 
+import models
 from models.base_model import BaseModel
 
 
@@ -32,3 +33,13 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    @property
+    def reviews(self):
+        """list: The Review instances of this Place."""
+        return models.storage.children(self, "Review", "place_id")
+
+    @property
+    def bookings(self):
+        """list: The Booking instances of this Place."""
+        return models.storage.children(self, "Booking", "place_id")
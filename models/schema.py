@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+"""Defines the attribute schemas used to coerce values set on models.
+
+A schema maps every public class attribute of a model (``Place.number_rooms``,
+``User.email``...) to a function converting raw input to the attribute's
+type. Attributes named in the ``_date_fields`` of a model hold ISO dates.
+Schemas are compiled once per class and cached.
+"""
+
+import ast
+from models.engine.booking_index import to_date
+
+
+def parse_literal(text):
+    """Parse a Python literal (dict, list, str, number...) without eval.
+
+    Args:
+        text (str): The literal to parse.
+    Raises:
+        ValueError: If text is not a valid literal.
+    """
+    try:
+        return ast.literal_eval(text.strip())
+    except (SyntaxError, TypeError, MemoryError, RecursionError):
+        raise ValueError("malformed literal: {}".format(text))
+
+
+def _to_int(value):
+    """Convert value to an int, accepting float notation like '3.0'."""
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _to_list(value):
+    """Convert value to a list, parsing list literals given as strings."""
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    if isinstance(value, str):
+        try:
+            parsed = parse_literal(value)
+        except ValueError:
+            return [value]
+        if isinstance(parsed, (list, tuple)):
+            return list(parsed)
+    return [value]
+
+
+def _to_date(value):
+    """Convert value to an ISO date string (YYYY-MM-DD)."""
+    if not isinstance(value, str):
+        value = str(value)
+    return to_date(value).isoformat()
+
+
+_coercers = {
+    str: str,
+    int: _to_int,
+    float: float,
+    list: _to_list
+}
+_schemas = {}
+PROTECTED = ("id", "created_at", "updated_at", "__class__")
+
+
+def schema_for(cls):
+    """Return the compiled schema of cls as a dict of name -> coercer.
+
+    Only public class attributes whose default is a str, int, float or
+    list take part in the schema, or which are listed in the
+    _date_fields of the class; methods and properties are ignored.
+    """
+    schema = _schemas.get(cls)
+    if schema is None:
+        schema = {}
+        for klass in reversed(cls.__mro__):
+            for name, default in vars(klass).items():
+                if name.startswith("_"):
+                    continue
+                coercer = _coercers.get(type(default))
+                if coercer is not None:
+                    schema[name] = coercer
+                else:
+                    schema.pop(name, None)
+            for name in vars(klass).get("_date_fields", ()):
+                schema[name] = _to_date
+        _schemas[cls] = schema
+    return schema
+
+
+def coerce(cls, name, value):
+    """Convert value to the type declared for attribute name on cls.
+
+    Attributes that are not part of the schema are returned unchanged.
+
+    Raises:
+        ValueError: If value cannot be converted to the declared type.
+    """
+    coercer = schema_for(cls).get(name)
+    if coercer is None:
+        return value
+    try:
+        return coercer(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("invalid value for {}.{}: {!r}".format(
+            cls.__name__, name, value))
+
+
+def check_names(cls, names):
+    """Check that every name of names may be set on instances of cls.
+
+    A name may be set if it is part of the schema of cls, or if it is a
+    new public identifier that is not an attribute of cls (a method, a
+    property...). The names of PROTECTED may not be set.
+
+    Raises:
+        ValueError: If a name may not be set.
+    """
+    fields = schema_for(cls)
+    for name in names:
+        if name in PROTECTED or name not in fields and (
+                not isinstance(name, str) or not name.isidentifier() or
+                name.startswith("_") or hasattr(cls, name)):
+            raise ValueError("invalid attribute for {}: {!r}".format(
+                cls.__name__, name))
+
+
+def validate(obj, values):
+    """Check that obj accepts the coerced values, as a whole.
+
+    Names are checked with check_names. Models may also define a
+    _validate(values) method checking rules between attributes, like a
+    Booking's check_out following its check_in.
+
+    Raises:
+        ValueError: If obj refuses the values.
+    """
+    check_names(obj.__class__, values)
+    check = getattr(obj, "_validate", None)
+    if check is not None:
+        check(values)
+
+
+def apply(obj, attrs):
+    """Coerce, validate, then set every name/value pair of attrs on obj.
+
+    All values are converted and checked before any is set, so a bad
+    value leaves obj untouched.
+
+    Raises:
+        ValueError: If one of the values cannot be converted, or obj
+        refuses them (see validate).
+    """
+    cls = obj.__class__
+    values = {k: coerce(cls, k, v) for k, v in attrs.items()}
+    validate(obj, values)
+    for k, v in values.items():
+        setattr(obj, k, v)
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """Define State Class"""
 
+import models
 from models.base_model import BaseModel
 
 
@@ -11,3 +12,8 @@ class State(BaseModel):
         name (str): State's name.
     """
     name = ""
+
+    @property
+    def cities(self):
+        """list: The City instances of this State."""
+        return models.storage.children(self, "City", "state_id")
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """Defines User class."""
 
+import models
 from models.base_model import BaseModel
 
 
@@ -17,3 +18,13 @@ class User(BaseModel):
     password = ""
     first_name = ""
     last_name = ""
+
+    @property
+    def places(self):
+        """list: The Place instances owned by this User."""
+        return models.storage.children(self, "Place", "user_id")
+
+    @property
+    def reviews(self):
+        """list: The Review instances written by this User."""
+        return models.storage.children(self, "Review", "user_id")
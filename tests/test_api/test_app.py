@@ -0,0 +1,231 @@
+#!/usr/bin/python3
+"""
+Unit tests for the REST API in api/v1/app.py.
+
+Test classes:
+    TestAPI
+"""
+
+import json
+import os
+import threading
+import models
+import unittest
+from unittest import mock
+from http.client import HTTPConnection
+from api.v1.app import APIServer
+from models.city import City
+from models.place import Place
+from models.state import State
+
+
+class TestAPI(unittest.TestCase):
+    """Tests for the endpoints of the API, over one kept-alive connection."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        cls.server = APIServer(("127.0.0.1", 0), quiet=True)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+        models.storage.set_thread_safe(False)
+        for name in ("file.json", "file.json.cache"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        self.conn = HTTPConnection(*self.server.server_address)
+        self.addCleanup(self.conn.close)
+
+    def request(self, method, path, body=None, headers=None):
+        """Return the response and decoded body of a request."""
+        data = None if body is None else json.dumps(body)
+        self.conn.request(method, "/api/v1" + path, data, headers or {})
+        response = self.conn.getresponse()
+        raw = response.read()
+        return response, json.loads(raw) if raw else None
+
+    def test_status(self):
+        response, body = self.request("GET", "/status")
+        self.assertEqual(200, response.status)
+        self.assertEqual({"status": "OK"}, body)
+
+    def test_crud(self):
+        response, body = self.request("POST", "/states", {"name": "Idaho"})
+        self.assertEqual(201, response.status)
+        oid = body["id"]
+        self.assertEqual("/api/v1/states/" + oid,
+                         response.getheader("Location"))
+        response, body = self.request("GET", "/states/" + oid)
+        self.assertEqual(200, response.status)
+        self.assertEqual("Idaho", body["name"])
+        self.assertEqual("State", body["__class__"])
+        response, body = self.request("PUT", "/states/" + oid,
+                                      {"name": "Iowa", "id": "other"})
+        self.assertEqual(200, response.status)
+        self.assertEqual("Iowa", body["name"])
+        self.assertEqual(oid, body["id"])
+        response, body = self.request("DELETE", "/states/" + oid)
+        self.assertEqual(200, response.status)
+        response, body = self.request("GET", "/states/" + oid)
+        self.assertEqual(404, response.status)
+        self.assertEqual({"error": "Not found"}, body)
+
+    def test_invalid_requests(self):
+        self.assertEqual(404, self.request("GET", "/nope")[0].status)
+        self.assertEqual(404, self.request("GET", "/states/a/b/c")[0].status)
+        self.conn.request("POST", "/api/v1/states", "not json")
+        response = self.conn.getresponse()
+        self.assertEqual(400, response.status)
+        self.assertEqual({"error": "Not a JSON"}, json.loads(response.read()))
+        response, body = self.request("POST", "/places",
+                                      {"number_rooms": "many"})
+        self.assertEqual(400, response.status)
+        response, body = self.request("GET", "/places?limit=x")
+        self.assertEqual(400, response.status)
+
+    def test_rejected_attributes(self):
+        st = State()
+        st.save()
+        for attrs in ({"to_dict": 1}, {"cities": 1}, {"__class__x": 1},
+                      {"_State__secret": 1}, {"not a name": 1}):
+            response, body = self.request("PUT", "/states/" + st.id, attrs)
+            self.assertEqual(400, response.status)
+            self.assertIn("error", body)
+        self.assertTrue(callable(st.to_dict))
+        response, body = self.request("PUT", "/states/" + st.id,
+                                      {"motto": "Eureka"})
+        self.assertEqual(200, response.status)
+        self.assertEqual("Eureka", body["motto"])
+
+    def test_invalid_content_length(self):
+        self.conn.putrequest("POST", "/api/v1/states")
+        self.conn.putheader("Content-Length", "ten")
+        self.conn.endheaders()
+        response = self.conn.getresponse()
+        self.assertEqual(400, response.status)
+        self.assertEqual({"error": "Invalid Content-Length"},
+                         json.loads(response.read()))
+
+    def test_unexpected_error(self):
+        with mock.patch.object(APIServer, "find", side_effect=KeyError):
+            response, body = self.request("GET", "/states")
+        self.assertEqual(500, response.status)
+        self.assertEqual({"error": "Internal server error"}, body)
+        sock = self.conn.sock
+        self.assertEqual(200, self.request("GET", "/status")[0].status)
+        self.assertIs(sock, self.conn.sock)
+
+    def test_invalid_stay(self):
+        for attrs in ({"check_in": "2024-9-1"},
+                      {"check_in": "2024-09-05", "check_out": "2024-09-01"}):
+            count = models.storage.count("Booking")
+            response, body = self.request("POST", "/bookings", attrs)
+            self.assertEqual(400, response.status)
+            self.assertEqual(count, models.storage.count("Booking"))
+        response, body = self.request("POST", "/bookings",
+                                      {"check_in": "20240901",
+                                       "check_out": "2024-09-03"})
+        self.assertEqual(201, response.status)
+        self.assertEqual("2024-09-01", body["check_in"])
+
+    def test_typed_values(self):
+        response, body = self.request("POST", "/places",
+                                      {"number_rooms": "3",
+                                       "latitude": "1.5"})
+        self.assertEqual(3, body["number_rooms"])
+        self.assertEqual(1.5, body["latitude"])
+
+    def test_conditional_get(self):
+        st = State()
+        st.save()
+        response, body = self.request("GET", "/states/" + st.id)
+        etag = response.getheader("ETag")
+        self.assertEqual('"{}"'.format(st.updated_at.isoformat()), etag)
+        response, body = self.request("GET", "/states/" + st.id,
+                                      headers={"If-None-Match": etag})
+        self.assertEqual(304, response.status)
+        self.assertIsNone(body)
+        st.save()
+        response, body = self.request("GET", "/states/" + st.id,
+                                      headers={"If-None-Match": etag})
+        self.assertEqual(200, response.status)
+
+    def test_list_filter_and_pagination(self):
+        st = State()
+        cities = sorted((City() for _ in range(5)), key=lambda c: c.id)
+        for cy in cities:
+            cy.state_id = st.id
+        City().save()
+        response, body = self.request(
+            "GET", "/cities?state_id={}&limit=2".format(st.id))
+        self.assertEqual(200, response.status)
+        self.assertEqual("5", response.getheader("X-Total-Count"))
+        self.assertEqual([c.id for c in cities[:2]], [c["id"] for c in body])
+        link = response.getheader("Link")
+        self.assertIn("offset=2", link)
+        response, body = self.request(
+            "GET", "/cities?state_id={}&limit=2&offset=4".format(st.id))
+        self.assertEqual([cities[4].id], [c["id"] for c in body])
+        self.assertIsNone(response.getheader("Link"))
+
+    def test_list_order_by(self):
+        cy = City()
+        places = [Place() for _ in range(6)]
+        for i, pl in enumerate(places):
+            pl.city_id = cy.id
+            pl.price_by_night = i % 3
+        places[0].save()
+        response, body = self.request(
+            "GET", "/places?city_id={}&order_by=-price_by_night&limit=3"
+            .format(cy.id))
+        self.assertEqual(200, response.status)
+        expected = sorted(places, key=lambda p: (-p.price_by_night, p.id))
+        self.assertEqual([p.id for p in expected[:3]],
+                         [p["id"] for p in body])
+        self.assertIn("order_by=-price_by_night", response.getheader("Link"))
+        response, body = self.request(
+            "GET", "/places?city_id={}&order_by=-price_by_night&offset=3"
+            .format(cy.id))
+        self.assertEqual([p.id for p in expected[3:]],
+                         [p["id"] for p in body])
+
+    def test_list_conditional_get(self):
+        pl = Place()
+        pl.name = "etag-place"
+        pl.save()
+        response, body = self.request("GET", "/places?name=etag-place")
+        etag = response.getheader("ETag")
+        response, body = self.request("GET", "/places?name=etag-place",
+                                      headers={"If-None-Match": etag})
+        self.assertEqual(304, response.status)
+        pl.save()
+        response, body = self.request("GET", "/places?name=etag-place",
+                                      headers={"If-None-Match": etag})
+        self.assertEqual(200, response.status)
+        self.assertNotEqual(etag, response.getheader("ETag"))
+
+    def test_keep_alive(self):
+        self.request("GET", "/status")
+        sock = self.conn.sock
+        self.request("GET", "/states")
+        self.assertIs(sock, self.conn.sock)
+
+
+if __name__ == "__main__":
+    unittest.main()
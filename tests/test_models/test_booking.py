@@ -0,0 +1,215 @@
+#!/usr/bin/python3
+"""Defines unittests for models/booking.py.
+
+Unittest classes:
+    TestBooking_instantiation
+    TestBooking_save
+    TestBooking_to_dict
+"""
+
+import os
+import models
+import unittest
+from datetime import datetime
+from time import sleep
+from models.booking import Booking
+from models.place import Place
+
+
+class TestBooking_instantiation(unittest.TestCase):
+    """Unittests for testing instantiation of the Booking class."""
+
+    def test_no_args_instantiates(self):
+        self.assertEqual(Booking, type(Booking()))
+
+    def test_new_instance_stored_in_objects(self):
+        self.assertIn(Booking(), models.storage.all().values())
+
+    def test_id_is_public_str(self):
+        self.assertEqual(str, type(Booking().id))
+
+    def test_created_at_is_public_datetime(self):
+        self.assertEqual(datetime, type(Booking().created_at))
+
+    def test_updated_at_is_public_datetime(self):
+        self.assertEqual(datetime, type(Booking().updated_at))
+
+    def test_place_id_is_public_class_attribute(self):
+        bk = Booking()
+        self.assertEqual(str, type(Booking.place_id))
+        self.assertIn("place_id", dir(bk))
+        self.assertNotIn("place_id", bk.__dict__)
+
+    def test_user_id_is_public_class_attribute(self):
+        bk = Booking()
+        self.assertEqual(str, type(Booking.user_id))
+        self.assertIn("user_id", dir(bk))
+        self.assertNotIn("user_id", bk.__dict__)
+
+    def test_check_in_is_public_class_attribute(self):
+        bk = Booking()
+        self.assertEqual(str, type(Booking.check_in))
+        self.assertIn("check_in", dir(bk))
+        self.assertNotIn("check_in", bk.__dict__)
+
+    def test_check_out_is_public_class_attribute(self):
+        bk = Booking()
+        self.assertEqual(str, type(Booking.check_out))
+        self.assertIn("check_out", dir(bk))
+        self.assertNotIn("check_out", bk.__dict__)
+
+    def test_place_bookings(self):
+        pl = Place()
+        bk = Booking()
+        bk.place_id = pl.id
+        self.assertEqual([bk], pl.bookings)
+
+    def test_two_bookings_unique_ids(self):
+        bk1 = Booking()
+        bk2 = Booking()
+        self.assertNotEqual(bk1.id, bk2.id)
+
+    def test_two_bookings_different_created_at(self):
+        bk1 = Booking()
+        sleep(0.05)
+        bk2 = Booking()
+        self.assertLess(bk1.created_at, bk2.created_at)
+
+    def test_two_bookings_different_updated_at(self):
+        bk1 = Booking()
+        sleep(0.05)
+        bk2 = Booking()
+        self.assertLess(bk1.updated_at, bk2.updated_at)
+
+    def test_str_representation(self):
+        dt = datetime.today()
+        dt_repr = repr(dt)
+        bk = Booking()
+        bk.id = "123456"
+        bk.created_at = bk.updated_at = dt
+        bkstr = bk.__str__()
+        self.assertIn("[Booking] (123456)", bkstr)
+        self.assertIn("'id': '123456'", bkstr)
+        self.assertIn("'created_at': " + dt_repr, bkstr)
+        self.assertIn("'updated_at': " + dt_repr, bkstr)
+
+    def test_args_unused(self):
+        bk = Booking(None)
+        self.assertNotIn(None, bk.__dict__.values())
+
+    def test_instantiation_with_kwargs(self):
+        dt = datetime.today()
+        dt_iso = dt.isoformat()
+        bk = Booking(id="345", created_at=dt_iso, updated_at=dt_iso)
+        self.assertEqual(bk.id, "345")
+        self.assertEqual(bk.created_at, dt)
+        self.assertEqual(bk.updated_at, dt)
+
+    def test_instantiation_with_None_kwargs(self):
+        with self.assertRaises(TypeError):
+            Booking(id=None, created_at=None, updated_at=None)
+
+
+class TestBooking_save(unittest.TestCase):
+    """Unittests for testing save method of the Booking class."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_one_save(self):
+        bk = Booking()
+        sleep(0.05)
+        first_updated_at = bk.updated_at
+        bk.save()
+        self.assertLess(first_updated_at, bk.updated_at)
+
+    def test_two_saves(self):
+        bk = Booking()
+        sleep(0.05)
+        first_updated_at = bk.updated_at
+        bk.save()
+        second_updated_at = bk.updated_at
+        self.assertLess(first_updated_at, second_updated_at)
+        sleep(0.05)
+        bk.save()
+        self.assertLess(second_updated_at, bk.updated_at)
+
+    def test_save_with_arg(self):
+        bk = Booking()
+        with self.assertRaises(TypeError):
+            bk.save(None)
+
+    def test_save_updates_file(self):
+        bk = Booking()
+        bk.save()
+        bkid = "Booking." + bk.id
+        with open("file.json", "r") as f:
+            self.assertIn(bkid, f.read())
+
+
+class TestBooking_to_dict(unittest.TestCase):
+    """Unittests for testing to_dict method of the Booking class."""
+
+    def test_to_dict_type(self):
+        self.assertTrue(dict, type(Booking().to_dict()))
+
+    def test_to_dict_contains_correct_keys(self):
+        bk = Booking()
+        self.assertIn("id", bk.to_dict())
+        self.assertIn("created_at", bk.to_dict())
+        self.assertIn("updated_at", bk.to_dict())
+        self.assertIn("__class__", bk.to_dict())
+
+    def test_to_dict_contains_added_attributes(self):
+        bk = Booking()
+        bk.middle_name = "Holberton"
+        bk.my_number = 98
+        self.assertEqual("Holberton", bk.middle_name)
+        self.assertIn("my_number", bk.to_dict())
+
+    def test_to_dict_datetime_attributes_are_strs(self):
+        bk = Booking()
+        bk_dict = bk.to_dict()
+        self.assertEqual(str, type(bk_dict["id"]))
+        self.assertEqual(str, type(bk_dict["created_at"]))
+        self.assertEqual(str, type(bk_dict["updated_at"]))
+
+    def test_to_dict_output(self):
+        dt = datetime.today()
+        bk = Booking()
+        bk.id = "123456"
+        bk.created_at = bk.updated_at = dt
+        tdict = {
+            'id': '123456',
+            '__class__': 'Booking',
+            'created_at': dt.isoformat(),
+            'updated_at': dt.isoformat(),
+        }
+        self.assertDictEqual(bk.to_dict(), tdict)
+
+    def test_contrast_to_dict_dunder_dict(self):
+        bk = Booking()
+        self.assertNotEqual(bk.to_dict(), bk.__dict__)
+
+    def test_to_dict_with_arg(self):
+        bk = Booking()
+        with self.assertRaises(TypeError):
+            bk.to_dict(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
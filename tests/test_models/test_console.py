@@ -66,8 +66,12 @@ class TestHBNBCommandHelp(unittest.TestCase):
             self.assertEqual(expected, output.getvalue().strip())
 
     def test_help_destroy(self):
-        expected = ("Usage: destroy <class> <id> or <class>.destroy(<id>)\n        "
-                    "Delete a class instance of a given id.")
+        expected = ("Usage: destroy <class> <id> [cascade] or\n       "
+                    "<class>.destroy(<id>[, cascade])\n        "
+                    "Delete a class instance of a given id. With cascade, "
+                    "also delete\n        every instance referencing it and "
+                    "print "
+                    "the deleted keys.")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help destroy"))
             self.assertEqual(expected, output.getvalue().strip())
@@ -101,7 +105,8 @@ class TestHBNBCommandHelp(unittest.TestCase):
     def test_help(self):
         expected = ("Documented commands (type help <topic>):\n"
                     "========================================\n"
-                    "EOF  all  count  create  destroy  help  quit  show  update")
+                    "EOF  count   destroy  memory  show   trace \n"
+                    "all  create  help     quit    stats  update")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help"))
             self.assertEqual(expected, output.getvalue().strip())
@@ -199,3 +204,180 @@ class TestHBNBCommandCreate(unittest.TestCase):
             self.assertGreater(len(output.getvalue().strip()), 0)
             test_key = "Review.{}".format(output.getvalue().strip())
             self.assertIn(test_key, storage.all().keys())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("create Booking"))
+            self.assertGreater(len(output.getvalue().strip()), 0)
+            test_key = "Booking.{}".format(output.getvalue().strip())
+            self.assertIn(test_key, storage.all().keys())
+
+
+class TestHBNBCommandUpdate(unittest.TestCase):
+    """Tests for the update command of the HBNB command interpreter."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def create(self, cls_name):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create {}".format(cls_name))
+            return output.getvalue().strip()
+
+    def test_update_missing_value(self):
+        pid = self.create("Place")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "update Place {} name".format(pid)))
+            self.assertEqual("** value missing **", output.getvalue().strip())
+
+    def test_update_typed_attribute(self):
+        pid = self.create("Place")
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("update Place {} max_guest 4".format(pid))
+        self.assertEqual(4, storage.all()["Place." + pid].max_guest)
+
+    def test_update_refreshes_updated_at(self):
+        pid = self.create("Place")
+        before = storage.all()["Place." + pid].updated_at
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("update Place {} max_guest 4".format(pid))
+        self.assertLess(before, storage.all()["Place." + pid].updated_at)
+
+    def test_update_untyped_attribute(self):
+        pid = self.create("User")
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd('update User {} nick "Bob"'.format(pid))
+        self.assertEqual("Bob", storage.all()["User." + pid].nick)
+
+    def test_update_invalid_value(self):
+        pid = self.create("Place")
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("update Place {} max_guest lots".format(pid))
+            self.assertEqual("** value invalid **", output.getvalue().strip())
+        self.assertEqual(0, storage.all()["Place." + pid].max_guest)
+
+    def test_update_infinite_value(self):
+        pid = self.create("Place")
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("update Place {} max_guest inf".format(pid))
+            self.assertEqual("** value invalid **", output.getvalue().strip())
+        self.assertEqual(0, storage.all()["Place." + pid].max_guest)
+
+    def test_update_dictionary(self):
+        pid = self.create("Place")
+        cmd = 'Place.update("{}", {{"number_rooms": "2", "latitude": 1}})'
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd(cmd.format(pid))
+        obj = storage.all()["Place." + pid]
+        self.assertEqual(2, obj.number_rooms)
+        self.assertEqual(1.0, obj.latitude)
+        self.assertEqual(float, type(obj.latitude))
+
+    def test_update_invalid_stay(self):
+        bid = self.create("Booking")
+        for line in ("update Booking {} check_in 2024-9-1",
+                     'Booking.update("{}", {{"check_in": "2024-09-05", '
+                     '"check_out": "2024-09-01"}})'):
+            with patch("sys.stdout", new=StringIO()) as output:
+                HBNBCommand().onecmd(line.format(bid))
+                self.assertEqual("** value invalid **",
+                                 output.getvalue().strip())
+        self.assertNotIn("check_in", storage.all()["Booking." + bid].__dict__)
+
+    def test_update_property(self):
+        pid = self.create("Place")
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("update Place {} reviews 1".format(pid))
+            self.assertEqual("** value invalid **", output.getvalue().strip())
+        self.assertEqual([], storage.all()["Place." + pid].reviews)
+
+    def test_update_method(self):
+        pid = self.create("Place")
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("update Place {} to_dict 1".format(pid))
+            self.assertEqual("** value invalid **", output.getvalue().strip())
+        self.assertNotIn("to_dict", storage.all()["Place." + pid].__dict__)
+        storage.save()
+
+    def test_update_dictionary_is_not_evaluated(self):
+        pid = self.create("Place")
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(
+                "update Place {} __import__('os')".format(pid))
+            self.assertEqual("** value missing **", output.getvalue().strip())
+
+
+class TestHBNBCommandDestroy(unittest.TestCase):
+    """Tests for the destroy command of the HBNB command interpreter."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def create(self, cls_name, **attrs):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create {}".format(cls_name))
+            oid = output.getvalue().strip()
+        for k, v in attrs.items():
+            setattr(storage.all()["{}.{}".format(cls_name, oid)], k, v)
+        return oid
+
+    def test_destroy_object(self):
+        sid = self.create("State")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("destroy State " + sid))
+            self.assertEqual("", output.getvalue().strip())
+        self.assertNotIn("State." + sid, storage.all())
+
+    def test_destroy_keeps_children_by_default(self):
+        sid = self.create("State")
+        cid = self.create("City", state_id=sid)
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("destroy State " + sid)
+        self.assertIn("City." + cid, storage.all())
+
+    def test_destroy_cascade(self):
+        sid = self.create("State")
+        cid = self.create("City", state_id=sid)
+        uid = self.create("User")
+        pid = self.create("Place", city_id=cid, user_id=uid)
+        rid = self.create("Review", place_id=pid, user_id=uid)
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd('State.destroy("{}", "cascade")'.format(sid))
+            expected = str(["State." + sid, "City." + cid,
+                            "Place." + pid, "Review." + rid])
+            self.assertEqual(expected, output.getvalue().strip())
+        for key in ("State." + sid, "City." + cid, "Place." + pid,
+                    "Review." + rid):
+            self.assertNotIn(key, storage.all())
+        self.assertIn("User." + uid, storage.all())
+        with open("file.json", "r") as f:
+            self.assertNotIn(pid, f.read())
@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+"""
+Unit tests for the AmenityIndex class in models/engine/amenity_index.py.
+
+Test classes:
+    TestAmenityIndex
+    TestAmenityIndexStorage
+"""
+
+import os
+import models
+import unittest
+from console import HBNBCommand
+from models.engine.amenity_index import AmenityIndex, CHUNK_BITS
+from models.amenity import Amenity
+from models.place import Place
+
+
+class TestAmenityIndex(unittest.TestCase):
+    """Tests for the AmenityIndex class on its own."""
+
+    def setUp(self):
+        self.index = AmenityIndex()
+        self.index.add("Place.1", ["wifi", "pool"])
+        self.index.add("Place.2", ["wifi", "parking"])
+        self.index.add("Place.3", ["wifi", "parking", "pool"])
+        self.index.add("Place.4", [])
+
+    def test_len(self):
+        self.assertEqual(4, len(self.index))
+
+    def test_query_all_places(self):
+        self.assertEqual(["Place.1", "Place.2", "Place.3", "Place.4"],
+                         self.index.query())
+
+    def test_query_and(self):
+        self.assertEqual(["Place.3"],
+                         self.index.query(all_of=["wifi", "parking", "pool"]))
+
+    def test_query_or(self):
+        self.assertEqual(["Place.1", "Place.3"],
+                         self.index.query(any_of=["pool", "sauna"]))
+
+    def test_query_not(self):
+        self.assertEqual(["Place.2", "Place.4"],
+                         self.index.query(none_of=["pool"]))
+
+    def test_query_combined(self):
+        self.assertEqual(["Place.2"],
+                         self.index.query(all_of=["wifi"],
+                                          any_of=["parking"],
+                                          none_of=["pool"]))
+
+    def test_query_unknown_amenity(self):
+        self.assertEqual([], self.index.query(all_of=["sauna"]))
+
+    def test_add_replaces_amenities(self):
+        self.index.add("Place.1", ["parking"])
+        self.assertEqual(["Place.2", "Place.3"],
+                         self.index.query(all_of=["wifi"]))
+        self.assertEqual(["Place.1", "Place.2", "Place.3"],
+                         self.index.query(all_of=["parking"]))
+
+    def test_remove_and_reuse_position(self):
+        self.index.remove("Place.1")
+        self.index.remove("Place.1")
+        self.assertEqual(["Place.3"], self.index.query(all_of=["pool"]))
+        self.index.add("Place.5", ["pool"])
+        self.assertEqual(["Place.5", "Place.3"],
+                         self.index.query(all_of=["pool"]))
+        self.assertEqual(4, len(self.index))
+
+    def test_query_across_chunks(self):
+        index = AmenityIndex()
+        keys = ["Place.{}".format(i) for i in range(CHUNK_BITS * 2 + 5)]
+        for i, key in enumerate(keys):
+            index.add(key, ["pool"] if i % 3 == 0 else ["wifi"])
+        self.assertEqual(keys, index.query())
+        self.assertEqual(keys[::3], index.query(all_of=["pool"]))
+        self.assertEqual(keys[::3], index.query(none_of=["wifi"]))
+        index.remove(keys[-1])
+        index.remove(keys[CHUNK_BITS])
+        self.assertEqual(len(keys) - 2, len(index.query()))
+        self.assertNotIn(keys[-1], index.query(any_of=["pool", "wifi"]))
+
+    def test_sync(self):
+        self.assertFalse(self.index.sync("Place.1", ["pool", "wifi"]))
+        self.assertTrue(self.index.sync("Place.1", ["pool"]))
+        self.assertEqual(["Place.2", "Place.3"],
+                         self.index.query(all_of=["wifi"]))
+
+
+class TestAmenityIndexStorage(unittest.TestCase):
+    """Tests for the amenity index maintained by FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        self.wifi = Amenity()
+        self.pool = Amenity()
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_set_amenity_ids(self):
+        pl = Place()
+        pl.amenity_ids = [self.wifi.id, self.pool.id]
+        self.assertEqual([pl], models.storage.places_with_amenities(
+            all_of=[self.wifi.id, self.pool.id]))
+
+    def test_in_place_change_synced_on_save(self):
+        pl = Place()
+        pl.amenity_ids = [self.wifi.id]
+        pl.amenity_ids.append(self.pool.id)
+        self.assertEqual([], models.storage.places_with_amenities(
+            all_of=[self.pool.id]))
+        pl.save()
+        self.assertEqual([pl], models.storage.places_with_amenities(
+            all_of=[self.pool.id]))
+
+    def test_reloaded_place_is_indexed(self):
+        pl = Place()
+        pl.amenity_ids = [self.wifi.id]
+        models.storage.save()
+        models.storage.reload()
+        found = models.storage.places_with_amenities(all_of=[self.wifi.id])
+        self.assertEqual([pl.id], [p.id for p in found])
+        self.assertIsNot(pl, found[0])
+
+    def test_deleted_place_is_unindexed(self):
+        pl = Place()
+        pl.amenity_ids = [self.wifi.id]
+        models.storage.delete(pl)
+        self.assertEqual([], models.storage.places_with_amenities(
+            all_of=[self.wifi.id]))
+
+    def test_console_update(self):
+        pl = Place()
+        HBNBCommand().onecmd("update Place {} amenity_ids ['{}']".format(
+            pl.id, self.pool.id))
+        self.assertEqual([self.pool.id], pl.amenity_ids)
+        self.assertEqual([pl], models.storage.places_with_amenities(
+            any_of=[self.pool.id]))
+
+
+if __name__ == "__main__":
+    unittest.main()
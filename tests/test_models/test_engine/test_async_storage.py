@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+Unit tests for the asyncio facade in models/engine/async_storage.py.
+
+Test classes:
+    TestAsyncStorage
+"""
+
+import asyncio
+import json
+import os
+import models
+import threading
+import unittest
+from unittest import mock
+from models.engine.async_storage import AsyncStorage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+
+
+class TestAsyncStorage(unittest.TestCase):
+    """Tests for the AsyncStorage class."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        for name in ("file.json", "file.json.cache"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        self.astorage = AsyncStorage(models.storage)
+
+    def test_aget(self):
+        st = State()
+
+        async def run():
+            return (await self.astorage.aget("State", st.id),
+                    await self.astorage.aget("State", "missing"))
+        self.assertEqual((st, None), asyncio.run(run()))
+
+    def test_asave(self):
+        st = State()
+        asyncio.run(self.astorage.asave())
+        with open("file.json") as f:
+            self.assertIn("State." + st.id, json.load(f))
+
+    def test_concurrent_asave_is_batched(self):
+        State()
+
+        async def run():
+            await asyncio.gather(*(self.astorage.asave() for _ in range(10)))
+        with mock.patch.object(FileStorage, "save_async",
+                               wraps=models.storage.save_async) as save:
+            asyncio.run(run())
+        self.assertEqual(1, save.call_count)
+
+    def test_asave_snapshots_off_the_loop(self):
+        State()
+        threads = []
+        save_async = models.storage.save_async
+
+        def save():
+            threads.append(threading.current_thread())
+            return save_async()
+
+        async def run():
+            await asyncio.gather(*(self.astorage.asave() for _ in range(3)))
+        with mock.patch.object(FileStorage, "save_async", side_effect=save):
+            asyncio.run(run())
+        self.assertEqual(1, len(threads))
+        self.assertIsNot(threading.main_thread(), threads[0])
+
+    def test_asave_error(self):
+        async def run():
+            await self.astorage.asave()
+        with mock.patch.object(FileStorage, "save_async",
+                               side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                asyncio.run(run())
+
+    def test_query(self):
+        st1 = State()
+        st1.name = "Utah"
+        st2 = State()
+        pl = Place()
+
+        async def run(**kwargs):
+            return [obj async for obj in self.astorage.query(**kwargs)]
+        states = asyncio.run(run(cls_name="State", batch_size=1))
+        self.assertIn(st1, states)
+        self.assertIn(st2, states)
+        self.assertNotIn(pl, states)
+        utah = asyncio.run(run(cls_name="State",
+                               where=lambda o: getattr(o, "name", "") ==
+                               "Utah"))
+        self.assertEqual([st1], utah)
+
+    def test_aplaces_with_amenities(self):
+        pl = Place()
+        pl.amenity_ids = ["async-amenity"]
+
+        async def run():
+            return await self.astorage.aplaces_with_amenities(
+                all_of=["async-amenity"])
+        self.assertEqual([pl], asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    unittest.main()
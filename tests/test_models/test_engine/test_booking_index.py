@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+"""
+Unit tests for the booking index in models/engine/booking_index.py.
+
+Test classes:
+    TestIntervalTree
+    TestBookingIndex
+    TestAvailability
+"""
+
+import os
+import random
+import models
+import unittest
+from models.engine.booking_index import BookingIndex, IntervalTree
+from models.engine.file_storage import FileStorage
+from models.booking import Booking
+from models.city import City
+from models.place import Place
+
+
+class TestIntervalTree(unittest.TestCase):
+    """Tests for IntervalTree against a brute force search."""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        tree = IntervalTree()
+        intervals = {}
+        for i in range(400):
+            start = rng.randrange(1000)
+            intervals[i] = (start, start + rng.randrange(1, 40))
+            tree.add(intervals[i][0], intervals[i][1], i)
+        for i in rng.sample(sorted(intervals), 150):
+            self.assertTrue(tree.remove(intervals[i][0], intervals[i][1], i))
+            del intervals[i]
+        self.assertFalse(tree.remove(0, 1, "missing"))
+        self.assertEqual(len(intervals), len(tree))
+        for _ in range(300):
+            start = rng.randrange(1050)
+            end = start + rng.randrange(1, 30)
+            expected = sorted(i for i, (s, e) in intervals.items()
+                              if s < end and e > start)
+            self.assertEqual(expected, sorted(tree.overlapping(start, end)))
+            self.assertEqual(bool(expected), tree.overlaps(start, end))
+
+    def test_half_open(self):
+        tree = IntervalTree()
+        tree.add("2026-03-01", "2026-03-05", "a")
+        self.assertFalse(tree.overlaps("2026-03-05", "2026-03-07"))
+        self.assertFalse(tree.overlaps("2026-02-25", "2026-03-01"))
+        self.assertTrue(tree.overlaps("2026-03-04", "2026-03-07"))
+        self.assertFalse(IntervalTree().overlaps(0, 1))
+
+
+class TestBookingIndex(unittest.TestCase):
+    """Tests for BookingIndex."""
+
+    def test_add_replace_remove(self):
+        index = BookingIndex()
+        index.add("Booking.1", "p", "2026-01-01", "2026-01-04")
+        index.add("Booking.2", "p", "2026-01-10", "2026-01-12")
+        self.assertEqual(["Booking.1"],
+                         index.overlapping("p", "2026-01-03", "2026-01-05"))
+        self.assertFalse(index.is_free("p", "2026-01-03", "2026-01-05"))
+        index.add("Booking.1", "p", "2026-02-01", "2026-02-04")
+        self.assertTrue(index.is_free("p", "2026-01-03", "2026-01-05"))
+        index.remove("Booking.1")
+        index.remove("Booking.1")
+        self.assertEqual(1, len(index))
+        self.assertTrue(index.is_free("q", "2026-01-10", "2026-01-12"))
+
+    def test_invalid_stays_not_indexed(self):
+        index = BookingIndex()
+        index.add("Booking.1", "p", "", "")
+        index.add("Booking.2", "p", "2026-01-04", "2026-01-01")
+        index.add("Booking.3", "", "2026-01-01", "2026-01-04")
+        self.assertEqual(0, len(index))
+
+    def test_bad_dates_are_rejected(self):
+        index = BookingIndex()
+        index.add("Booking.1", "p", "2024-09-01", "2024-10-01")
+        with self.assertRaises(ValueError):
+            index.add("Booking.1", "p", "2024-9-1", "2024-10-1")
+        self.assertFalse(index.is_free("p", "2024-09-20", "2024-09-21"))
+        with self.assertRaises(ValueError):
+            index.is_free("p", "next week", "tomorrow")
+
+
+class TestAvailability(unittest.TestCase):
+    """Tests for the availability queries of FileStorage."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        for name in ("file.json", "file.json.cache", "file.json.idx"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        self.city = City()
+        self.places = [Place() for _ in range(3)]
+        for pl in self.places:
+            pl.city_id = self.city.id
+        self.booking = self.book(self.places[0], "2026-07-01", "2026-07-08")
+
+    def book(self, place, check_in, check_out):
+        """Return a new Booking of place."""
+        bk = Booking()
+        bk.place_id = place.id
+        bk.check_in = check_in
+        bk.check_out = check_out
+        return bk
+
+    def free(self, check_in, check_out):
+        """Return the ids of the free places of the city."""
+        return [pl.id for pl in models.storage.available_places(
+            self.city.id, check_in, check_out)]
+
+    def test_available_places(self):
+        ids = sorted(pl.id for pl in self.places)
+        others = sorted(pl.id for pl in self.places[1:])
+        self.assertEqual(others, self.free("2026-07-07", "2026-07-09"))
+        self.assertEqual(ids, self.free("2026-07-08", "2026-07-09"))
+        self.book(self.places[1], "2026-06-20", "2026-07-02")
+        self.assertEqual([self.places[2].id],
+                         self.free("2026-06-30", "2026-07-03"))
+
+    def test_changes_are_indexed(self):
+        pl = self.places[0]
+        self.assertFalse(models.storage.is_available(
+            pl.id, "2026-07-02", "2026-07-03"))
+        self.booking.check_in = "2026-07-05"
+        self.assertTrue(models.storage.is_available(
+            pl.id, "2026-07-02", "2026-07-03"))
+        self.booking.place_id = self.places[1].id
+        self.assertEqual([], models.storage.bookings_overlapping(
+            pl.id, "2026-07-05", "2026-07-06"))
+        self.assertEqual([self.booking], models.storage.bookings_overlapping(
+            self.places[1].id, "2026-07-05", "2026-07-06"))
+
+    def test_cascade(self):
+        removed = models.storage.delete(self.places[0], cascade=True)
+        self.assertIn("Booking." + self.booking.id, removed)
+        self.assertTrue(models.storage.is_available(
+            self.places[0].id, "2026-07-02", "2026-07-03"))
+
+    def test_reload(self):
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertFalse(models.storage.is_available(
+            self.places[0].id, "2026-07-02", "2026-07-03"))
+
+    def test_invalid_stay(self):
+        with self.assertRaises(ValueError):
+            models.storage.available_places(self.city.id, "2026-07-02",
+                                            "2026-07-02")
+        with self.assertRaises(ValueError):
+            models.storage.is_available(self.places[0].id, "next week",
+                                        "tomorrow")
+
+    def test_invalid_date_is_not_set(self):
+        with self.assertRaises(ValueError):
+            self.booking.check_out = "2026-7-9"
+        self.assertEqual("2026-07-08", self.booking.check_out)
+        self.assertFalse(models.storage.is_available(
+            self.places[0].id, "2026-07-07", "2026-07-09"))
+
+
+if __name__ == "__main__":
+    unittest.main()
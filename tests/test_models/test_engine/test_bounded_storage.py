@@ -0,0 +1,189 @@
+#!/usr/bin/python3
+"""
+Unit tests for memory-bounded storage in models/engine/bounded_storage.py.
+
+Test classes:
+    TestBoundedStorage
+"""
+
+import gc
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import models
+import unittest
+from unittest import mock
+from models.engine.bounded_storage import BoundedStorage
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+
+class TestBoundedStorage(unittest.TestCase):
+    """Tests for BoundedStorage."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="hbnb-bounded-")
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "file.json")
+        self.storage = self.bounded(max_objects=5)
+
+    def bounded(self, **limits):
+        """Return a BoundedStorage of self.path, used as models.storage."""
+        storage = BoundedStorage(self.path, **limits)
+        patcher = mock.patch.object(models, "storage", storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return storage
+
+    def fill(self, n):
+        """Store and save n States, return their ids."""
+        ids = []
+        for i in range(n):
+            st = State()
+            st.name = "s{}".format(i)
+            ids.append(st.id)
+        self.storage.save()
+        return ids
+
+    def test_save_writes_json(self):
+        ids = self.fill(3)
+        with open(self.path) as f:
+            records = json.load(f)
+        self.assertEqual({"State." + oid for oid in ids}, set(records))
+
+    def test_cache_is_bounded(self):
+        ids = self.fill(20)
+        gc.collect()
+        storage = self.bounded(max_objects=5)
+        for oid in ids:
+            self.assertEqual(oid, storage.get("State", oid).id)
+        info = storage.cache_info()
+        self.assertEqual(5, info["objects"])
+        self.assertEqual(20, info["misses"])
+        storage.get("State", ids[-1])
+        self.assertEqual(1, storage.cache_info()["hits"])
+
+    def test_byte_budget(self):
+        ids = self.fill(10)
+        storage = self.bounded(max_objects=None, max_bytes=300)
+        for oid in ids:
+            storage.get("State", oid)
+        info = storage.cache_info()
+        self.assertLessEqual(info["bytes"], 300)
+        self.assertGreater(info["objects"], 0)
+
+    def test_update_of_cold_object(self):
+        ids = self.fill(10)
+        storage = self.bounded(max_objects=2)
+        st = storage.get("State", ids[0])
+        for oid in ids[1:]:
+            storage.get("State", oid)
+        self.assertIs(st, storage.get("State", ids[0]))
+        st.name = "Utah"
+        storage.save()
+        storage = self.bounded(max_objects=2)
+        self.assertEqual("Utah", storage.get("State", ids[0]).name)
+        self.assertEqual("s9", storage.get("State", ids[9]).name)
+        self.assertEqual(10, storage.count("State"))
+
+    def test_all_and_count(self):
+        ids = self.fill(6)
+        cy = City()
+        self.storage.delete(self.storage.get("State", ids[0]))
+        objects = self.storage.all()
+        self.assertEqual(6, len(objects))
+        self.assertEqual(5, self.storage.count("State"))
+        self.assertEqual(sorted(["State." + oid for oid in ids[1:]] +
+                                ["City." + cy.id]), sorted(objects))
+        self.assertIs(cy, objects["City." + cy.id])
+        with self.assertRaises(KeyError):
+            objects["State." + ids[0]]
+        self.storage.save()
+        self.assertEqual(6, self.bounded().count())
+
+    def test_cascade(self):
+        pl = Place()
+        reviews = [Review() for _ in range(3)]
+        for rv in reviews:
+            rv.place_id = pl.id
+        self.storage.save()
+        storage = self.bounded(max_objects=1)
+        removed = storage.delete(storage.get("Place", pl.id), cascade=True)
+        self.assertEqual("Place." + pl.id, removed[0])
+        self.assertEqual(sorted("Review." + rv.id for rv in reviews),
+                         sorted(removed[1:]))
+        self.assertEqual(0, storage.count())
+
+    def test_children(self):
+        st = State()
+        cities = [City() for _ in range(4)]
+        for cy in cities:
+            cy.state_id = st.id
+        self.storage.save()
+        storage = self.bounded(max_objects=1)
+        parent = storage.get("State", st.id)
+        self.assertEqual(sorted(cy.id for cy in cities),
+                         sorted(cy.id for cy in parent.cities))
+
+    def test_iter(self):
+        ids = sorted(self.fill(12))
+        storage = self.bounded(max_objects=3)
+        st = State()
+        storage.delete(storage.get("State", ids[0]))
+        cursor = storage.iter("State", batch_size=5)
+        batches = [[obj.id for obj in batch] for batch in cursor.batches()]
+        self.assertEqual([5, 5, 2], [len(batch) for batch in batches])
+        self.assertEqual(sorted(ids[1:] + [st.id]), sum(batches, []))
+        self.assertLessEqual(storage.cache_info()["objects"], 3)
+        rest = storage.iter("State", after="State." + ids[5])
+        self.assertEqual(sorted(oid for oid in ids[1:] + [st.id]
+                                if oid > ids[5]), [s.id for s in rest])
+
+    def test_select(self):
+        places = [Place() for _ in range(8)]
+        for i, pl in enumerate(places):
+            pl.price_by_night = i % 3
+        self.storage.save()
+        storage = self.bounded(max_objects=2)
+        found = storage.select("Place", "-price_by_night", 4)
+        expected = sorted(places, key=lambda p: (-p.price_by_night, p.id))
+        self.assertEqual([p.id for p in expected[:4]], [p.id for p in found])
+        self.assertEqual(sorted(p.id for p in places)[:3],
+                         [p.id for p in storage.select("Place", limit=3)])
+
+    def test_reports(self):
+        ids = self.fill(8)
+        storage = self.bounded(max_objects=3)
+        City()
+        report = storage.stats_report()
+        self.assertEqual({"City": 1, "State": 8}, report["objects"])
+        self.assertEqual(1, report["cache"]["dirty"])
+        for oid in ids:
+            storage.get("State", oid)
+        memory = storage.memory_report()
+        self.assertEqual(1, memory["classes"]["City"]["count"])
+        self.assertEqual(3, memory["classes"]["State"]["count"])
+        self.assertIn("cache", memory["storage"])
+
+    def test_console_process(self):
+        ids = self.fill(3)
+        env = dict(os.environ, HBNB_MAX_OBJECTS="2", PYTHONPATH=ROOT)
+        out = subprocess.run(
+            [sys.executable, os.path.join(ROOT, "console.py")],
+            input="show State {}\ncount State\n".format(ids[1]),
+            cwd=self.directory, env=env, capture_output=True, text=True,
+            check=True).stdout
+        self.assertIn(ids[1], out)
+        self.assertIn("3", out.split())
+
+
+if __name__ == "__main__":
+    unittest.main()
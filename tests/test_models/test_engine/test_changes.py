@@ -0,0 +1,184 @@
+#!/usr/bin/python3
+"""
+Unit tests for the change feed in models/engine/changes.py.
+
+Test classes:
+    TestChangeFeed
+    TestChangeFeedStorage
+"""
+
+import os
+import models
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from console import HBNBCommand
+from models.engine.changes import ChangeFeed, feed
+from models.city import City
+from models.place import Place
+from models.state import State
+
+
+class TestChangeFeed(unittest.TestCase):
+    """Tests for numbering, publishing and logging events."""
+
+    path = "changes_test.log"
+
+    def tearDown(self):
+        try:
+            os.remove(self.path)
+        except IOError:
+            pass
+
+    def test_inactive(self):
+        self.assertFalse(ChangeFeed().active)
+        self.assertTrue(ChangeFeed(self.path).active)
+
+    def test_subscribe(self):
+        cf = ChangeFeed()
+        events = []
+        token = cf.subscribe(events.append)
+        self.assertTrue(cf.active)
+        cf.emit("create", "State", "s-1", {"name": "Ohio"})
+        cf.emit("delete", "State", "s-1")
+        cf.unsubscribe(token)
+        cf.emit("delete", "State", "s-2")
+        self.assertEqual([1, 2], [e["seq"] for e in events])
+        self.assertEqual(("create", "State", "s-1", {"name": "Ohio"}),
+                         (events[0]["op"], events[0]["class"],
+                          events[0]["id"], events[0]["fields"]))
+        self.assertEqual(3, cf.seq)
+
+    def test_log_and_resume(self):
+        cf = ChangeFeed(self.path)
+        for i in range(5):
+            cf.emit("create", "State", "s-{}".format(i))
+        cf.close()
+        self.assertEqual(["s-3", "s-4"], [e["id"] for e in cf.read(3)])
+        cf = ChangeFeed(self.path)
+        self.assertEqual(5, cf.seq)
+        events = []
+        cf.subscribe(events.append, after=3)
+        cf.emit("delete", "State", "s-0")
+        cf.close()
+        self.assertEqual([4, 5, 6], [e["seq"] for e in events])
+
+    def test_partial_line_is_skipped(self):
+        cf = ChangeFeed(self.path)
+        cf.emit("create", "State", "s-1")
+        cf.close()
+        with open(self.path, "a") as f:
+            f.write('{"seq": 2, "op"')
+        cf = ChangeFeed(self.path)
+        self.assertEqual(1, cf.seq)
+        cf.emit("create", "State", "s-2")
+        cf.close()
+        self.assertEqual([1, 2], [e["seq"] for e in cf.read()])
+
+
+class TestChangeFeedStorage(unittest.TestCase):
+    """Tests for the events emitted by storage."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        for name in ("file.json", "file.json.cache"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        self.events = []
+        token = feed.subscribe(self.events.append)
+        self.addCleanup(feed.unsubscribe, token)
+
+    def ops(self):
+        return [(e["op"], e["class"], e["id"]) for e in self.events]
+
+    def test_create(self):
+        st = State()
+        self.assertEqual([("create", "State", st.id)], self.ops())
+        self.assertEqual(st.to_dict()["created_at"],
+                         self.events[0]["fields"]["created_at"])
+        self.assertNotIn("__class__", self.events[0]["fields"])
+
+    def test_save_emits_changed_fields(self):
+        st = State()
+        st.name = "Ohio"
+        st.save()
+        self.assertEqual([("create", "State", st.id),
+                          ("update", "State", st.id)], self.ops())
+        self.assertEqual({"name": "Ohio",
+                          "updated_at": st.updated_at.isoformat()},
+                         self.events[1]["fields"])
+        models.storage.save()
+        self.assertEqual(2, len(self.events))
+
+    def test_amenity_ids_changed_in_place(self):
+        pl = Place()
+        pl.amenity_ids = ["a-1"]
+        models.storage.save()
+        del self.events[:]
+        pl.amenity_ids.append("a-2")
+        models.storage.save()
+        self.assertEqual([("update", "Place", pl.id)], self.ops())
+        self.assertEqual({"amenity_ids": ["a-1", "a-2"]},
+                         self.events[0]["fields"])
+
+    def test_sequence_is_ordered(self):
+        State()
+        State()
+        seqs = [e["seq"] for e in self.events]
+        self.assertEqual(seqs[0] + 1, seqs[1])
+
+    def test_console_update(self):
+        st = State()
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd('update State {} name "Utah"'.format(st.id))
+        self.assertEqual(("update", "State", st.id), self.ops()[-1])
+        self.assertEqual({"name": "Utah",
+                          "updated_at": st.updated_at.isoformat()},
+                         self.events[-1]["fields"])
+
+    def test_console_destroy_cascade(self):
+        st = State()
+        cy = City()
+        cy.state_id = st.id
+        del self.events[:]
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("destroy State {} cascade".format(st.id))
+        self.assertEqual([("delete", "State", st.id),
+                          ("delete", "City", cy.id)], self.ops())
+
+    def test_replaced_instance(self):
+        st = State()
+        st.name = "Ohio"
+        models.storage.save()
+        del self.events[:]
+        copy = State(**st.to_dict())
+        copy.name = "Iowa"
+        models.storage.new(copy)
+        self.assertEqual([("update", "State", st.id)], self.ops())
+        self.assertEqual({"name": "Iowa"}, self.events[0]["fields"])
+
+    def test_reload_emits_nothing(self):
+        State()
+        models.storage.save()
+        del self.events[:]
+        models.storage.reload()
+        self.assertEqual([], self.events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""
+Unit tests for storage cursors in models/engine/cursor.py.
+
+Test classes:
+    TestCursor
+"""
+
+import os
+import models
+import unittest
+from models.engine.cursor import Cursor
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.state import State
+
+
+class TestCursor(unittest.TestCase):
+    """Tests for walking FileStorage with iter()."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        for name in ("file.json", "file.json.cache", "file.json.idx"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.states = [State() for _ in range(10)]
+        self.cities = [City() for _ in range(3)]
+        self.keys = sorted("State." + st.id for st in self.states)
+
+    def test_key_order(self):
+        keys = ["{}.{}".format(obj.__class__.__name__, obj.id)
+                for obj in models.storage.iter(batch_size=4)]
+        self.assertEqual(sorted(models.storage.all()), keys)
+
+    def test_class_and_batches(self):
+        cursor = models.storage.iter("State", batch_size=4)
+        sizes = [len(batch) for batch in cursor.batches()]
+        self.assertEqual([4, 4, 2], sizes)
+        self.assertEqual(self.keys[-1], cursor.position)
+        self.assertEqual([], list(models.storage.iter("Place")))
+
+    def test_resume(self):
+        cursor = models.storage.iter("State", batch_size=3)
+        first = []
+        for st in cursor:
+            first.append(st)
+            if len(first) == 5:
+                break
+        self.assertEqual(self.keys[4], cursor.position)
+        rest = list(models.storage.iter("State", after=cursor.position))
+        self.assertEqual(self.keys, ["State." + st.id for st in first + rest])
+
+    def test_concurrent_changes(self):
+        seen = []
+        for st in models.storage.iter("State", batch_size=2):
+            seen.append("State." + st.id)
+            if len(seen) == 3:
+                gone = models.storage.get("State", self.keys[6][6:])
+                models.storage.delete(gone)
+                models.storage.new(State(**dict(
+                    self.states[0].to_dict(), id="~")))
+        expected = [key for key in self.keys if key != self.keys[6]]
+        self.assertEqual(expected + ["State.~"], seen)
+
+    def test_added_then_deleted(self):
+        list(models.storage.iter("State"))
+        added = [State() for _ in range(3)]
+        models.storage.delete(added[1])
+        models.storage.delete(self.states[0])
+        expected = sorted(self.keys[:] + ["State." + added[0].id,
+                                          "State." + added[2].id])
+        expected.remove("State." + self.states[0].id)
+        self.assertEqual(expected, ["State." + st.id for st in
+                                    models.storage.iter("State")])
+
+    def test_objects_changed_directly(self):
+        seen = []
+        for st in models.storage.iter("State", batch_size=2):
+            seen.append("State." + st.id)
+            if len(seen) == 3:
+                objects = models.storage.all()
+                objects.pop(self.keys[6])
+                objects["State.~"] = State(**dict(
+                    self.states[0].to_dict(), id="~"))
+        expected = [key for key in self.keys if key != self.keys[6]]
+        self.assertEqual(expected + ["State.~"], seen)
+
+    def test_page_under_read_lock(self):
+        models.storage.set_thread_safe()
+        self.addCleanup(models.storage.set_thread_safe, False)
+        cursor = models.storage.iter("State", batch_size=4)
+        self.assertEqual(4, len(next(cursor.batches())))
+        with FileStorage._FileStorage__lock.read():
+            self.assertEqual(4, len(next(cursor.batches())))
+
+    def test_bad_batch_size(self):
+        with self.assertRaises(ValueError):
+            Cursor(lambda after, n: [], batch_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,13 +5,19 @@ Unit tests for FileStorage class in models/engine/file_storage.py.
 Test classes:
     TestFileStorageInitialization
     TestFileStorageMethods
+    TestFileStorageRelations
+    TestFileStorageLazyLoading
+    TestFileStorageSnapshots
 """
 
 import os
+import sys
 import json
+import subprocess
 import models
 import unittest
 from datetime import datetime
+from unittest import mock
 from models.base_model import BaseModel
 from models.engine.file_storage import FileStorage
 from models.user import User
@@ -166,5 +172,267 @@ class TestFileStorageMethods(unittest.TestCase):
             models.storage.reload(None)
 
 
+class TestFileStorageRelations(unittest.TestCase):
+    """Tests for the reverse lookups behind navigation properties."""
+
+    def test_state_cities(self):
+        st = State()
+        cy1 = City()
+        cy2 = City()
+        cy1.state_id = st.id
+        cy2.state_id = st.id
+        self.assertEqual([cy1, cy2], st.cities)
+
+    def test_city_places_and_place_reviews(self):
+        cy = City()
+        pl = Place()
+        rv = Review()
+        pl.city_id = cy.id
+        rv.place_id = pl.id
+        self.assertEqual([pl], cy.places)
+        self.assertEqual([rv], pl.reviews)
+
+    def test_user_places_and_reviews(self):
+        us = User()
+        pl = Place()
+        rv = Review()
+        pl.user_id = us.id
+        rv.user_id = us.id
+        self.assertEqual([pl], us.places)
+        self.assertEqual([rv], us.reviews)
+
+    def test_reference_moves_to_new_parent(self):
+        st1 = State()
+        st2 = State()
+        cy = City()
+        cy.state_id = st1.id
+        cy.state_id = st2.id
+        self.assertEqual([], st1.cities)
+        self.assertEqual([cy], st2.cities)
+
+    def test_reloaded_objects_are_linked(self):
+        st = State()
+        cy = City(id="c-1", state_id=st.id, created_at=st.to_dict()[
+            "created_at"], updated_at=st.to_dict()["updated_at"])
+        self.assertEqual([], st.cities)
+        models.storage.new(cy)
+        self.assertEqual([cy], st.cities)
+
+    def test_deleted_objects_are_skipped(self):
+        st = State()
+        cy = City()
+        cy.state_id = st.id
+        del models.storage.all()["City." + cy.id]
+        self.assertEqual([], st.cities)
+
+    def test_delete(self):
+        st = State()
+        cy = City()
+        cy.state_id = st.id
+        self.assertEqual(["State." + st.id], models.storage.delete(st))
+        self.assertNotIn("State." + st.id, models.storage.all())
+        self.assertIn("City." + cy.id, models.storage.all())
+
+    def test_delete_cascade_user(self):
+        us = User()
+        pl = Place()
+        rv1 = Review()
+        rv2 = Review()
+        pl.user_id = us.id
+        rv1.place_id = pl.id
+        rv2.user_id = us.id
+        removed = models.storage.delete(us, cascade=True)
+        self.assertEqual(["User." + us.id, "Place." + pl.id,
+                          "Review." + rv2.id, "Review." + rv1.id], removed)
+
+    def test_delete_missing_object(self):
+        self.assertEqual([], models.storage.delete(
+            State(id="x", created_at=datetime.today().isoformat(),
+                  updated_at=datetime.today().isoformat())))
+
+    def test_navigation_not_serialized(self):
+        st = State()
+        self.assertNotIn("cities", st.to_dict())
+
+
+class TestFileStorageLazyLoading(unittest.TestCase):
+    """Tests for loading the storage file on first use."""
+
+    def run_python(self, code):
+        """Run code in a fresh interpreter and return its output."""
+        return subprocess.run([sys.executable, "-c", code], check=True,
+                              capture_output=True, text=True).stdout.strip()
+
+    def test_import_does_not_load(self):
+        code = ("import models\n"
+                "from models.place import Place\n"
+                "print(models.storage._FileStorage__loaded)")
+        self.assertEqual("False", self.run_python(code))
+
+    def test_first_access_loads(self):
+        code = ("import models\n"
+                "n = len(models.storage._FileStorage__objects)\n"
+                "m = len(models.storage.all())\n"
+                "print(n, models.storage._FileStorage__loaded, m)")
+        with open("file.json") as f:
+            count = len(json.load(f))
+        self.assertEqual("0 True {}".format(count), self.run_python(code))
+
+    def test_new_loads_before_registering(self):
+        code = ("import models\n"
+                "from models.engine.file_storage import FileStorage\n"
+                "FileStorage._FileStorage__file_path = 'lazy_test.json'\n"
+                "from models.state import State\n"
+                "State(); models.storage.save()\n"
+                "FileStorage._FileStorage__objects = {}\n"
+                "FileStorage._FileStorage__loaded = False\n"
+                "State(); models.storage.save()\n"
+                "print(len(models.storage.all()))")
+        try:
+            self.assertEqual("2", self.run_python(code))
+        finally:
+            for name in ("lazy_test.json", "lazy_test.json.cache",
+                         "lazy_test.json.idx"):
+                if os.path.exists(name):
+                    os.remove(name)
+
+    def test_get_and_count_read_the_index(self):
+        setup = ("import models\n"
+                 "from models.engine.file_storage import FileStorage\n"
+                 "FileStorage._FileStorage__file_path = 'lazy_test.json'\n"
+                 "from models.state import State\n")
+        ids = self.run_python(
+            setup + "sts = [State() for _ in range(3)]\n"
+            "models.storage.save()\n"
+            "print(' '.join(st.id for st in sts))").split()
+        try:
+            out = self.run_python(
+                setup + "st = models.storage.get('State', {!r})\n"
+                "print(st.id, models.storage.count('State'),\n"
+                "      models.storage.count('City'),\n"
+                "      models.storage.get('State', 'nope'),\n"
+                "      models.storage._FileStorage__loaded)\n"
+                "st.name = 'Ohio'\n"
+                "models.storage.save()\n"
+                "print(len(models.storage.all()))".format(ids[1]))
+            self.assertEqual("{} 3 0 None False\n3".format(ids[1]), out)
+            out = self.run_python(
+                setup + "print(models.storage.get('State', {!r}).name)"
+                .format(ids[1]))
+            self.assertEqual("Ohio", out)
+        finally:
+            for name in ("lazy_test.json", "lazy_test.json.cache",
+                         "lazy_test.json.idx"):
+                if os.path.exists(name):
+                    os.remove(name)
+
+
+class TestFileStorageSnapshots(unittest.TestCase):
+    """Tests for copy-on-write snapshots and background saving."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        for name in ("file.json", "file.json.cache"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_unchanged_records_are_shared(self):
+        st = State()
+        cy = City()
+        snap1 = models.storage.freeze()
+        snap2 = models.storage.freeze()
+        self.assertIs(snap1["State." + st.id], snap2["State." + st.id])
+        self.assertEqual(st.to_dict(), snap1["State." + st.id])
+        self.assertEqual(cy.to_dict(), snap1["City." + cy.id])
+
+    def test_changed_record_is_copied(self):
+        st = State()
+        snap1 = models.storage.freeze()
+        st.name = "Texas"
+        snap2 = models.storage.freeze()
+        self.assertNotIn("name", snap1["State." + st.id])
+        self.assertEqual("Texas", snap2["State." + st.id]["name"])
+
+    def test_records_do_not_share_lists(self):
+        pl = Place()
+        pl.amenity_ids = ["a-1"]
+        snap1 = models.storage.freeze()
+        pl.amenity_ids.append("a-2")
+        snap2 = models.storage.freeze()
+        self.assertEqual(["a-1"], snap1["Place." + pl.id]["amenity_ids"])
+        self.assertEqual(["a-1", "a-2"],
+                         snap2["Place." + pl.id]["amenity_ids"])
+
+    def test_unchanged_records_are_not_encoded_again(self):
+        st = State()
+        State()
+        models.storage.save()
+        st.name = "Ohio"
+        dumps = json.dumps
+        with mock.patch("models.engine.file_storage.json.dumps",
+                        side_effect=dumps) as encode:
+            models.storage.save()
+        records = [c for c in encode.call_args_list
+                   if isinstance(c.args[0], dict)]
+        self.assertEqual(1, len(records))
+        with open("file.json") as f:
+            self.assertEqual("Ohio", json.load(f)["State." + st.id]["name"])
+
+    def test_untracked_changes_are_saved(self):
+        st = State()
+        st.tags = ["a"]
+        models.storage.save()
+        st.__dict__["name"] = "Iowa"
+        st.tags.append("b")
+        models.storage.save()
+        with open("file.json") as f:
+            record = json.load(f)["State." + st.id]
+        self.assertEqual("Iowa", record["name"])
+        self.assertEqual(["a", "b"], record["tags"])
+
+    def test_deleted_object_leaves_snapshot(self):
+        st = State()
+        models.storage.delete(st)
+        self.assertNotIn("State." + st.id, models.storage.freeze())
+
+    def test_save_async(self):
+        st = State()
+        done = models.storage.save_async()
+        st.name = "Nevada"
+        self.assertTrue(done.wait(5))
+        models.storage.flush()
+        with open("file.json") as f:
+            record = json.load(f)["State." + st.id]
+        self.assertNotIn("name", record)
+        models.storage.save_async()
+        models.storage.flush()
+        with open("file.json") as f:
+            record = json.load(f)["State." + st.id]
+        self.assertEqual("Nevada", record["name"])
+
+    def test_save_async_drops_stale_cache(self):
+        State()
+        models.storage.save()
+        models.storage.reload()
+        models.storage.flush()
+        self.assertTrue(os.path.exists("file.json.cache"))
+        models.storage.save_async()
+        models.storage.flush()
+        self.assertFalse(os.path.exists("file.json.cache"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+"""
+Unit tests for the locks in models/engine/locks.py and thread-safe storage.
+
+Test classes:
+    TestRWLock
+    TestThreadSafeStorage
+"""
+
+import os
+import json
+import time
+import models
+import threading
+import unittest
+from models.engine.locks import NullLock, RWLock
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.state import State
+
+
+class TestRWLock(unittest.TestCase):
+    """Tests for the RWLock class."""
+
+    def test_readers_share(self):
+        lock = RWLock()
+        inside = []
+        barrier = threading.Barrier(3, timeout=5)
+
+        def reader():
+            with lock.read():
+                inside.append(1)
+                barrier.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(3, len(inside))
+
+    def test_writer_excludes_readers(self):
+        lock = RWLock()
+        events = []
+        lock.acquire_write()
+
+        def reader():
+            with lock.read():
+                events.append("read")
+
+        t = threading.Thread(target=reader)
+        t.start()
+        time.sleep(0.05)
+        events.append("write done")
+        lock.release_write()
+        t.join(5)
+        self.assertEqual(["write done", "read"], events)
+
+    def test_write_is_reentrant_and_may_read(self):
+        lock = RWLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                pass
+
+    def test_upgrade_raises(self):
+        lock = RWLock()
+        with lock.read():
+            with self.assertRaises(RuntimeError):
+                lock.acquire_write()
+
+    def test_null_lock(self):
+        lock = NullLock()
+        with lock.read():
+            with lock.write():
+                pass
+
+
+class TestThreadSafeStorage(unittest.TestCase):
+    """Stress tests for FileStorage in thread-safe mode."""
+
+    path = "thread_test.json"
+
+    def setUp(self):
+        self.old_path = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__file_path = self.path
+        models.storage.set_thread_safe(True)
+
+    def tearDown(self):
+        models.storage.set_thread_safe(False)
+        FileStorage._FileStorage__file_path = self.old_path
+        for path in (self.path, self.path + ".cache", self.path + ".idx"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+
+    def test_mode(self):
+        self.assertTrue(models.storage.is_thread_safe())
+        objs = models.storage.all()
+        self.assertIsNot(objs, FileStorage._FileStorage__objects)
+
+    def test_concurrent_readers_and_writers(self):
+        errors = []
+        stop = threading.Event()
+        state = State()
+
+        def guard(func):
+            def run():
+                try:
+                    func()
+                except Exception as e:
+                    errors.append(e)
+            return run
+
+        @guard
+        def writer():
+            for _ in range(200):
+                cy = City()
+                cy.state_id = state.id
+                if len(cy.id) % 2:
+                    models.storage.delete(cy)
+
+        @guard
+        def reader():
+            while not stop.is_set():
+                for key, obj in models.storage.all().items():
+                    obj.to_dict()
+                state.cities
+                models.storage.get("State", state.id)
+
+        @guard
+        def saver():
+            while not stop.is_set():
+                models.storage.save()
+
+        readers = [threading.Thread(target=reader) for _ in range(3)]
+        readers.append(threading.Thread(target=saver))
+        writers = [threading.Thread(target=writer) for _ in range(4)]
+        for t in readers + writers:
+            t.start()
+        for t in writers:
+            t.join(30)
+        stop.set()
+        for t in readers:
+            t.join(30)
+        self.assertEqual([], errors)
+
+        models.storage.save()
+        with open(self.path) as f:
+            saved = json.load(f)
+        self.assertEqual(set(models.storage.all()), set(saved))
+        cities = {c.id for c in state.cities}
+        expected = {o.id for o in models.storage.all().values()
+                    if type(o) is City and o.state_id == state.id}
+        self.assertEqual(expected, cities)
+
+
+if __name__ == "__main__":
+    unittest.main()
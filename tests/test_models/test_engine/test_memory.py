@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Unit tests for the memory accounting in models/engine/memory.py.
+
+Test classes:
+    TestDeepSizeof
+    TestClassReport
+    TestMemoryReport
+"""
+
+import sys
+import json
+import random
+import models
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from console import HBNBCommand
+from models.engine.memory import class_report, deep_sizeof
+from models.review import Review
+from models.state import State
+
+
+class TestDeepSizeof(unittest.TestCase):
+    """Tests for the deep_sizeof function."""
+
+    def test_flat_object(self):
+        self.assertEqual(sys.getsizeof(12345), deep_sizeof(12345))
+
+    def test_container_includes_items(self):
+        text = "x" * 1000
+        self.assertGreater(deep_sizeof([text]), sys.getsizeof([text]) + 1000)
+
+    def test_shared_objects_counted_once(self):
+        text = "x" * 1000
+        self.assertLess(deep_sizeof([text, text]), deep_sizeof([text]) + 1000)
+
+    def test_cycles(self):
+        a = []
+        a.append(a)
+        self.assertEqual(sys.getsizeof(a), deep_sizeof(a))
+
+    def test_instance_dict(self):
+        st = State()
+        st.name = "y" * 1000
+        self.assertGreater(deep_sizeof(st), 1000)
+
+
+class TestClassReport(unittest.TestCase):
+    """Tests for the class_report function."""
+
+    def test_exact(self):
+        objl = [Review() for _ in range(5)]
+        report = class_report(objl, sample=10)
+        self.assertEqual(5, report["count"])
+        self.assertEqual(5, report["sampled"])
+        self.assertIn("id", report["attributes"])
+
+    def test_sampled_is_extrapolated(self):
+        objl = [Review() for _ in range(50)]
+        for rv in objl:
+            rv.text = "z" * 2000
+        report = class_report(objl, sample=5, rng=random.Random(0))
+        self.assertEqual(5, report["sampled"])
+        self.assertGreater(report["bytes"], 50 * 2000)
+        self.assertGreater(report["attributes"]["text"], 50 * 2000)
+
+    def test_empty(self):
+        self.assertEqual(0, class_report([])["bytes"])
+
+
+class TestMemoryReport(unittest.TestCase):
+    """Tests for FileStorage.memory_report and the memory command."""
+
+    def test_report(self):
+        State()
+        report = models.storage.memory_report()
+        self.assertIn("State", report["classes"])
+        self.assertIn("references", report["storage"])
+        self.assertGreater(report["total_bytes"], 0)
+
+    def test_report_one_class(self):
+        State()
+        report = models.storage.memory_report("State")
+        self.assertEqual(["State"], list(report["classes"]))
+        self.assertNotIn("storage", report)
+
+    def test_console_memory(self):
+        State()
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("memory State"))
+            report = json.loads(output.getvalue())
+        self.assertIn("State", report["classes"])
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("memory MyModel")
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Unit tests for top-k selection in models/engine/ordering.py.
+
+Test classes:
+    TestTopK
+    TestSelect
+"""
+
+import os
+import random
+import models
+import unittest
+from models.engine.file_storage import FileStorage
+from models.engine.ordering import top_k
+from models.place import Place
+from models.review import Review
+
+
+class TestTopK(unittest.TestCase):
+    """Tests for top_k."""
+
+    def setUp(self):
+        self.places = []
+        for i in range(50):
+            pl = Place(id="{:02d}".format(i), price_by_night=i % 7)
+            self.places.append(pl)
+        random.shuffle(self.places)
+
+    def test_ascending(self):
+        found = top_k(self.places, "price_by_night", 10)
+        expected = sorted(self.places,
+                          key=lambda p: (p.price_by_night, p.id))[:10]
+        self.assertEqual([p.id for p in expected], [p.id for p in found])
+
+    def test_descending_ties_by_id(self):
+        found = top_k(self.places, "-price_by_night", 10)
+        expected = sorted(self.places,
+                          key=lambda p: (-p.price_by_night, p.id))[:10]
+        self.assertEqual([p.id for p in expected], [p.id for p in found])
+
+    def test_without_limit(self):
+        found = top_k(iter(self.places), "id")
+        self.assertEqual(sorted(p.id for p in self.places),
+                         [p.id for p in found])
+
+    def test_missing_attribute_last(self):
+        other = Review(id="00")
+        for order_by in ("price_by_night", "-price_by_night"):
+            found = top_k(self.places[:3] + [other], order_by)
+            self.assertIs(other, found[-1])
+
+    def test_incomparable(self):
+        self.places[0].price_by_night = "free"
+        with self.assertRaises(ValueError):
+            top_k(self.places, "price_by_night", 3)
+
+
+class TestSelect(unittest.TestCase):
+    """Tests for FileStorage.select."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        for name in ("file.json", "file.json.cache", "file.json.idx"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.places = [Place() for _ in range(20)]
+        for i, pl in enumerate(self.places):
+            pl.price_by_night = i % 4
+            pl.city_id = "c{}".format(i % 2)
+
+    def test_order_limit_where(self):
+        found = models.storage.select(
+            "Place", "-price_by_night", 3,
+            where=lambda p: p.city_id == "c1")
+        expected = sorted((p for p in self.places if p.city_id == "c1"),
+                          key=lambda p: (-p.price_by_night, p.id))[:3]
+        self.assertEqual([p.id for p in expected], [p.id for p in found])
+
+    def test_by_id(self):
+        ids = sorted(p.id for p in self.places)
+        self.assertEqual(ids[:5],
+                         [p.id for p in models.storage.select("Place",
+                                                              limit=5)])
+        self.assertEqual(ids, [p.id for p in models.storage.select("Place")])
+        self.assertEqual([], models.storage.select("Place", limit=0))
+        self.assertEqual([], models.storage.select("City", limit=5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+#!/usr/bin/python3
+"""
+Unit tests for partitioned storage in
+models/engine/partitioned_storage.py.
+
+Test classes:
+    TestHashRing
+    TestPartitionedStorage
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import models
+import unittest
+from unittest import mock
+from models.engine.client_storage import ClientStorage
+from models.engine.partitioned_storage import HashRing, PartitionedStorage
+from models.city import City
+from models.review import Review
+from models.place import Place
+from models.state import State
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+
+class TestHashRing(unittest.TestCase):
+    """Tests for assigning keys to nodes."""
+
+    keys = ["State.{}".format(i) for i in range(2000)]
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            HashRing().node_for("State.1")
+
+    def test_spread(self):
+        ring = HashRing(["a", "b", "c"])
+        owners = [ring.node_for(key) for key in self.keys]
+        for node in "abc":
+            self.assertGreater(owners.count(node), 400)
+        self.assertEqual(owners, [ring.node_for(key) for key in self.keys])
+
+    def test_add_moves_only_to_new_node(self):
+        ring = HashRing(["a", "b"])
+        before = [ring.node_for(key) for key in self.keys]
+        ring.add("c")
+        after = [ring.node_for(key) for key in self.keys]
+        moved = [(b, a) for b, a in zip(before, after) if b != a]
+        self.assertTrue(all(a == "c" for b, a in moved))
+        self.assertLess(len(moved), len(self.keys) / 2)
+
+
+class TestPartitionedStorage(unittest.TestCase):
+    """Tests for PartitionedStorage against storage server processes."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.workdir = tempfile.mkdtemp(prefix="hbnb-nodes-")
+        cls.servers = []
+        cls.paths = []
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        for name in ("n1", "n2", "n3"):
+            cwd = os.path.join(cls.workdir, name)
+            os.mkdir(cwd)
+            path = os.path.join(cwd, "node.sock")
+            cls.servers.append(subprocess.Popen(
+                [sys.executable, "-m", "models.engine.storage_server",
+                 "--socket", path], cwd=cwd, env=env))
+            cls.paths.append(path)
+        for path in cls.paths:
+            for _ in range(500):
+                if os.path.exists(path):
+                    break
+                time.sleep(0.01)
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(cls.workdir)
+
+    def setUp(self):
+        for path in self.paths:
+            client = ClientStorage(path)
+            for key in client.keys():
+                cname, _, oid = key.partition(".")
+                client.pipeline([{"op": "delete", "cls": cname, "id": oid}])
+            client.close()
+        self.storage = PartitionedStorage(self.paths[:2])
+        patcher = mock.patch.object(models, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.storage.close)
+
+    def node_keys(self, path):
+        """Return the keys stored by the node at path."""
+        client = ClientStorage(path)
+        self.addCleanup(client.close)
+        return client.keys()
+
+    def test_keys_are_routed(self):
+        states = [State() for _ in range(20)]
+        self.storage.save()
+        for path in self.paths[:2]:
+            keys = self.node_keys(path)
+            self.assertGreater(len(keys), 0)
+            for key in keys:
+                self.assertEqual(path, self.storage.ring.node_for(key))
+        for st in states:
+            self.assertIs(st, self.storage.get("State", st.id))
+
+    def test_fan_out(self):
+        states = [State() for _ in range(10)]
+        City()
+        self.assertEqual(10, self.storage.count("State"))
+        self.assertEqual(11, self.storage.count())
+        keys = set(self.storage.all())
+        self.assertEqual({"State." + st.id for st in states} |
+                         {k for k in keys if k.startswith("City.")}, keys)
+
+    def test_children_across_nodes(self):
+        st = State()
+        cities = [City() for _ in range(10)]
+        for cy in cities:
+            cy.state_id = st.id
+        self.assertEqual(sorted(cy.id for cy in cities),
+                         sorted(cy.id for cy in st.cities))
+
+    def test_cascade_across_nodes(self):
+        pl = Place()
+        reviews = [Review() for _ in range(10)]
+        for rv in reviews:
+            rv.place_id = pl.id
+        removed = self.storage.delete(pl, cascade=True)
+        self.assertEqual("Place." + pl.id, removed[0])
+        self.assertEqual(sorted("Review." + rv.id for rv in reviews),
+                         sorted(removed[1:]))
+        self.assertEqual(0, self.storage.count())
+
+    def test_update_many(self):
+        states = [State() for _ in range(6)]
+        self.storage.save()
+        updates = {st.id: {"name": "s{}".format(i)}
+                   for i, st in enumerate(states)}
+        updates["missing"] = {"name": "x"}
+        self.assertEqual(["missing"],
+                         self.storage.update_many("State", updates))
+        other = PartitionedStorage(self.paths[:2])
+        self.addCleanup(other.close)
+        self.assertEqual("s3", other.get("State", states[3].id).name)
+        with self.assertRaises(ValueError):
+            self.storage.update_many("Place", {"x": {"max_guest": "many"}})
+
+    def test_reports(self):
+        [State() for _ in range(10)]
+        self.storage.save()
+        report = self.storage.stats_report()
+        self.assertEqual(sorted(self.paths[:2]), sorted(report["nodes"]))
+        self.assertEqual(10, report["objects"]["State"])
+        self.assertGreater(report["file_bytes"], 0)
+        memory = self.storage.memory_report("State")
+        self.assertEqual(10, sum(node["classes"]["State"]["count"]
+                                 for node in memory["nodes"].values()))
+
+    def test_add_node(self):
+        states = [State() for _ in range(60)]
+        self.storage.save()
+        moved = self.storage.add_node(self.paths[2])
+        new_keys = self.node_keys(self.paths[2])
+        self.assertEqual(moved, len(new_keys))
+        self.assertGreater(moved, 0)
+        self.assertLess(moved, 60)
+        for path in self.paths:
+            for key in self.node_keys(path):
+                self.assertEqual(path, self.storage.ring.node_for(key))
+        other = PartitionedStorage(self.paths)
+        self.addCleanup(other.close)
+        for st in states:
+            self.assertEqual(st.id, other.get("State", st.id).id)
+        self.assertEqual(60, other.count("State"))
+
+    def test_add_node_moves_tracked_instances(self):
+        states = [State() for _ in range(30)]
+        self.storage.save()
+        self.storage.add_node(self.paths[2])
+        for st in states:
+            st.name = "moved"
+        self.storage.save()
+        other = PartitionedStorage(self.paths)
+        self.addCleanup(other.close)
+        self.assertEqual(["moved"] * 30,
+                         [other.get("State", st.id).name for st in states])
+
+
+if __name__ == "__main__":
+    unittest.main()
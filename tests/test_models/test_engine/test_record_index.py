@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+Unit tests for storage file indexes in models/engine/record_index.py.
+
+Test classes:
+    TestRecordIndex
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from models.engine import record_index
+from models.engine.record_index import RecordIndex
+
+
+class TestRecordIndex(unittest.TestCase):
+    """Tests for writing and reading storage file indexes."""
+
+    records = {
+        "State.b": {"id": "b", "name": "Ohio", "__class__": "State"},
+        "City.1": {"id": "1", "name": "Akron", "__class__": "City"},
+        "State.a": {"id": "a", "name": "Iowa", "__class__": "State"},
+        "Amenity.x": {"id": "x", "name": "Café", "__class__": "Amenity"}
+    }
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="hbnb-index-")
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "file.json")
+
+    def write(self):
+        """Write records to self.path, with its index."""
+        return record_index.write(self.path, [
+            (key, json.dumps(record).encode())
+            for key, record in self.records.items()])
+
+    def open(self):
+        """Return the index of self.path, closed on cleanup."""
+        index = RecordIndex(self.path)
+        self.addCleanup(index.close)
+        return index
+
+    def test_write_matches_json(self):
+        size = self.write()
+        with open(self.path, "rb") as f:
+            data = f.read()
+        self.assertEqual(json.dumps(self.records).encode(), data)
+        self.assertEqual(len(data), size)
+
+    def test_lookup(self):
+        self.write()
+        index = self.open()
+        self.assertEqual(4, len(index))
+        for key, record in self.records.items():
+            self.assertEqual(record, json.loads(index.record(key)))
+        self.assertIsNone(index.record("State.c"))
+        self.assertIsNone(index.lookup("State"))
+
+    def test_count_and_keys(self):
+        self.write()
+        index = self.open()
+        self.assertEqual(2, index.count("State."))
+        self.assertEqual(0, index.count("Place."))
+        self.assertEqual(4, index.count())
+        self.assertEqual(["State.a", "State.b"], list(index.keys("State.")))
+        self.assertEqual(sorted(self.records), list(index.keys()))
+
+    def test_built_for_unindexed_file(self):
+        with open(self.path, "w") as f:
+            json.dump(self.records, f, indent=4)
+        index = self.open()
+        self.assertEqual(self.records["City.1"],
+                         json.loads(index.record("City.1")))
+        self.assertTrue(os.path.exists(record_index.path_for(self.path)))
+
+    def test_stale_index_is_rebuilt(self):
+        self.write()
+        time.sleep(0.01)
+        records = dict(self.records)
+        records["Place.p"] = {"id": "p", "__class__": "Place"}
+        with open(self.path, "w") as f:
+            json.dump(records, f)
+        index = self.open()
+        self.assertEqual(5, len(index))
+        self.assertEqual(records["Place.p"],
+                         json.loads(index.record("Place.p")))
+
+    def test_empty_file(self):
+        record_index.write(self.path, [])
+        index = self.open()
+        self.assertEqual(0, len(index))
+        self.assertIsNone(index.record("State.a"))
+
+    def test_not_a_storage_file(self):
+        with open(self.path, "w") as f:
+            f.write("[]")
+        with self.assertRaises(ValueError):
+            RecordIndex(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
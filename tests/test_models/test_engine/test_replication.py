@@ -0,0 +1,196 @@
+#!/usr/bin/python3
+"""
+Unit tests for replication in models/engine/replication.py.
+
+Test classes:
+    TestReplication
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import console
+import models
+import unittest
+from io import StringIO
+from unittest import mock
+from console import HBNBCommand
+from models.engine.replication import Follower, Primary
+from models.city import City
+from models.place import Place
+from models.state import State
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+
+class TestReplication(unittest.TestCase):
+    """Tests for shipping changes from a Primary to Followers."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        for name in ("file.json", "file.json.cache"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="hbnb-replica-")
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.state = State()
+        self.state.name = "Ohio"
+        self.primary = Primary(self.directory)
+        self.primary.start()
+        self.addCleanup(self.primary.stop)
+        self.follower = Follower(self.directory, interval=0)
+        self.addCleanup(self.follower.stop)
+
+    def test_snapshot(self):
+        st = self.follower.get("State", self.state.id)
+        self.assertIsNot(self.state, st)
+        self.assertEqual(self.state.to_dict(), st.to_dict())
+
+    def test_no_snapshot_yet(self):
+        directory = tempfile.mkdtemp(prefix="hbnb-replica-")
+        self.addCleanup(shutil.rmtree, directory)
+        follower = Follower(directory, interval=0)
+        self.addCleanup(follower.stop)
+        self.assertEqual(0, follower.count())
+        self.assertEqual({}, follower.all())
+        self.assertIsNone(follower.get("State", self.state.id))
+        primary = Primary(directory)
+        primary.start()
+        self.addCleanup(primary.stop)
+        State()
+        follower.poll()
+        self.assertEqual(self.state.to_dict(), follower.get(
+            "State", self.state.id).to_dict())
+        self.assertEqual(models.storage.count(), follower.count())
+
+    def test_changes_are_applied(self):
+        self.follower.poll()
+        cy = City()
+        cy.state_id = self.state.id
+        self.state.name = "Utah"
+        self.state.save()
+        self.assertEqual(3, self.follower.poll())
+        st = self.follower.get("State", self.state.id)
+        self.assertEqual("Utah", st.name)
+        self.assertEqual(self.state.updated_at, st.updated_at)
+        self.assertEqual(cy.to_dict(),
+                         self.follower.get("City", cy.id).to_dict())
+        self.assertEqual([cy.id], [c.id for c in self.follower.children(
+            st, "City", "state_id")])
+        models.storage.delete(cy)
+        self.follower.poll()
+        self.assertIsNone(self.follower.get("City", cy.id))
+
+    def test_catch_up_after_checkpoint(self):
+        self.follower.poll()
+        self.primary.stop()
+        self.primary.start()
+        st = State()
+        self.primary.checkpoint()
+        st.name = "Iowa"
+        models.storage.save()
+        self.follower.poll()
+        self.assertEqual("Iowa", self.follower.get("State", st.id).name)
+
+    def test_partial_line_waits(self):
+        self.follower.poll()
+        path = os.path.join(self.directory, "changes.jsonl")
+        st = State()
+        with open(path) as f:
+            line = f.read()
+        self.primary.stop()
+        with open(path, "w") as f:
+            f.write(line[:10])
+        self.assertEqual(0, self.follower.poll())
+        with open(path, "a") as f:
+            f.write(line[10:])
+        self.assertEqual(1, self.follower.poll())
+        self.assertIsNotNone(self.follower.get("State", st.id))
+
+    def test_lag(self):
+        self.follower.poll()
+        State()
+        State()
+        lag = self.follower.lag()
+        self.assertEqual(2, lag["behind"])
+        self.assertEqual(lag["applied_seq"] + 2, lag["primary_seq"])
+        self.assertGreaterEqual(lag["seconds_behind"], 0)
+        self.follower.poll()
+        lag = self.follower.lag()
+        self.assertEqual(0, lag["behind"])
+        self.assertEqual(0, lag["seconds_behind"])
+
+    def test_amenities(self):
+        pl = Place()
+        pl.amenity_ids = ["replica-1", "replica-2"]
+        models.storage.save()
+        found = self.follower.places_with_amenities(all_of=["replica-1"],
+                                                    none_of=["replica-3"])
+        self.assertEqual([pl.id], [p.id for p in found])
+
+    def test_read_only(self):
+        st = self.follower.get("State", self.state.id)
+        with self.assertRaises(RuntimeError):
+            self.follower.save()
+        with self.assertRaises(RuntimeError):
+            self.follower.set_attribute(st, "name", "x")
+
+    def test_reports(self):
+        count = len([k for k in models.storage.all()
+                     if k.startswith("State.")])
+        report = self.follower.stats_report()
+        self.assertEqual(count, report["objects"]["State"])
+        self.assertEqual(0, report["lag"]["behind"])
+        memory = self.follower.memory_report("State")
+        self.assertEqual(count, memory["classes"]["State"]["count"])
+
+    def test_console(self):
+        st = self.follower.get("State", self.state.id)
+        with mock.patch.object(models, "storage", self.follower), \
+                mock.patch.object(console, "storage", self.follower):
+            for line, error in (
+                    ("create State", "read-only follower"),
+                    ("destroy State " + st.id, "read-only follower"),
+                    ('update State {} name "x"'.format(st.id),
+                     "read-only follower")):
+                with mock.patch("sys.stdout", new=StringIO()) as output:
+                    HBNBCommand().onecmd(line)
+                self.assertIn(error, output.getvalue())
+            with mock.patch("sys.stdout", new=StringIO()) as output:
+                HBNBCommand().onecmd("stats")
+            self.assertIn('"lag"', output.getvalue())
+        self.assertEqual("Ohio", st.name)
+
+    def test_follower_process(self):
+        st = State()
+        models.storage.save()
+        env = dict(os.environ, HBNB_REPLICA_DIR=self.directory,
+                   PYTHONPATH=ROOT)
+        out = subprocess.run(
+            [sys.executable, "-c",
+             "import models\n"
+             "print(models.storage.get('State', {!r}).id)".format(st.id)],
+            env=env, capture_output=True, text=True, check=True).stdout
+        self.assertEqual(st.id, out.strip())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""
+Unit tests for the snapshot cache in models/engine/snapshot.py.
+
+Test classes:
+    TestSnapshot
+    TestSnapshotStorage
+"""
+
+import os
+import models
+import threading
+import unittest
+from unittest import mock
+from models.engine import snapshot
+from models.engine.file_storage import FileStorage
+from models.engine.stats import stats
+from models.city import City
+from models.state import State
+
+
+class TestSnapshot(unittest.TestCase):
+    """Tests for writing and reading snapshots."""
+
+    path = "snapshot_test.json"
+
+    def setUp(self):
+        with open(self.path, "wb") as f:
+            f.write(b'{"a": 1}')
+
+    def tearDown(self):
+        for path in (self.path, snapshot.path_for(self.path)):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            return snapshot.read(self.path, os.fstat(f.fileno()), f.read())
+
+    def test_path_for(self):
+        self.assertEqual("file.json.cache", snapshot.path_for("file.json"))
+
+    def test_round_trip(self):
+        self.assertTrue(snapshot.write(self.path, b'{"a": 1}', [1, "two"]))
+        self.assertEqual([1, "two"], self.read())
+
+    def test_missing(self):
+        self.assertIsNone(self.read())
+
+    def test_changed_content_is_rejected(self):
+        snapshot.write(self.path, b'{"a": 1}', [1])
+        st = os.stat(self.path)
+        with open(self.path, "wb") as f:
+            f.write(b'{"a": 2}')
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertIsNone(self.read())
+
+    def test_corrupt_snapshot_is_ignored(self):
+        with open(snapshot.path_for(self.path), "wb") as f:
+            f.write(b"not a pickle")
+        self.assertIsNone(self.read())
+
+
+class TestSnapshotStorage(unittest.TestCase):
+    """Tests for the use of snapshots by FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        stats.reset()
+        stats.enabled = True
+
+    def tearDown(self):
+        stats.enabled = False
+        stats.reset()
+        for path in ("file.json", snapshot.path_for("file.json")):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_save_drops_snapshot(self):
+        State().save()
+        models.storage.reload()
+        models.storage.flush()
+        self.assertTrue(os.path.exists(snapshot.path_for("file.json")))
+        State().save()
+        self.assertFalse(os.path.exists(snapshot.path_for("file.json")))
+
+    def test_reload_from_snapshot(self):
+        st = State()
+        cy = City()
+        cy.state_id = st.id
+        st.name = "Texas"
+        models.storage.save()
+        models.storage.reload()
+        models.storage.flush()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(1, stats.counters["storage.snapshot_hit"])
+        restored = models.storage.all()["State." + st.id]
+        self.assertIsNot(st, restored)
+        self.assertEqual("Texas", restored.name)
+        self.assertEqual(st.created_at, restored.created_at)
+        self.assertEqual([cy.id], [c.id for c in restored.cities])
+
+    def test_snapshot_holds_saved_values(self):
+        models.storage.set_thread_safe()
+        self.addCleanup(models.storage.set_thread_safe, False)
+        st = State()
+        st.name = "Texas"
+        models.storage.save()
+        st.name = "Utah"
+        st.__dict__["extra"] = 1
+        models.storage.reload()
+        models.storage.flush()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(1, stats.counters["storage.snapshot_hit"])
+        restored = models.storage.all()["State." + st.id]
+        self.assertEqual("Texas", restored.name)
+        self.assertFalse(hasattr(restored, "extra"))
+
+    def test_reload_parses_changed_file(self):
+        State().save()
+        self.assertFalse(os.path.exists(snapshot.path_for("file.json")))
+        models.storage.reload()
+        self.assertEqual(1, stats.counters["storage.snapshot_miss"])
+        models.storage.flush()
+        self.assertTrue(os.path.exists(snapshot.path_for("file.json")))
+        models.storage.reload()
+        self.assertEqual(1, stats.counters["storage.snapshot_hit"])
+
+    def test_snapshot_written_in_background(self):
+        State().save()
+        parse = FileStorage._FileStorage__parse
+        started = threading.Event()
+        resume = threading.Event()
+
+        def slow(storage, data):
+            if threading.current_thread() is not threading.main_thread():
+                started.set()
+                resume.wait(5)
+            return parse(storage, data)
+        with mock.patch.object(FileStorage, "_FileStorage__parse", slow):
+            models.storage.reload()
+            self.assertTrue(started.wait(5))
+            self.assertFalse(os.path.exists(snapshot.path_for("file.json")))
+            resume.set()
+            models.storage.flush()
+        self.assertTrue(os.path.exists(snapshot.path_for("file.json")))
+
+    def test_no_snapshot_of_replaced_file(self):
+        State().save()
+        parse = FileStorage._FileStorage__parse
+        resume = threading.Event()
+
+        def slow(storage, data):
+            if threading.current_thread() is not threading.main_thread():
+                resume.wait(5)
+            return parse(storage, data)
+        with mock.patch.object(FileStorage, "_FileStorage__parse", slow):
+            models.storage.reload()
+            State().save()
+            resume.set()
+            models.storage.flush()
+        self.assertFalse(os.path.exists(snapshot.path_for("file.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+#!/usr/bin/python3
+"""
+Unit tests for the classes in models/engine/stats.py.
+
+Test classes:
+    TestHistogram
+    TestStats
+    TestStatsInstrumentation
+    TestTracer
+"""
+
+import os
+import json
+import models
+import unittest
+from io import StringIO
+from unittest.mock import patch
+from console import HBNBCommand
+from models.engine.stats import Histogram, Stats, Tracer, stats, tracer
+from models.place import Place
+
+
+class TestHistogram(unittest.TestCase):
+    """Tests for the Histogram class."""
+
+    def test_empty(self):
+        hist = Histogram()
+        self.assertEqual(0, hist.count)
+        self.assertIsNone(hist.percentile(50))
+
+    def test_record(self):
+        hist = Histogram()
+        for us in (1, 2, 3, 1000):
+            hist.record(us / 1000000)
+        self.assertEqual(4, hist.count)
+        self.assertEqual(0.001, hist.max)
+        self.assertEqual(0.000001, hist.min)
+
+    def test_percentiles_are_upper_bounds(self):
+        hist = Histogram()
+        for _ in range(99):
+            hist.record(0.000010)
+        hist.record(0.5)
+        self.assertGreaterEqual(hist.percentile(50), 0.000010)
+        self.assertLess(hist.percentile(50), 0.000020)
+        self.assertEqual(0.5, hist.percentile(100))
+
+    def test_to_dict(self):
+        hist = Histogram()
+        hist.record(0.25)
+        summary = hist.to_dict()
+        self.assertEqual(1, summary["count"])
+        self.assertEqual(0.25, summary["mean"])
+
+
+class TestStats(unittest.TestCase):
+    """Tests for the Stats class."""
+
+    def test_disabled_by_default(self):
+        self.assertFalse(Stats().enabled)
+
+    def test_counters_and_latencies(self):
+        st = Stats(True)
+        st.incr("a")
+        st.incr("a", 2)
+        st.observe("op", 0.1)
+        report = st.to_dict()
+        self.assertEqual({"a": 3}, report["counters"])
+        self.assertEqual(1, report["latencies"]["op"]["count"])
+        st.reset()
+        self.assertEqual({}, st.to_dict()["counters"])
+
+    def test_dump(self):
+        st = Stats(True)
+        st.incr("a")
+        try:
+            st.dump("stats_test.json")
+            with open("stats_test.json") as f:
+                self.assertEqual(1, json.load(f)["counters"]["a"])
+        finally:
+            os.remove("stats_test.json")
+
+
+class TestStatsInstrumentation(unittest.TestCase):
+    """Tests for the instrumentation of storage and models."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        stats.reset()
+        stats.enabled = True
+
+    def tearDown(self):
+        stats.enabled = False
+        stats.reset()
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_save_and_reload(self):
+        pl = Place()
+        pl.save()
+        models.storage.reload()
+        report = models.storage.stats_report()
+        self.assertEqual(1, report["counters"]["model.create.Place"])
+        self.assertEqual(1, report["counters"]["model.save.Place"])
+        self.assertEqual(1, report["latencies"]["storage.save"]["count"])
+        self.assertEqual(1, report["latencies"]["storage.reload"]["count"])
+        self.assertEqual(os.path.getsize("file.json"),
+                         report["counters"]["storage.bytes_written"])
+        self.assertEqual(os.path.getsize("file.json"),
+                         report["counters"]["storage.bytes_read"])
+        self.assertEqual(os.path.getsize("file.json"), report["file_bytes"])
+        self.assertGreaterEqual(report["objects"]["Place"], 1)
+
+    def test_disabled_records_nothing(self):
+        stats.enabled = False
+        Place().save()
+        self.assertEqual({}, stats.counters)
+        self.assertEqual({}, stats.latencies)
+
+    def test_console_stats(self):
+        Place().save()
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("stats"))
+            report = json.loads(output.getvalue())
+        self.assertIn("storage.save", report["latencies"])
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("stats off")
+            self.assertFalse(stats.enabled)
+            HBNBCommand().onecmd("stats reset")
+            self.assertEqual({}, stats.counters)
+            HBNBCommand().onecmd("stats bogus")
+            self.assertEqual("*** Unknown syntax: stats bogus",
+                             output.getvalue().strip())
+
+
+class TestTracer(unittest.TestCase):
+    """Tests for the Tracer class and the console trace command."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    def tearDown(self):
+        tracer.enabled = False
+        tracer.threshold = None
+        tracer.log_path = "slow_commands.log"
+        tracer.reset()
+        for path in ("file.json", "slow_test.log"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_disabled_traces_nothing(self):
+        tr = Tracer()
+        tr.start("show")
+        tr.mark("parse")
+        self.assertIsNone(tr.finish("show"))
+        self.assertEqual({}, tr.commands)
+
+    def test_phases(self):
+        tr = Tracer(True)
+        tr.start("show")
+        tr.mark("parse")
+        tr.mark("lookup")
+        self.assertGreaterEqual(tr.finish("show User 1"), 0)
+        self.assertEqual(1, tr.commands["show"].count)
+        self.assertIn("show.parse", tr.phases)
+        self.assertIn("show.lookup", tr.phases)
+
+    def test_slow_log(self):
+        tr = Tracer(True, 0.0, "slow_test.log")
+        tr.start("count")
+        tr.finish("count User")
+        with open("slow_test.log") as f:
+            entry = json.loads(f.readline())
+        self.assertEqual("count", entry["command"])
+        self.assertEqual("count User", entry["line"])
+
+    def test_console_commands_are_traced(self):
+        tracer.enabled = True
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+            pid = output.getvalue().strip()
+            HBNBCommand().onecmd('Place.show("{}")'.format(pid))
+            HBNBCommand().onecmd('update Place {} name "x"'.format(pid))
+        report = tracer.to_dict()
+        self.assertEqual(["create", "show", "update"],
+                         sorted(report["commands"]))
+        for phase in ("parse", "mutation", "save", "output"):
+            self.assertIn("create." + phase, report["phases"])
+        self.assertIn("show.lookup", report["phases"])
+        self.assertIn("update.save", report["phases"])
+
+    def test_console_trace_command(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("trace on")
+            HBNBCommand().onecmd("trace slow 0 slow_test.log")
+            HBNBCommand().onecmd("count Place")
+            HBNBCommand().onecmd("trace off")
+        self.assertTrue(os.path.exists("slow_test.log"))
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("trace")
+            report = json.loads(output.getvalue())
+        self.assertEqual(1, report["commands"]["count"]["count"])
+        self.assertEqual(0.0, report["slow_threshold"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/python3
+"""
+Unit tests for the storage server and its client, in
+models/engine/storage_server.py and models/engine/client_storage.py.
+
+Test classes:
+    TestWire
+    TestClientStorage
+"""
+
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import models
+import unittest
+from unittest import mock
+from models.engine import wire
+from models.engine.client_storage import ClientStorage
+from models.city import City
+from models.place import Place
+from models.state import State
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+
+class TestWire(unittest.TestCase):
+    """Tests for the framing of messages."""
+
+    def test_round_trip(self):
+        rfile = io.BytesIO(wire.encode({"op": "get"}) +
+                           wire.encode([1, None]))
+        self.assertEqual({"op": "get"}, wire.read(rfile))
+        self.assertEqual([1, None], wire.read(rfile))
+        with self.assertRaises(EOFError):
+            wire.read(rfile)
+
+    def test_truncated_frame(self):
+        with self.assertRaises(EOFError):
+            wire.read(io.BytesIO(wire.encode("abc")[:-1]))
+
+    def test_to_object(self):
+        st = State()
+        obj = wire.to_object(st.to_dict())
+        self.assertIs(State, type(obj))
+        self.assertEqual(st.to_dict(), obj.to_dict())
+        with self.assertRaises(ValueError):
+            wire.to_object({"__class__": "Nope"})
+
+
+class TestClientStorage(unittest.TestCase):
+    """Tests for ClientStorage against a storage server process."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.workdir = tempfile.mkdtemp(prefix="hbnb-server-")
+        cls.path = os.path.join(cls.workdir, "hbnb.sock")
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        env.pop("HBNB_STORAGE_SOCKET", None)
+        cls.server = subprocess.Popen(
+            [sys.executable, "-m", "models.engine.storage_server",
+             "--socket", cls.path], cwd=cls.workdir, env=env)
+        for _ in range(500):
+            if os.path.exists(cls.path):
+                break
+            time.sleep(0.01)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+        cls.server.wait()
+        shutil.rmtree(cls.workdir)
+
+    def setUp(self):
+        self.client = ClientStorage(self.path)
+        patcher = mock.patch.object(models, "storage", self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.client.close)
+
+    def test_new_is_sent_with_next_request(self):
+        st = State()
+        self.assertIn("State." + st.id, self.client.all())
+        other = ClientStorage(self.path)
+        self.addCleanup(other.close)
+        self.assertEqual(st.to_dict(),
+                         other.get("State", st.id).to_dict())
+
+    def test_changes_are_tracked(self):
+        st = State()
+        self.client.save()
+        st.name = "Ohio"
+        other = ClientStorage(self.path)
+        self.addCleanup(other.close)
+        self.assertNotIn("name", other.get("State", st.id).__dict__)
+        self.client.save()
+        self.assertEqual("Ohio", other.get("State", st.id).name)
+
+    def test_instances_keep_their_identity(self):
+        st = State()
+        self.client.save()
+        self.assertIs(st, self.client.get("State", st.id))
+        self.assertIs(st, self.client.all()["State." + st.id])
+
+    def test_save_writes_file(self):
+        st = State()
+        self.client.save()
+        with open(os.path.join(self.workdir, "file.json")) as f:
+            self.assertIn("State." + st.id, json.load(f))
+
+    def test_navigation(self):
+        st = State()
+        cy = City()
+        cy.state_id = st.id
+        pl = Place()
+        pl.amenity_ids = ["remote-amenity"]
+        self.assertEqual([cy], st.cities)
+        self.assertEqual([pl], self.client.places_with_amenities(
+            all_of=["remote-amenity"]))
+
+    def test_delete(self):
+        st = State()
+        cy = City()
+        cy.state_id = st.id
+        removed = self.client.delete(st, cascade=True)
+        self.assertEqual(["State." + st.id, "City." + cy.id], removed)
+        self.assertIsNone(self.client.get("City", cy.id))
+
+    def test_count(self):
+        before = self.client.count("City")
+        City()
+        City()
+        self.assertEqual(before + 2, self.client.count("City"))
+
+    def test_update_many(self):
+        st = State()
+        self.client.save()
+        missing = self.client.update_many(
+            "State", {st.id: {"name": "Iowa"}, "missing": {"name": "x"}})
+        self.assertEqual(["missing"], missing)
+        other = ClientStorage(self.path)
+        self.addCleanup(other.close)
+        self.assertEqual("Iowa", other.get("State", st.id).name)
+
+    def test_pipeline(self):
+        st = State()
+        self.client.save()
+        results = self.client.pipeline([
+            {"op": "get", "cls": "State", "id": st.id},
+            {"op": "count", "cls": "State"}
+        ])
+        self.assertEqual(st.id, results[0]["id"])
+        self.assertGreaterEqual(results[1], 1)
+
+    def test_server_error(self):
+        with self.assertRaises(RuntimeError):
+            self.client.pipeline([{"op": "nope"}])
+        self.assertEqual([None], self.client.pipeline(
+            [{"op": "get", "cls": "State", "id": "missing"}]))
+
+    def test_consoles_share_storage(self):
+        env = dict(os.environ, HBNB_STORAGE_SOCKET=self.path)
+
+        def console(commands):
+            return subprocess.run(
+                [sys.executable, os.path.join(ROOT, "console.py")],
+                input=commands, capture_output=True, text=True,
+                cwd=self.workdir, env=env, check=True).stdout
+        oid = console("create State\n").split()[1]
+        console('update State {} name "Maine"\n'.format(oid))
+        out = console("show State {}\n".format(oid))
+        self.assertIn("[State] ({})".format(oid), out)
+        self.assertIn("'name': 'Maine'", out)
+
+
+if __name__ == "__main__":
+    unittest.main()
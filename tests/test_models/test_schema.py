@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+"""Defines unittests for models/schema.py.
+
+Unittest classes:
+    TestSchema_parse_literal
+    TestSchema_schema_for
+    TestSchema_coerce
+    TestSchema_update_many
+"""
+
+import os
+import models
+import unittest
+from models import schema
+from models.base_model import BaseModel
+from models.booking import Booking
+from models.place import Place
+from models.user import User
+
+
+class TestSchema_parse_literal(unittest.TestCase):
+    """Unittests for testing the eval-free literal parser."""
+
+    def test_dict(self):
+        self.assertEqual({"a": 1}, schema.parse_literal("{'a': 1}"))
+
+    def test_list(self):
+        self.assertEqual(["x", "y"], schema.parse_literal('["x", "y"]'))
+
+    def test_number(self):
+        self.assertEqual(3.5, schema.parse_literal(" 3.5 "))
+
+    def test_name_is_rejected(self):
+        with self.assertRaises(ValueError):
+            schema.parse_literal("hello")
+
+    def test_call_is_rejected(self):
+        with self.assertRaises(ValueError):
+            schema.parse_literal("__import__('os').getcwd()")
+
+
+class TestSchema_schema_for(unittest.TestCase):
+    """Unittests for testing compiled class schemas."""
+
+    def test_place_fields(self):
+        fields = schema.schema_for(Place)
+        for name in ("city_id", "number_rooms", "latitude", "amenity_ids"):
+            self.assertIn(name, fields)
+
+    def test_methods_are_ignored(self):
+        fields = schema.schema_for(User)
+        self.assertNotIn("save", fields)
+        self.assertNotIn("to_dict", fields)
+
+    def test_base_model_is_empty(self):
+        self.assertEqual({}, schema.schema_for(BaseModel))
+
+    def test_schema_is_cached(self):
+        self.assertIs(schema.schema_for(Place), schema.schema_for(Place))
+
+
+class TestSchema_coerce(unittest.TestCase):
+    """Unittests for testing value coercion."""
+
+    def test_int(self):
+        self.assertEqual(4, schema.coerce(Place, "number_rooms", "4"))
+
+    def test_int_from_float_string(self):
+        self.assertEqual(4, schema.coerce(Place, "max_guest", "4.0"))
+
+    def test_float(self):
+        self.assertEqual(1.5, schema.coerce(Place, "latitude", "1.5"))
+
+    def test_str(self):
+        self.assertEqual("12", schema.coerce(User, "first_name", 12))
+
+    def test_list_literal(self):
+        self.assertEqual(["a", "b"],
+                         schema.coerce(Place, "amenity_ids", "['a', 'b']"))
+
+    def test_list_single_value(self):
+        self.assertEqual(["a"], schema.coerce(Place, "amenity_ids", "a"))
+
+    def test_unknown_attribute_unchanged(self):
+        self.assertEqual("89", schema.coerce(Place, "my_number", "89"))
+
+    def test_invalid_value(self):
+        with self.assertRaises(ValueError):
+            schema.coerce(Place, "number_rooms", "many")
+
+    def test_infinite_int(self):
+        for value in ("inf", "1e400", "-inf"):
+            with self.assertRaises(ValueError):
+                schema.coerce(Place, "max_guest", value)
+
+    def test_date(self):
+        self.assertEqual("2024-09-01",
+                         schema.coerce(Booking, "check_in", "20240901"))
+        for value in ("2024-9-1", "next week", ""):
+            with self.assertRaises(ValueError):
+                schema.coerce(Booking, "check_out", value)
+
+    def test_apply_validates_stay(self):
+        bk = Booking()
+        schema.apply(bk, {"check_in": "2024-09-01"})
+        with self.assertRaises(ValueError):
+            schema.apply(bk, {"check_out": "2024-08-30"})
+        schema.apply(bk, {"check_in": "2024-10-01",
+                          "check_out": "2024-10-03"})
+        self.assertEqual("2024-10-03", bk.check_out)
+
+    def test_apply_checks_names(self):
+        pl = Place()
+        for name in ("reviews", "to_dict", "id", "_Place__x", "a b"):
+            with self.assertRaises(ValueError):
+                schema.apply(pl, {name: 1})
+        schema.apply(pl, {"nickname": "Loft"})
+        self.assertEqual("Loft", pl.nickname)
+
+    def test_apply_is_all_or_nothing(self):
+        pl = Place()
+        with self.assertRaises(ValueError):
+            schema.apply(pl, {"name": "Home", "max_guest": "lots"})
+        self.assertNotIn("name", pl.__dict__)
+
+
+class TestSchema_update_many(unittest.TestCase):
+    """Unittests for testing FileStorage.update_many."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_update_many(self):
+        pl1 = Place()
+        pl2 = Place()
+        before = pl1.updated_at
+        missing = models.storage.update_many("Place", {
+            pl1.id: {"number_rooms": "3"},
+            pl2.id: {"name": "Loft", "latitude": "2"},
+            "nope": {"name": "x"}
+        })
+        self.assertEqual(["nope"], missing)
+        self.assertEqual(3, pl1.number_rooms)
+        self.assertEqual("Loft", pl2.name)
+        self.assertEqual(2.0, pl2.latitude)
+        self.assertLess(before, pl1.updated_at)
+        with open("file.json", "r") as f:
+            self.assertIn('"number_rooms": 3', f.read())
+
+    def test_update_many_invalid_value(self):
+        pl1 = Place()
+        pl2 = Place()
+        with self.assertRaises(ValueError):
+            models.storage.update_many("Place", {
+                pl1.id: {"name": "Loft"},
+                pl2.id: {"max_guest": "lots"}
+            })
+        self.assertNotIn("name", pl1.__dict__)
+
+    def test_update_many_invalid_name(self):
+        pl = Place()
+        with self.assertRaises(ValueError):
+            models.storage.update_many("Place", {pl.id: {"to_dict": 1}})
+        self.assertTrue(callable(pl.to_dict))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+"""
+Unit tests for the page renderer in web_dynamic/renderer.py.
+
+Test classes:
+    TestCompileTemplate
+    TestRenderer
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+from web_dynamic.renderer import Renderer, compile_template
+
+
+class TestCompileTemplate(unittest.TestCase):
+    """Tests for compiling templates."""
+
+    def test_fields(self):
+        render = compile_template("<p>{{ a }} and {{b}}</p>{{ a }}")
+        self.assertEqual("<p>1 and 2</p>1", render(a="1", b="2"))
+
+    def test_no_fields(self):
+        self.assertEqual("plain", compile_template("plain")())
+
+    def test_missing_field(self):
+        with self.assertRaises(KeyError):
+            compile_template("{{ a }}")()
+
+
+class TestRenderer(unittest.TestCase):
+    """Tests for rendering the places listing from storage."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        for name in ("file.json", "file.json.cache"):
+            try:
+                os.remove(name)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def setUp(self):
+        FileStorage._FileStorage__objects = {}
+        self.state = State()
+        self.state.name = "California"
+        self.city = City()
+        self.city.name = "San Francisco"
+        self.city.state_id = self.state.id
+        self.amenity = Amenity()
+        self.amenity.name = "Wifi"
+        self.user = User()
+        self.user.first_name = "Ada"
+        self.user.last_name = "Lovelace"
+        self.places = []
+        for i in range(5):
+            pl = Place()
+            pl.name = "Home {}".format(i)
+            pl.user_id = self.user.id
+            pl.max_guest = 1
+            pl.number_rooms = 2
+            self.places.append(pl)
+        self.renderer = Renderer(per_page=2)
+
+    def test_render(self):
+        self.assertEqual(["8-index.html", "8-index-2.html",
+                          "8-index-3.html"], self.renderer.render())
+        page = self.renderer.pages()["8-index.html"]
+        self.assertIn("<h2>California:</h2>", page)
+        self.assertIn("<li>San Francisco</li>", page)
+        self.assertIn("<li>Wifi</li>", page)
+        self.assertIn("<h2>Home 0</h2>", page)
+        self.assertIn("<h2>Home 1</h2>", page)
+        self.assertNotIn("Home 2", page)
+        self.assertIn("<p>1 Guest</p>", page)
+        self.assertIn("<p>2 bedrooms</p>", page)
+        self.assertIn("<b>Owner:</b> Ada Lovelace", page)
+        self.assertIn('<a href="8-index-3.html">3</a>', page)
+
+    def test_values_are_escaped(self):
+        self.places[0].description = "<script>"
+        self.renderer.render()
+        page = self.renderer.pages()["8-index.html"]
+        self.assertIn("&lt;script&gt;", page)
+        self.assertNotIn("<script>", page)
+
+    def test_unchanged_pages_are_kept(self):
+        self.renderer.render()
+        pages = self.renderer.pages()
+        self.assertEqual([], self.renderer.render())
+        self.assertEqual(pages, self.renderer.pages())
+
+    def test_only_changed_page_is_rendered(self):
+        self.renderer.render()
+        self.places[2].name = "Home 2 renamed"
+        self.places[2].save()
+        self.assertEqual(["8-index-2.html"], self.renderer.render())
+        self.assertIn("Home 2 renamed",
+                      self.renderer.pages()["8-index-2.html"])
+
+    def test_owner_change_is_rendered(self):
+        self.renderer.render()
+        self.user.last_name = "King"
+        self.user.save()
+        self.assertEqual(["8-index.html", "8-index-2.html",
+                          "8-index-3.html"], self.renderer.render())
+
+    def test_sidebar_change_renders_every_page(self):
+        self.renderer.render()
+        self.city.name = "Los Altos"
+        self.city.save()
+        self.assertEqual(3, len(self.renderer.render()))
+        self.assertIn("<li>Los Altos</li>",
+                      self.renderer.pages()["8-index-3.html"])
+
+    def test_write(self):
+        out = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, out)
+        self.assertEqual(3, len(self.renderer.write(out)))
+        self.assertEqual([], self.renderer.write(out))
+        os.remove(os.path.join(out, "8-index.html"))
+        self.assertEqual(["8-index.html"], self.renderer.write(out))
+        FileStorage._FileStorage__objects.pop("Place." + self.places[4].id)
+        self.renderer.write(out)
+        self.assertFalse(os.path.exists(os.path.join(out,
+                                                     "8-index-3.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,249 @@
+#!/usr/bin/python3
+"""Renders the places listing of web_static/8-index.html from storage.
+
+Templates live in web_dynamic/templates and are compiled once, at
+import, into lists of literal chunks and field names: rendering is a
+join, with no parsing. Fields are written {{ name }}; values are HTML
+escaped by the renderer.
+
+A Renderer keeps the fragment of every State, City, Amenity and Place it
+rendered, keyed on the updated_at of the objects it shows, and the
+signature of every page. Rendering again only rebuilds the fragments of
+objects that changed, and only the pages holding them. Run it with:
+
+    python3 -m web_dynamic.renderer -o build
+
+and add --interval 5 to keep the pages up to date, e.g. when storage is
+served by models.engine.storage_server.
+"""
+
+import argparse
+import os
+import re
+import time
+from html import escape
+import models
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "templates")
+_FIELD = re.compile(r"{{ *(\w+) *}}")
+
+
+def compile_template(text):
+    """Return a function rendering text, given the values of its fields."""
+    parts = _FIELD.split(text)
+    literals = parts[0::2]
+    names = parts[1::2]
+
+    def render(**values):
+        """Return the template with its fields replaced by values."""
+        out = [literals[0]]
+        for name, literal in zip(names, literals[1:]):
+            out.append(values[name])
+            out.append(literal)
+        return "".join(out)
+    return render
+
+
+def load(name):
+    """Return the compiled template of the file name of TEMPLATES."""
+    with open(os.path.join(TEMPLATES, name)) as f:
+        return compile_template(f.read())
+
+
+_index = load("8-index.html")
+_state = load("state.html")
+_city = load("city.html")
+_amenity = load("amenity.html")
+_place = load("place.html")
+_pages = load("pages.html")
+_page_link = load("page_link.html")
+
+
+def _plural(n, word):
+    """Return n followed by word, made plural unless n is 1."""
+    return "{} {}{}".format(n, word, "" if n == 1 else "s")
+
+
+def _by_name(objl):
+    """Return objl sorted by name, then id."""
+    return sorted(objl, key=lambda obj: (str(obj.name), obj.id))
+
+
+class Renderer:
+    """Represent an incremental renderer of the places listing.
+
+    Attributes:
+        per_page (int): The number of places per page.
+        static (str): The prefix of the styles and images URLs.
+    """
+
+    def __init__(self, per_page=50, static=""):
+        """Initialize a Renderer that has rendered nothing yet."""
+        self.per_page = per_page
+        self.static = static
+        self.__fragments = {}
+        self.__pages = {}
+
+    def page_name(self, number):
+        """Return the file name of page number, starting at 1."""
+        if number == 1:
+            return "8-index.html"
+        return "8-index-{}.html".format(number)
+
+    def pages(self):
+        """Return a dict of the last rendered pages, by file name."""
+        return {name: page[1] for name, page in self.__pages.items()}
+
+    def render(self):
+        """Render the pages whose objects changed since the last call.
+
+        Returns:
+            The names of the pages rendered.
+        """
+        groups = {"State": [], "Amenity": [], "Place": []}
+        for key, obj in models.storage.all().items():
+            group = groups.get(key.partition(".")[0])
+            if group is not None:
+                group.append(obj)
+        used = set()
+        states = [self.__state(st, used)
+                  for st in _by_name(groups["State"])]
+        amenities = [self.__fragment(am, am.updated_at, used, _amenity)
+                     for am in _by_name(groups["Amenity"])]
+        places = [self.__place(pl, used)
+                  for pl in _by_name(groups["Place"])]
+        for key in set(self.__fragments) - used:
+            del self.__fragments[key]
+
+        sidebar = (tuple(v for v, html in states),
+                   tuple(v for v, html in amenities))
+        states = "".join(html for v, html in states)
+        amenities = "".join(html for v, html in amenities)
+        count = max(1, -(-len(places) // self.per_page))
+        rendered = []
+        pages = {}
+        for number in range(1, count + 1):
+            name = self.page_name(number)
+            chunk = places[(number - 1) * self.per_page:
+                           number * self.per_page]
+            signature = (count, sidebar, tuple(v for v, html in chunk))
+            page = self.__pages.get(name)
+            if page is None or page[0] != signature:
+                page = (signature, _index(
+                    static=escape(self.static), states=states,
+                    amenities=amenities,
+                    places="".join(html for v, html in chunk),
+                    pages=self.__links(number, count)))
+                rendered.append(name)
+            pages[name] = page
+        self.__pages = pages
+        return rendered
+
+    def write(self, out_dir):
+        """Render the pages and write those that changed to out_dir.
+
+        Pages that no longer exist are removed from out_dir.
+
+        Returns:
+            The names of the pages written.
+        """
+        before = set(self.__pages)
+        rendered = self.render()
+        written = []
+        for name, page in self.__pages.items():
+            path = os.path.join(out_dir, name)
+            if name in rendered or not os.path.exists(path):
+                with open(path, "w") as f:
+                    f.write(page[1])
+                written.append(name)
+        for name in before - set(self.__pages):
+            try:
+                os.remove(os.path.join(out_dir, name))
+            except OSError:
+                pass
+        return written
+
+    def __fragment(self, obj, version, used, template, values=None):
+        """Return the (version, html) fragment of obj, cached by version.
+
+        The fragment is rendered with template, from the escaped name of
+        obj and the dict returned by values, unless the cached one has
+        the same version.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        used.add(key)
+        cached = self.__fragments.get(key)
+        if cached is None or cached[0] != version:
+            fields = values() if values is not None else {}
+            cached = self.__fragments[key] = (version, template(
+                name=escape(str(obj.name)), **fields))
+        return cached
+
+    def __state(self, st, used):
+        """Return the fragment of the State st and its cities."""
+        cities = [self.__fragment(cy, cy.updated_at, used, _city)
+                  for cy in _by_name(st.cities)]
+        version = (st.updated_at, tuple(v for v, html in cities))
+        return self.__fragment(st, version, used, _state, lambda: {
+            "cities": "".join(html for v, html in cities)})
+
+    def __place(self, pl, used):
+        """Return the fragment of the Place pl, shown with its owner."""
+        owner = models.storage.get("User", pl.user_id)
+        version = (pl.updated_at, owner and owner.updated_at)
+
+        def values():
+            """Return the fields of the place template."""
+            name = ""
+            if owner is not None:
+                name = "{} {}".format(owner.first_name, owner.last_name)
+            return {
+                "price_by_night": escape(str(pl.price_by_night)),
+                "max_guest": escape(_plural(pl.max_guest, "Guest")),
+                "number_rooms": escape(_plural(pl.number_rooms,
+                                               "bedroom")),
+                "number_bathrooms": escape(_plural(pl.number_bathrooms,
+                                                   "Bathroom")),
+                "owner": escape(name.strip()),
+                "description": escape(str(pl.description))
+            }
+        return self.__fragment(pl, version, used, _place, values)
+
+    def __links(self, number, count):
+        """Return the links to the count pages, from page number."""
+        if count == 1:
+            return ""
+        return _pages(links="".join(
+            _page_link(href=self.page_name(n), number=str(n))
+            for n in range(1, count + 1)))
+
+
+def main(argv=None):
+    """Parse the command line and render the pages."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default="web_dynamic/build")
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--static", default=None,
+                        help="URL prefix of styles and images, by default "
+                             "the path from the output to web_static")
+    parser.add_argument("--interval", type=float, default=None,
+                        help="re-render every INTERVAL seconds")
+    args = parser.parse_args(argv)
+    os.makedirs(args.output, exist_ok=True)
+    static = args.static
+    if static is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        static = os.path.relpath(os.path.join(root, "web_static"),
+                                 args.output) + "/"
+    renderer = Renderer(args.per_page, static)
+    while True:
+        for name in renderer.write(args.output):
+            print(os.path.join(args.output, name))
+        if args.interval is None:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()